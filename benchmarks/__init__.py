@@ -0,0 +1,7 @@
+"""
+Benchmarks for JobMatch AI.
+
+Run from the repository root, e.g.:
+    python -m benchmarks.end_to_end --jobs 10000 --stub-embedder
+    python benchmarks/startup.py
+"""
@@ -0,0 +1,98 @@
+"""
+Local stand-in for the Adzuna search API.
+
+Serves synthetic postings at /<country>/search/<page> with configurable latency
+and an optional rate of 429 responses, so the fetcher can be exercised offline.
+
+Usage:
+    python -m benchmarks.adzuna_stub_server --port 8765 --latency 0.2
+    ADZUNA_BASE_URL=http://127.0.0.1:8765 ADZUNA_APP_ID=x ADZUNA_APP_KEY=x python src/run_agent.py ...
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.synthetic import generate_adzuna_results
+
+
+def make_handler(total: int, latency: float, throttle_rate: float, seed: int) -> type:
+    """Build a request handler class serving `total` synthetic postings."""
+    results = generate_adzuna_results(total, seed=seed)
+
+    class AdzunaStubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            parsed = urlparse(self.path)
+            match = re.search(r'/search/(\d+)$', parsed.path)
+            if not match:
+                self._send(404, {"error": "not found"})
+                return
+            time.sleep(latency)
+            if random.random() < throttle_rate:
+                self._send(429, {"error": "rate limited"}, retry_after="0")
+                return
+            params = parse_qs(parsed.query)
+            page = int(match.group(1))
+            per_page = int(params.get("results_per_page", ["50"])[0])
+            start = (page - 1) * per_page
+            self._send(200, {"count": total, "results": results[start:start + per_page]})
+
+        def _send(self, status: int, body: dict, retry_after: str = None) -> None:
+            payload = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            if retry_after is not None:
+                self.send_header("Retry-After", retry_after)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    return AdzunaStubHandler
+
+
+def start_stub_server(
+    port: int = 0,
+    total: int = 5000,
+    latency: float = 0.2,
+    throttle_rate: float = 0.0,
+    seed: int = 0
+) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Start the stub server in a daemon thread.
+
+    Returns:
+        Tuple of the server (call shutdown() to stop it) and its base URL
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(total, latency, throttle_rate, seed))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main() -> None:
+    """Run the stub server in the foreground."""
+    parser = argparse.ArgumentParser(description="Local Adzuna API stub")
+    parser.add_argument('--port', type=int, default=8765, help='Port (default: 8765)')
+    parser.add_argument('--total', type=int, default=5000, help='Postings available (default: 5000)')
+    parser.add_argument('--latency', type=float, default=0.2, help='Seconds per response (default: 0.2)')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of 429 responses (default: 0)')
+    args = parser.parse_args()
+    server, url = start_stub_server(args.port, args.total, args.latency, args.throttle_rate)
+    print(f"Adzuna stub serving {args.total} postings at {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
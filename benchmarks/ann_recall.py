@@ -0,0 +1,82 @@
+"""
+Recall-vs-latency benchmark for the IVF job index.
+
+Builds an index over synthetic clustered embeddings and compares each n_probe
+setting against exact blockwise search, reporting recall@k and per-query
+latency as JSON.
+
+Usage:
+    python benchmarks/ann_recall.py --jobs 200000 --queries 200
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from ann_index import IVFIndex
+from similarity import blockwise_top_k, normalize_rows
+
+
+def synthetic_embeddings(n: int, dim: int, n_topics: int, seed: int) -> np.ndarray:
+    """Return L2-normalized vectors drawn around n_topics random directions."""
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(n_topics, dim))
+    vectors = topics[rng.integers(0, n_topics, n)] + 0.6 * rng.normal(size=(n, dim))
+    return normalize_rows(vectors)
+
+
+def run(args: argparse.Namespace) -> Dict:
+    """Build the index and measure every n_probe setting."""
+    jobs = synthetic_embeddings(args.jobs, args.dim, args.topics, seed=0)
+    queries = synthetic_embeddings(args.queries, args.dim, args.topics, seed=1)
+    ids = [str(i) for i in range(args.jobs)]
+
+    start = time.perf_counter()
+    index = IVFIndex.build(jobs, ids, n_lists=args.lists)
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    exact_indices, _ = blockwise_top_k(queries, jobs, args.k)
+    exact_ms = (time.perf_counter() - start) * 1000 / args.queries
+    exact = [set(str(i) for i in row) for row in exact_indices]
+
+    settings: List[Dict] = []
+    n_probe = 1
+    while n_probe <= len(index.centroids):
+        start = time.perf_counter()
+        found, _ = index.search(queries, args.k, n_probe=n_probe)
+        latency_ms = (time.perf_counter() - start) * 1000 / args.queries
+        recall = np.mean([len(exact[q] & set(found[q])) / args.k for q in range(args.queries)])
+        settings.append({"n_probe": n_probe, "recall": round(float(recall), 4), "ms_per_query": round(latency_ms, 3)})
+        n_probe *= 2
+
+    return {
+        "jobs": args.jobs,
+        "dim": args.dim,
+        "k": args.k,
+        "n_lists": len(index.centroids),
+        "build_s": round(build_s, 3),
+        "exact_ms_per_query": round(exact_ms, 3),
+        "settings": settings
+    }
+
+
+def main() -> None:
+    """Parse arguments and print the JSON report."""
+    parser = argparse.ArgumentParser(description="IVF recall vs latency against exact search")
+    parser.add_argument('--jobs', type=int, default=100000, help='Indexed vectors (default: 100000)')
+    parser.add_argument('--queries', type=int, default=100, help='Query vectors (default: 100)')
+    parser.add_argument('--dim', type=int, default=384, help='Embedding size (default: 384)')
+    parser.add_argument('--topics', type=int, default=200, help='Synthetic clusters (default: 200)')
+    parser.add_argument('--lists', type=int, default=None, help='Inverted lists (default: sqrt(jobs))')
+    parser.add_argument('--k', type=int, default=10, help='Neighbours per query (default: 10)')
+    print(json.dumps(run(parser.parse_args()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
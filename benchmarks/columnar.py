@@ -0,0 +1,100 @@
+"""
+Load and filter benchmark for the columnar job corpus.
+
+Writes the same synthetic postings as pretty-printed JSON (the format
+save_jobs produces) and as column files, then compares load time and
+JobFilterTool-style filtering over dicts with the bitmap and token index filter.
+
+Usage:
+    python benchmarks/columnar.py --jobs 100000
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import generate_adzuna_results
+from columnar_store import ColumnarJobStore
+from job_filter import filter_jobs
+from job_search import transform_adzuna_job
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Write both formats, then time loading and filtering each."""
+    jobs = [transform_adzuna_job(result) for result in generate_adzuna_results(args.jobs, seed=args.seed)]
+    rng = np.random.default_rng(args.seed)
+    for job in jobs:
+        job["job_country"] = str(rng.choice(["DE", "UK", "NL", "FR", "US"]))
+        job["job_employment_type"] = str(rng.choice(["Full-time", "Part-time", "Contract", ""]))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / 'job_postings.json'
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({"status": "OK", "data": jobs}, f, indent=4)
+        ColumnarJobStore.write(jobs, str(Path(tmp) / 'columns'))
+        del jobs
+
+        start = time.perf_counter()
+        with open(json_path, 'r', encoding='utf-8') as f:
+            loaded = json.load(f)["data"]
+        json_load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store = ColumnarJobStore(str(Path(tmp) / 'columns'))
+        columnar_load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = filter_jobs(loaded, whole_words=True)
+        dict_filter = time.perf_counter() - start
+
+        start = time.perf_counter()
+        mask = store.filter_mask(whole_words=True)
+        mask_filter = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store.filter_mask(whole_words=True)
+        mask_filter_warm = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store.filter_mask(whole_words=False)
+        substring_filter = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store.category_mask('job_country', lambda value: value.lower() in ('de', 'uk', 'nl'))
+        category_filter = time.perf_counter() - start
+
+        matches = [job["job_id"] for job in expected] == [store.column('job_id')[row] for row in np.flatnonzero(mask)]
+
+    return {
+        "jobs": args.jobs,
+        "load_ms": {"json": round(json_load * 1000, 2), "columnar": round(columnar_load * 1000, 3)},
+        "filter_ms": {
+            "dicts": round(dict_filter * 1000, 2),
+            "bitmaps": round(mask_filter * 1000, 2),
+            "bitmaps_warm": round(mask_filter_warm * 1000, 2),
+            "bitmaps_substring": round(substring_filter * 1000, 2),
+            "country_only": round(category_filter * 1000, 3)
+        },
+        "filtered": int(mask.sum()),
+        "same_result": matches
+    }
+
+
+def main() -> None:
+    """Parse arguments and print the JSON report."""
+    parser = argparse.ArgumentParser(description="Columnar job corpus benchmark")
+    parser.add_argument('--jobs', type=int, default=100000, help='Synthetic postings (default: 100000)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    print(json.dumps(run(parser.parse_args()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
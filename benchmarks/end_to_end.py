@@ -0,0 +1,201 @@
+"""
+End-to-end benchmark for the job matching workflow.
+
+Generates synthetic Adzuna postings and LinkedIn-shaped profiles, times each
+stage (profile parsing, filtering, lemmatization, embedding, similarity,
+ranking and the agent workflow without the network search), and reports
+p50/p95 latency, jobs/sec and peak RSS as JSON. With --baseline, exits with
+status 1 when any stage's p50 regresses by more than --threshold.
+
+Usage:
+    python -m benchmarks.end_to_end --jobs 10000 --stub-embedder
+    python -m benchmarks.end_to_end --jobs 1000 --stub-embedder --output bench.json
+    python -m benchmarks.end_to_end --jobs 1000 --stub-embedder --baseline bench.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+# Measure compute, not the on-disk caches left behind by earlier runs
+os.environ["EMBEDDING_CACHE_DIR"] = ""
+os.environ["JOB_CORPUS_PATH"] = ""
+
+import numpy as np
+
+from benchmarks.stub_embedder import HashingEmbedder
+from benchmarks.synthetic import generate_adzuna_results, generate_profile, generate_profile_text
+
+
+class SyntheticSearchTool:
+    """Stand-in for JobSearchTool that serves pre-generated postings without network access."""
+
+    description = "Serves synthetic job postings"
+
+    def __init__(self, jobs: List[Dict[str, Any]]):
+        self.jobs = jobs
+
+    def search(self, query: Any, location: Any = None, **kwargs: Any) -> Dict[str, Any]:
+        return {"status": "success", "total_jobs": len(self.jobs), "jobs": self.jobs}
+
+    def run_dict(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        return self.search(input_data.get("query"))
+
+    def _run(self, input_str: str) -> Dict[str, Any]:
+        return self.run_dict(json.loads(input_str))
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Return the q-th percentile of samples."""
+    return float(np.percentile(np.asarray(samples), q))
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def time_stage(func: Callable[[], Any], repeat: int, before: Callable[[], None] = None) -> List[float]:
+    """Run func repeat times and return wall times in seconds."""
+    samples = []
+    for _ in range(repeat):
+        if before:
+            before()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run every stage and build the JSON report."""
+    import embedding_utils
+    import text_preprocessing
+    from job_search import transform_adzuna_job
+    from match_jobs import compose_job_text, compose_profile_text
+    from parse_profile import parse_profile
+    from similarity import normalize_rows, top_k_indices
+
+    if args.stub_embedder:
+        embedding_utils.set_model(HashingEmbedder(args.dim), f"stub-hashing-{args.dim}")
+
+    jobs = [transform_adzuna_job(result) for result in generate_adzuna_results(args.jobs, seed=args.seed)]
+    profile = generate_profile(args.seed)
+    profile_text = generate_profile_text(args.seed)
+    job_texts = [compose_job_text(job) for job in jobs]
+    lemmatizer = text_preprocessing.get_lemmatizer()
+    text_preprocessing.warm_up()
+
+    stages: Dict[str, List[float]] = {}
+    state: Dict[str, Any] = {}
+
+    stages["parse_profile"] = time_stage(lambda: parse_profile(profile_text), args.repeat)
+
+    from agents import JobMatchAgent
+    agent = JobMatchAgent()
+    # Build tools outside the timed regions
+    filter_tool = agent.filter_tool
+    agent.get_tool('job_matcher')
+    stages["filtering"] = time_stage(lambda: filter_tool.filter(jobs), args.repeat)
+
+    def lemmatize() -> None:
+        state["lemmas"] = text_preprocessing.lemmatize_texts(job_texts)
+    stages["lemmatization"] = time_stage(lemmatize, args.repeat, before=lemmatizer._cache.clear)
+
+    def embed() -> None:
+        state["job_matrix"] = normalize_rows(embedding_utils.embed_documents(job_texts))
+        state["profile_vector"] = normalize_rows(embedding_utils.embed_documents([
+            text_preprocessing.lemmatize_text(compose_profile_text(profile, profile["skills"]))
+        ]))
+    stages["embedding"] = time_stage(embed, args.repeat)
+
+    def similarity() -> None:
+        state["scores"] = state["profile_vector"] @ state["job_matrix"].T
+    stages["similarity"] = time_stage(similarity, args.repeat)
+
+    stages["ranking"] = time_stage(lambda: top_k_indices(state["scores"], args.top), args.repeat)
+
+    if not args.skip_workflow:
+        agent._tools['job_searcher'] = SyntheticSearchTool(jobs)
+
+        def workflow() -> None:
+            results = agent.run_workflow(profile_source="dict", profile_data=profile, top_n=args.top)
+            if "error" in results:
+                raise RuntimeError(results["error"])
+        with open(os.devnull, 'w') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                stages["workflow"] = time_stage(workflow, args.repeat, before=lemmatizer._cache.clear)
+            finally:
+                sys.stdout = stdout
+
+    report_stages = {}
+    for name, samples in stages.items():
+        p50 = percentile(samples, 50)
+        report_stages[name] = {
+            "p50_s": round(p50, 6),
+            "p95_s": round(percentile(samples, 95), 6),
+            "jobs_per_s": round(args.jobs / p50, 1) if p50 > 0 and name != "parse_profile" else None
+        }
+
+    return {
+        "jobs": args.jobs,
+        "repeat": args.repeat,
+        "embedder": embedding_utils.get_model_name(),
+        "stages": report_stages,
+        "peak_rss_mb": round(peak_rss_mb(), 1)
+    }
+
+
+def check_regressions(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Return a message for every stage whose p50 exceeds the baseline by more than threshold."""
+    failures = []
+    for name, stats in report["stages"].items():
+        previous = baseline.get("stages", {}).get(name)
+        if not previous or not previous.get("p50_s"):
+            continue
+        ratio = stats["p50_s"] / previous["p50_s"]
+        if ratio > 1 + threshold:
+            failures.append(f"{name}: p50 {stats['p50_s']:.6f}s vs baseline {previous['p50_s']:.6f}s (+{(ratio - 1) * 100:.1f}%)")
+    return failures
+
+
+def main() -> None:
+    """Parse arguments, run the benchmark and print or save the report."""
+    parser = argparse.ArgumentParser(description="End-to-end job matching benchmark")
+    parser.add_argument('--jobs', type=int, default=1000, help='Synthetic postings, 100 to 1000000 (default: 1000)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per stage (default: 5)')
+    parser.add_argument('--top', type=int, default=10, help='Matches to rank (default: 10)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--dim', type=int, default=384, help='Stub embedding size (default: 384)')
+    parser.add_argument('--stub-embedder', action='store_true', help='Use the offline hashing embedder')
+    parser.add_argument('--skip-workflow', action='store_true', help='Skip the agent workflow stage')
+    parser.add_argument('--output', type=str, help='Write the JSON report to this file')
+    parser.add_argument('--baseline', type=str, help='Compare against a previous JSON report')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed p50 regression ratio (default: 0.2)')
+    args = parser.parse_args()
+
+    report = run(args)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding='utf-8')
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        failures = check_regressions(report, baseline, args.threshold)
+        if failures:
+            print("❌ Performance regressions:\n" + '\n'.join(failures), file=sys.stderr)
+            sys.exit(1)
+        print("✅ No regressions beyond threshold", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Sequential vs concurrent Adzuna fetch benchmark against the local stub server.
+
+Usage:
+    python -m benchmarks.fetcher --pages 40 --latency 0.2
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from adzuna_client import fetch_jobs
+from benchmarks.adzuna_stub_server import start_stub_server
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Fetch the same pages with concurrency 1 and with the requested concurrency."""
+    server, base_url = start_stub_server(
+        total=args.pages * 50, latency=args.latency, throttle_rate=args.throttle_rate
+    )
+    report: Dict[str, Any] = {"pages": args.pages, "latency_s": args.latency, "runs": []}
+    try:
+        for concurrency in (1, args.concurrency):
+            start = time.perf_counter()
+            jobs = fetch_jobs(
+                "AI engineer", "Berlin",
+                max_pages=args.pages,
+                app_id="stub", app_key="stub",
+                base_url=base_url,
+                concurrency=concurrency,
+                rate_per_second=args.rate,
+                backoff=0.05
+            )
+            elapsed = time.perf_counter() - start
+            report["runs"].append({
+                "concurrency": concurrency,
+                "jobs": len(jobs),
+                "seconds": round(elapsed, 3),
+                "jobs_per_s": round(len(jobs) / elapsed, 1)
+            })
+    finally:
+        server.shutdown()
+    return report
+
+
+def main() -> None:
+    """Parse arguments and print the JSON report."""
+    parser = argparse.ArgumentParser(description="Adzuna fetcher benchmark")
+    parser.add_argument('--pages', type=int, default=20, help='Pages to fetch (default: 20)')
+    parser.add_argument('--latency', type=float, default=0.2, help='Stub latency per page (default: 0.2)')
+    parser.add_argument('--concurrency', type=int, default=10, help='Concurrent requests (default: 10)')
+    parser.add_argument('--rate', type=float, default=50.0, help='Requests per second limit (default: 50)')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of 429 responses (default: 0)')
+    print(json.dumps(run(parser.parse_args()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
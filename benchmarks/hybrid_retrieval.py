@@ -0,0 +1,95 @@
+"""
+Recall-vs-latency benchmark for BM25 pre-retrieval.
+
+Matches synthetic profiles against synthetic postings with the offline hashing
+embedder, once embedding every posting and once per retrieve_k setting, and
+reports per-profile latency, mean stage timings and recall@top of each
+setting against the full ranking as JSON. The hashing embedder is far cheaper
+than a real encoder, so the embed_jobs timings are the figure to scale.
+
+Usage:
+    python benchmarks/hybrid_retrieval.py --jobs 20000 --profiles 10
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Measure compute, not the on-disk caches left behind by earlier runs
+os.environ["EMBEDDING_CACHE_DIR"] = ""
+
+import numpy as np
+
+import embedding_utils
+from benchmarks.stub_embedder import HashingEmbedder
+from benchmarks.synthetic import generate_adzuna_results, generate_profile
+from job_search import transform_adzuna_job
+from match_jobs import rank_profile_against_jobs
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Rank every profile with each retrieve_k setting."""
+    embedding_utils.set_model(HashingEmbedder(args.dim), f"stub-hashing-{args.dim}")
+    jobs = [transform_adzuna_job(result) for result in generate_adzuna_results(args.jobs, seed=0)]
+    for job in jobs:
+        job.pop('job_id', None)
+    profiles = [generate_profile(seed) for seed in range(args.profiles)]
+
+    def rank(retrieve_k: int) -> Dict[str, Any]:
+        ranked = []
+        stages: Dict[str, List[float]] = {}
+        start = time.perf_counter()
+        for profile in profiles:
+            matches, timings = rank_profile_against_jobs(profile, jobs, top_n=args.top, retrieve_k=retrieve_k)
+            ranked.append([id(job) for job, _ in matches])
+            for stage, seconds in timings.items():
+                stages.setdefault(stage, []).append(seconds)
+        return {
+            "ranked": ranked,
+            "ms_per_profile": round((time.perf_counter() - start) * 1000 / args.profiles, 2),
+            "stage_ms": {stage: round(float(np.mean(samples)) * 1000, 2) for stage, samples in stages.items()}
+        }
+
+    # Warm the lemmatizer so every setting pays the same lemmatization cost
+    rank(0)
+    full = rank(0)
+
+    settings = []
+    for retrieve_k in args.k:
+        result = rank(retrieve_k)
+        recall = np.mean([len(set(e) & set(f)) / len(e) for e, f in zip(full["ranked"], result["ranked"]) if e])
+        settings.append({
+            "retrieve_k": retrieve_k,
+            "recall": round(float(recall), 4),
+            "ms_per_profile": result["ms_per_profile"],
+            "stage_ms": result["stage_ms"]
+        })
+
+    return {
+        "jobs": args.jobs,
+        "profiles": args.profiles,
+        "top": args.top,
+        "full": {"ms_per_profile": full["ms_per_profile"], "stage_ms": full["stage_ms"]},
+        "settings": settings
+    }
+
+
+def main() -> None:
+    """Parse arguments and print the JSON report."""
+    parser = argparse.ArgumentParser(description="BM25 pre-retrieval recall vs latency against full embedding")
+    parser.add_argument('--jobs', type=int, default=5000, help='Synthetic postings (default: 5000)')
+    parser.add_argument('--profiles', type=int, default=10, help='Synthetic profiles (default: 10)')
+    parser.add_argument('--top', type=int, default=10, help='Matches per profile (default: 10)')
+    parser.add_argument('--k', type=int, nargs='+', default=[100, 300, 1000], help='retrieve_k settings (default: 100 300 1000)')
+    parser.add_argument('--dim', type=int, default=384, help='Stub embedding size (default: 384)')
+    print(json.dumps(run(parser.parse_args()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Memory and accuracy benchmark for quantized embedding storage.
+
+Compares float64 exact search (the shape embed_text_list used to return)
+with float16 and int8 stores, with and without full-precision re-ranking.
+Reports memory, per-query latency and top-k overlap with the exact result.
+
+Usage:
+    python benchmarks/quantization.py --jobs 100000
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from quantized_store import PRECISIONS, QuantizedEmbeddingStore
+from similarity import normalize_rows, top_k_indices
+
+
+def run(args: argparse.Namespace) -> Dict:
+    """Build each store and compare it against exact float64 search."""
+    rng = np.random.default_rng(0)
+    topics = rng.normal(size=(200, args.dim))
+    jobs = normalize_rows(topics[rng.integers(0, 200, args.jobs)] + 0.6 * rng.normal(size=(args.jobs, args.dim)))
+    queries = normalize_rows(topics[rng.integers(0, 200, args.queries)] + 0.6 * rng.normal(size=(args.queries, args.dim)))
+    ids = [str(i) for i in range(args.jobs)]
+
+    exact64 = jobs.astype(np.float64)
+    start = time.perf_counter()
+    exact = top_k_indices(queries.astype(np.float64) @ exact64.T, args.k)
+    exact_ms = (time.perf_counter() - start) * 1000 / args.queries
+    truth = [set(str(i) for i in row) for row in exact]
+
+    report = {
+        "jobs": args.jobs,
+        "dim": args.dim,
+        "k": args.k,
+        "float64": {"memory_mb": round(exact64.nbytes / 2**20, 2), "ms_per_query": round(exact_ms, 3)},
+        "stores": []
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for precision in PRECISIONS:
+            store = QuantizedEmbeddingStore.build(jobs, ids, f"{directory}/{precision}", precision=precision)
+            for rerank in (False, True):
+                start = time.perf_counter()
+                found, _ = store.search(queries, args.k, rerank=rerank)
+                latency_ms = (time.perf_counter() - start) * 1000 / args.queries
+                overlap = np.mean([len(truth[q] & set(found[q])) / args.k for q in range(args.queries)])
+                report["stores"].append({
+                    "precision": precision,
+                    "rerank": rerank,
+                    "memory_mb": round(store.memory_bytes() / 2**20, 2),
+                    "memory_reduction_vs_float64": round(exact64.nbytes / store.memory_bytes(), 2),
+                    "ms_per_query": round(latency_ms, 3),
+                    "top_k_overlap": round(float(overlap), 4)
+                })
+    return report
+
+
+def main() -> None:
+    """Parse arguments and print the JSON report."""
+    parser = argparse.ArgumentParser(description="Quantized embedding store benchmark")
+    parser.add_argument('--jobs', type=int, default=100000, help='Stored vectors (default: 100000)')
+    parser.add_argument('--queries', type=int, default=100, help='Query vectors (default: 100)')
+    parser.add_argument('--dim', type=int, default=384, help='Embedding size (default: 384)')
+    parser.add_argument('--k', type=int, default=10, help='Results per query (default: 10)')
+    print(json.dumps(run(parser.parse_args()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Startup benchmark for JobMatch AI.
+
+Each measurement runs in a fresh interpreter so module caches do not hide
+import cost. Reports import time, agent construction, list_tools() and the
+first-call latency of the model-backed modules as JSON.
+
+Usage:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --skip-models
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+IMPORT_TARGETS = [
+    "embedding_utils",
+    "text_preprocessing",
+    "parse_profile",
+    "match_jobs",
+    "tools",
+    "agents"
+]
+
+SNIPPETS = {
+    "agent_init": "from agents import JobMatchAgent\nJobMatchAgent()",
+    "agent_list_tools": "from agents import JobMatchAgent\nJobMatchAgent().list_tools()"
+}
+
+MODEL_SNIPPETS = {
+    "text_preprocessing_warm_up": "import text_preprocessing\ntext_preprocessing.warm_up()",
+    "embedding_utils_warm_up": "import embedding_utils\nembedding_utils.warm_up()",
+    "agent_warm_up": "from agents import JobMatchAgent\nJobMatchAgent().warm_up()"
+}
+
+
+def time_snippet(code: str) -> float:
+    """Run code in a fresh interpreter and return its wall time in seconds."""
+    program = (
+        "import sys, time\n"
+        f"sys.path.insert(0, {str(SRC_DIR)!r})\n"
+        "start = time.perf_counter()\n"
+        f"exec({code!r})\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", program],
+        capture_output=True,
+        text=True,
+        cwd=SRC_DIR.parent
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    return float(completed.stdout.strip().splitlines()[-1])
+
+
+def measure(snippets: Dict[str, str], repeat: int) -> Dict[str, Dict[str, float]]:
+    """Return the best and mean wall time of each snippet over repeat fresh runs."""
+    results = {}
+    for name, code in snippets.items():
+        try:
+            timings: List[float] = [time_snippet(code) for _ in range(repeat)]
+        except RuntimeError as exc:
+            results[name] = {"error": str(exc)}
+            continue
+        results[name] = {
+            "best_s": round(min(timings), 4),
+            "mean_s": round(sum(timings) / len(timings), 4)
+        }
+    return results
+
+
+def main() -> None:
+    """Run the startup benchmark and print a JSON report."""
+    parser = argparse.ArgumentParser(description="Measure import and first-call latency")
+    parser.add_argument('--repeat', type=int, default=3, help='Fresh runs per measurement (default: 3)')
+    parser.add_argument('--skip-models', action='store_true', help='Do not measure model warm-up')
+    args = parser.parse_args()
+
+    snippets = {f"import_{target}": f"import {target}" for target in IMPORT_TARGETS}
+    snippets.update(SNIPPETS)
+    report = {"imports_and_agent": measure(snippets, args.repeat)}
+    if not args.skip_models:
+        report["first_call"] = measure(MODEL_SNIPPETS, 1)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
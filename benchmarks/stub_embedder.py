@@ -0,0 +1,38 @@
+"""Fast deterministic embedder for offline benchmarks."""
+import hashlib
+from typing import List, Tuple
+
+import numpy as np
+
+
+class HashingEmbedder:
+    """
+    Signed feature-hashing bag-of-words embedder.
+
+    Texts sharing words get similar vectors, so rankings stay meaningful, but no
+    model is downloaded and results are identical across runs and machines.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+        self._buckets = {}
+
+    def _bucket(self, token: str) -> Tuple[int, float]:
+        """Return the (column, sign) a token is hashed to."""
+        bucket = self._buckets.get(token)
+        if bucket is None:
+            digest = int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'little')
+            bucket = (digest % self.dim, 1.0 if digest >> 63 else -1.0)
+            self._buckets[token] = bucket
+        return bucket
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        """Embed texts as L2-normalized hashed token counts, one row per text."""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in text.lower().split():
+                column, sign = self._bucket(token)
+                matrix[row, column] += sign
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
@@ -0,0 +1,88 @@
+"""Deterministic synthetic Adzuna postings and LinkedIn-shaped profiles."""
+import random
+from typing import Any, Dict, List
+
+ROLES = [
+    "AI Engineer", "Machine Learning Engineer", "Data Scientist", "Backend Developer",
+    "NLP Researcher", "Data Engineer", "MLOps Engineer", "Software Engineer",
+    "Product Manager", "Frontend Developer", "Research Scientist", "Analytics Consultant"
+]
+SENIORITY = ["", "Junior ", "Senior ", "Lead ", "Principal "]
+SKILLS = [
+    "python", "pytorch", "tensorflow", "nlp", "llm", "sql", "spark", "kubernetes",
+    "docker", "aws", "gcp", "react", "typescript", "java", "scala", "airflow",
+    "statistics", "computer vision", "recommender systems", "langchain", "fastapi"
+]
+COMPANIES = ["Lingoda", "Cherry Ventures", "Zalando", "N26", "Delivery Hero", "SAP", "Celonis", "Personio"]
+CITIES = ["Berlin", "Munich", "Hamburg", "Cologne", "Frankfurt", "Amsterdam", "London"]
+SENTENCES = [
+    "You will design and ship {skill} systems used by millions of customers.",
+    "Experience with {skill} and {skill2} is a strong plus.",
+    "Our team builds {skill} pipelines and collaborates closely with product.",
+    "We offer flexible working hours, a learning budget and remote options.",
+    "You have several years of experience with {skill} in production.",
+    "Familiarity with {skill2} or similar tooling is expected."
+]
+
+
+def generate_adzuna_results(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Generate raw Adzuna search results.
+
+    Args:
+        n: Number of postings
+        seed: Random seed
+
+    Returns:
+        List of dictionaries shaped like Adzuna's 'results' entries
+    """
+    rng = random.Random(seed)
+    results = []
+    for i in range(n):
+        skills = rng.sample(SKILLS, 4)
+        sentences = [
+            rng.choice(SENTENCES).format(skill=rng.choice(skills), skill2=rng.choice(skills))
+            for _ in range(rng.randint(4, 10))
+        ]
+        results.append({
+            "id": str(1000000 + i),
+            "title": rng.choice(SENIORITY) + rng.choice(ROLES),
+            "company": {"display_name": rng.choice(COMPANIES)},
+            "location": {"area": [rng.choice(CITIES)], "display_name": rng.choice(CITIES)},
+            "description": ' '.join(sentences),
+            "redirect_url": f"https://www.adzuna.de/details/{1000000 + i}"
+        })
+    return results
+
+
+def generate_profile_text(seed: int = 0) -> str:
+    """Generate the text of a LinkedIn PDF export, in the section order LinkedIn uses."""
+    rng = random.Random(seed)
+    skills = rng.sample(SKILLS, 6)
+    lines = ["Contact", f"person{seed}@example.com", "Top Skills"]
+    lines += [skill.title() for skill in skills[:3]]
+    lines += ["Languages", "English (Full Professional)", "German (Limited Working)"]
+    lines += ["Certifications", f"{rng.choice(skills).title()} Certificate"]
+    lines += [f"Alex Example{seed}", f"{rng.choice(ROLES)} at {rng.choice(COMPANIES)}", f"{rng.choice(CITIES)}, Germany"]
+    lines += ["Summary", f"Engineer focused on {skills[0]} and {skills[1]}."]
+    lines += ["Experience"]
+    for company in rng.sample(COMPANIES, 2):
+        lines += [company, rng.choice(ROLES), f"Built {rng.choice(skills)} services using {rng.choice(skills)}."]
+    lines += ["Education", "Technical University of Berlin", "Master of Science, Computer Science"]
+    lines += ["Page 1 of 1"]
+    return '\n'.join(lines)
+
+
+def generate_profile(seed: int = 0) -> Dict[str, Any]:
+    """Generate a parsed profile dictionary."""
+    rng = random.Random(seed)
+    skills = rng.sample(SKILLS, 6)
+    return {
+        "name": f"Alex Example{seed}",
+        "headline": rng.choice(ROLES),
+        "skills": skills,
+        "languages": ["English"],
+        "certifications": [f"{skills[0].title()} Certificate"],
+        "experience": [f"{rng.choice(ROLES)} at {company}" for company in rng.sample(COMPANIES, 2)],
+        "education": ["Master of Science, Computer Science"]
+    }
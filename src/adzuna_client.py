@@ -0,0 +1,399 @@
+import asyncio
+import math
+import os
+import queue
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+from dotenv import load_dotenv
+
+from job_search import ADZUNA_BASE_URL, ResponseCache, transform_adzuna_job
+
+load_dotenv()
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class AdzunaError(Exception):
+    """Raised when the Adzuna API returns an error that retrying will not fix."""
+
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter.
+
+    Tokens refill continuously at rate per second up to capacity; each request
+    takes one token and waits when the bucket is empty.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AdzunaFetcher:
+    """
+    Concurrent, paginated Adzuna search client.
+
+    Pages are fetched over one pooled HTTP client, at most `concurrency` at a time
+    and no faster than `rate_per_second`. 429 and 5xx responses are retried with
+    exponential backoff (honouring Retry-After). Pages found in an optional
+    ResponseCache skip the network. Postings are yielded as each page arrives.
+    """
+
+    def __init__(
+        self,
+        app_id: Optional[str] = None,
+        app_key: Optional[str] = None,
+        base_url: str = ADZUNA_BASE_URL,
+        country: str = "de",
+        concurrency: int = 8,
+        rate_per_second: float = 5.0,
+        max_retries: int = 4,
+        backoff: float = 0.5,
+        timeout: float = 30.0,
+        cache: Optional[ResponseCache] = None
+    ):
+        self.app_id = app_id or os.getenv("ADZUNA_APP_ID")
+        self.app_key = app_key or os.getenv("ADZUNA_APP_KEY")
+        if not self.app_id or not self.app_key:
+            raise AdzunaError("Adzuna API credentials not found. Please add ADZUNA_APP_ID and ADZUNA_APP_KEY to your .env file")
+        self.base_url = base_url.rstrip('/')
+        self.country = country
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.rate_per_second = rate_per_second
+        self.cache = cache
+
+    def _client(self) -> httpx.AsyncClient:
+        """Create a pooled client sized to the concurrency limit."""
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        return httpx.AsyncClient(limits=limits, timeout=self.timeout)
+
+    async def fetch_page(
+        self,
+        client: httpx.AsyncClient,
+        limiter: TokenBucket,
+        query: str,
+        location: str,
+        page: int,
+        results_per_page: int = 50
+    ) -> Dict[str, Any]:
+        """
+        Fetch one result page, serving it from the cache when possible and
+        retrying on rate limiting and server errors.
+
+        Args:
+            client: Pooled HTTP client
+            limiter: Shared rate limiter
+            query: Search keywords
+            location: Search location
+            page: 1-based page number
+            results_per_page: Page size (Adzuna allows up to 50)
+
+        Returns:
+            Raw Adzuna response JSON
+        """
+        url = f"{self.base_url}/{self.country}/search/{page}"
+        params = {
+            'app_id': self.app_id,
+            'app_key': self.app_key,
+            'what': query,
+            'where': location,
+            'results_per_page': results_per_page,
+            'content-type': 'application/json'
+        }
+        if self.cache is not None:
+            cached, state = self.cache.lookup(url, params)
+            if cached is not None:
+                if state == "stale":
+                    self.cache.revalidate_in_background(url, params)
+                return cached
+        for attempt in range(self.max_retries + 1):
+            await limiter.acquire()
+            try:
+                response = await client.get(url, params=params)
+            except httpx.TransportError as exc:
+                if attempt == self.max_retries:
+                    raise AdzunaError(f"Adzuna request failed for page {page}: {exc}") from exc
+                await asyncio.sleep(self.backoff * 2 ** attempt * (1 + random.random()))
+                continue
+            if response.status_code == 200:
+                data = response.json()
+                if self.cache is not None:
+                    self.cache.store(url, params, data)
+                return data
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                raise AdzunaError(f"Adzuna API Error {response.status_code} for page {page}: {response.text[:200]}")
+            retry_after = response.headers.get("Retry-After")
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else self.backoff * 2 ** attempt * (1 + random.random())
+            await asyncio.sleep(delay)
+        raise AdzunaError(f"Adzuna request failed for page {page}")
+
+    async def iter_jobs(
+        self,
+        query: str,
+        location: str,
+        max_pages: int = 5,
+        max_results: Optional[int] = None,
+        results_per_page: int = 50,
+        client: Optional[httpx.AsyncClient] = None,
+        limiter: Optional[TokenBucket] = None,
+        semaphore: Optional[asyncio.Semaphore] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield transformed job postings as their pages arrive.
+
+        Page 1 is fetched first to learn the total result count; the remaining
+        pages within the page and result budgets are then fetched concurrently.
+
+        Args:
+            query: Search keywords
+            location: Search location
+            max_pages: Page budget
+            max_results: Result budget (default: no limit beyond max_pages)
+            results_per_page: Page size
+            client: Pooled HTTP client to share (default: a new one)
+            limiter: Rate limiter to share (default: a new one)
+            semaphore: Concurrency limit to share (default: a new one)
+
+        Yields:
+            Job posting dictionaries
+        """
+        if client is None:
+            async with self._client() as client:
+                async for job in self.iter_jobs(
+                    query, location, max_pages, max_results, results_per_page,
+                    client=client, limiter=limiter, semaphore=semaphore
+                ):
+                    yield job
+            return
+
+        limiter = limiter or TokenBucket(self.rate_per_second)
+        semaphore = semaphore or asyncio.Semaphore(self.concurrency)
+        yielded = 0
+
+        async def bounded_fetch(page: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.fetch_page(client, limiter, query, location, page, results_per_page)
+
+        first = await bounded_fetch(1)
+        for job in first.get("results", []):
+            if max_results is not None and yielded >= max_results:
+                return
+            yielded += 1
+            yield transform_adzuna_job(job)
+
+        total = first.get("count", 0)
+        pages = min(max_pages, math.ceil(total / results_per_page)) if total else 1
+        if max_results is not None:
+            pages = min(pages, math.ceil(max_results / results_per_page))
+        tasks = [asyncio.create_task(bounded_fetch(page)) for page in range(2, pages + 1)]
+        try:
+            for next_page in asyncio.as_completed(tasks):
+                data = await next_page
+                for job in data.get("results", []):
+                    if max_results is not None and yielded >= max_results:
+                        return
+                    yielded += 1
+                    yield transform_adzuna_job(job)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def fetch_jobs(self, query: str, location: str, **kwargs: Any) -> List[Dict[str, Any]]:
+        """Collect iter_jobs into a list."""
+        return [job async for job in self.iter_jobs(query, location, **kwargs)]
+
+    async def fan_out(
+        self,
+        queries: Sequence[str],
+        locations: Sequence[str],
+        **kwargs: Any
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Run every query x location combination concurrently and merge the results.
+
+        All combinations share one HTTP client, rate limiter and concurrency limit,
+        so the fan-out respects the same API budget as a single search. Postings
+        are de-duplicated by job_id, keeping the first combination that returned
+        them; a failed combination is reported instead of failing the others.
+
+        Args:
+            queries: Search keywords
+            locations: Search locations
+            kwargs: Passed to iter_jobs (max_pages, max_results, results_per_page)
+
+        Returns:
+            Tuple of unique job postings and one report per combination with
+            its query, location, count, unique (postings not seen in an earlier
+            combination), latency_s and error
+        """
+        limiter = TokenBucket(self.rate_per_second)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        combinations = [(query, location) for query in queries for location in locations]
+
+        async with self._client() as client:
+            async def run(query: str, location: str) -> Tuple[List[Dict[str, Any]], float, Optional[str]]:
+                start = time.perf_counter()
+                jobs: List[Dict[str, Any]] = []
+                try:
+                    async for job in self.iter_jobs(
+                        query, location, client=client, limiter=limiter, semaphore=semaphore, **kwargs
+                    ):
+                        jobs.append(job)
+                except AdzunaError as exc:
+                    return jobs, time.perf_counter() - start, str(exc)
+                return jobs, time.perf_counter() - start, None
+
+            outcomes = await asyncio.gather(*(run(query, location) for query, location in combinations))
+
+        merged: Dict[str, Dict[str, Any]] = {}
+        reports = []
+        for (query, location), (jobs, latency, error) in zip(combinations, outcomes):
+            unique = 0
+            for job in jobs:
+                key = job.get("job_id") or f"{job.get('job_title')}|{job.get('employer_name')}|{job.get('job_city')}"
+                if key not in merged:
+                    merged[key] = job
+                    unique += 1
+            reports.append({
+                "query": query,
+                "location": location,
+                "count": len(jobs),
+                "unique": unique,
+                "latency_s": round(latency, 3),
+                "error": error
+            })
+        return list(merged.values()), reports
+
+
+def fetch_jobs(query: str, location: str, max_pages: int = 5, max_results: Optional[int] = None, **fetcher_kwargs: Any) -> List[Dict[str, Any]]:
+    """
+    Fetch several Adzuna result pages concurrently from synchronous code.
+
+    Args:
+        query: Search keywords
+        location: Search location
+        max_pages: Page budget
+        max_results: Result budget
+        fetcher_kwargs: Passed to AdzunaFetcher (base_url, concurrency, rate_per_second, ...)
+
+    Returns:
+        List of job posting dictionaries
+    """
+    fetcher = AdzunaFetcher(**fetcher_kwargs)
+    return asyncio.run(fetcher.fetch_jobs(query, location, max_pages=max_pages, max_results=max_results))
+
+
+def fan_out_jobs(
+    queries: Sequence[str],
+    locations: Sequence[str],
+    max_pages: int = 1,
+    max_results: Optional[int] = None,
+    **fetcher_kwargs: Any
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Search every query x location combination concurrently from synchronous code.
+
+    Args:
+        queries: Search keywords
+        locations: Search locations
+        max_pages: Page budget per combination
+        max_results: Result budget per combination
+        fetcher_kwargs: Passed to AdzunaFetcher (base_url, concurrency, rate_per_second, ...)
+
+    Returns:
+        Tuple of job postings de-duplicated by job_id and per-combination reports
+    """
+    fetcher = AdzunaFetcher(**fetcher_kwargs)
+    return asyncio.run(fetcher.fan_out(queries, locations, max_pages=max_pages, max_results=max_results))
+
+
+def stream_jobs(
+    query: str,
+    location: str,
+    max_pages: int = 5,
+    max_results: Optional[int] = None,
+    buffer_size: int = 200,
+    **fetcher_kwargs: Any
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield job postings to synchronous code as their pages arrive.
+
+    The fetcher runs on a background event loop and hands postings over through
+    a queue of buffer_size, so a slow consumer pauses fetching instead of
+    letting postings pile up. Closing the generator stops the fetch.
+
+    Args:
+        query: Search keywords
+        location: Search location
+        max_pages: Page budget
+        max_results: Result budget
+        buffer_size: Postings buffered ahead of the consumer
+        fetcher_kwargs: Passed to AdzunaFetcher (base_url, concurrency, cache, ...)
+
+    Yields:
+        Job posting dictionaries
+    """
+    fetcher = AdzunaFetcher(**fetcher_kwargs)
+    buffer: "queue.Queue[Any]" = queue.Queue(maxsize=buffer_size)
+    stop = threading.Event()
+    done = object()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    async def produce() -> None:
+        async for job in fetcher.iter_jobs(query, location, max_pages=max_pages, max_results=max_results):
+            if not put(job):
+                return
+
+    def run() -> None:
+        try:
+            asyncio.run(produce())
+        except Exception as exc:
+            put(exc)
+        finally:
+            put(done)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
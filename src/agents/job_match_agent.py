@@ -1,29 +1,71 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional
 import json
 from pathlib import Path
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
-from tools import ProfileParserTool, JobSearchTool, JobFilterTool, JobMatcherTool
+import tools
+from tools.descriptions import TOOL_DESCRIPTIONS
+from instrumentation import recording
+from .scheduler import StageError, WorkflowScheduler
+
+TOOL_CLASSES = {
+    'profile_parser': 'ProfileParserTool',
+    'job_searcher': 'JobSearchTool',
+    'job_filter': 'JobFilterTool',
+    'job_matcher': 'JobMatcherTool'
+}
 
 
 class JobMatchAgent:
     """
     Main agent orchestrator for job matching workflow.
     Coordinates tools to parse profiles, search jobs, filter, and match.
+    Tools are constructed on first use, so creating the agent is cheap, and are
+    called through their native entry points (parse, search, filter, match) so
+    postings are passed by reference instead of through JSON strings.
     """
     
     def __init__(self):
-        self.profile_tool = ProfileParserTool()
-        self.search_tool = JobSearchTool()
-        self.filter_tool = JobFilterTool()
-        self.match_tool = JobMatcherTool()
-        
-        self.tools = {
-            'profile_parser': self.profile_tool,
-            'job_searcher': self.search_tool,
-            'job_filter': self.filter_tool,
-            'job_matcher': self.match_tool
-        }
+        self._tools: Dict[str, Any] = {}
+    
+    def get_tool(self, tool_name: str) -> Any:
+        """Return a tool instance, constructing it on first use"""
+        if tool_name not in self._tools:
+            self._tools[tool_name] = getattr(tools, TOOL_CLASSES[tool_name])()
+        return self._tools[tool_name]
+    
+    @property
+    def tools(self) -> Dict[str, Any]:
+        """All registered tools by name, constructing any not yet built"""
+        for tool_name in TOOL_CLASSES:
+            self.get_tool(tool_name)
+        return self._tools
+    
+    @property
+    def profile_tool(self) -> Any:
+        return self.get_tool('profile_parser')
+    
+    @property
+    def search_tool(self) -> Any:
+        return self.get_tool('job_searcher')
+    
+    @property
+    def filter_tool(self) -> Any:
+        return self.get_tool('job_filter')
+    
+    @property
+    def match_tool(self) -> Any:
+        return self.get_tool('job_matcher')
+    
+    def warm_up(self) -> None:
+        """Construct all tools and load the embedding and spaCy models ahead of the first workflow"""
+        import embedding_utils
+        import text_preprocessing
+        
+        for tool_name in TOOL_CLASSES:
+            self.get_tool(tool_name)
+        text_preprocessing.warm_up()
+        embedding_utils.warm_up()
     
     def run_workflow(
         self, 
@@ -34,11 +76,19 @@ class JobMatchAgent:
         job_location: str = "Berlin",
         filter_countries: Optional[List[str]] = None,
         filter_keywords: Optional[List[str]] = None,
-        top_n: int = 3
+        top_n: int = 3,
+        stage_timeouts: Optional[Dict[str, float]] = None,
+        trace_path: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Run complete job matching workflow.
         
+        The steps form a dependency graph run by WorkflowScheduler: profile
+        parsing and the job search start together, and once the profile is
+        parsed the spaCy and embedding models are loaded and its skills embedded
+        while the search is still in flight. Filtering follows the search, and
+        matching waits for both branches.
+        
         Args:
             profile_source: 'pdf', 'json', or 'dict'
             profile_path: Path to PDF or JSON file
@@ -48,118 +98,188 @@ class JobMatchAgent:
             filter_countries: List of country codes
             filter_keywords: List of keywords for filtering
             top_n: Number of top matches to return
+            stage_timeouts: Seconds allowed per stage, keyed by stage name
+                (profile, search, prepare_profile, filter, match)
+            trace_path: JSON lines file for the run's spans and summary
+                (default: INSTRUMENTATION_LOG)
         
         Returns:
-            Dictionary with workflow results
+            Dictionary with workflow results; "stage_timings" holds each stage's
+            start offset, duration and status, each step its wall and CPU
+            seconds, and "instrumentation" the run's span totals, counters,
+            batch sizes, cache hit rates and peak memory
         """
-        workflow_results = {
-            "steps": [],
-            "profile": None,
-            "jobs_found": 0,
-            "jobs_filtered": 0,
-            "top_matches": []
-        }
+        timeouts = stage_timeouts or {}
         
-        # Step 1: Parse Profile
-        print("🔄 Step 1: Parsing profile...")
-        profile_input = {
-            "source": profile_source
-        }
-        if profile_path:
-            profile_input["path"] = profile_path
-        if profile_data:
-            profile_input["data"] = profile_data
+        def parse_profile(_: Dict[str, Any]) -> Dict[str, Any]:
+            print("🔄 Step 1: Parsing profile...")
+            profile_result = self.profile_tool.parse(profile_source, path=profile_path, data=profile_data)
+            if "error" in profile_result:
+                raise StageError("profile", f"Profile parsing failed: {profile_result['error']}")
+            print(f"✅ Profile loaded: {profile_result['profile'].get('name', 'Unknown')}")
+            return profile_result["profile"]
         
-        profile_result = self.profile_tool._run(json.dumps(profile_input))
+        def search_jobs(_: Dict[str, Any]) -> Dict[str, Any]:
+            print(f"\n🔄 Step 2: Searching jobs for '{job_query}' in {job_location}...")
+            search_result = self.search_tool.search(job_query, job_location)
+            if "error" in search_result:
+                raise StageError("search", f"Job search failed: {search_result['error']}")
+            print(f"✅ Found {len(search_result['jobs'])} jobs")
+            return search_result
         
-        if "error" in profile_result:
-            return {"error": f"Profile parsing failed: {profile_result['error']}"}
+        def prepare_profile(inputs: Dict[str, Any]) -> None:
+            import embedding_utils
+            import text_preprocessing
+            
+            # Load the models and embed the raw skills (cached for skill expansion) during the search
+            text_preprocessing.warm_up()
+            embedding_utils.warm_up()
+            skills = [str(skill) for skill in inputs["profile"].get("skills", []) or [] if skill]
+            if skills:
+                embedding_utils.embed_documents(skills)
         
-        profile = profile_result["profile"]
-        workflow_results["profile"] = profile
-        workflow_results["steps"].append({
-            "step": 1,
-            "name": "profile_parsing",
-            "status": "success"
-        })
-        print(f"✅ Profile loaded: {profile.get('name', 'Unknown')}")
-        
-        # Step 2: Search Jobs
-        print(f"\n🔄 Step 2: Searching jobs for '{job_query}' in {job_location}...")
-        search_input = {
-            "query": job_query,
-            "location": job_location
-        }
+        def filter_jobs(inputs: Dict[str, Any]) -> Dict[str, Any]:
+            print("\n🔄 Step 3: Filtering jobs...")
+            filter_result = self.filter_tool.filter(
+                inputs["search"]["jobs"],
+                countries=filter_countries or None,
+                keywords=filter_keywords or None
+            )
+            if "error" in filter_result:
+                raise StageError("filter", f"Job filtering failed: {filter_result['error']}")
+            print(f"✅ Filtered to {len(filter_result['jobs'])} jobs ({filter_result['filter_rate']})")
+            return filter_result
         
-        search_result = self.search_tool._run(json.dumps(search_input))
-        
-        if "error" in search_result:
-            return {"error": f"Job search failed: {search_result['error']}"}
-        
-        jobs = search_result["jobs"]
-        workflow_results["jobs_found"] = len(jobs)
-        workflow_results["steps"].append({
-            "step": 2,
-            "name": "job_search",
-            "status": "success",
-            "total_jobs": len(jobs)
-        })
-        print(f"✅ Found {len(jobs)} jobs")
-        
-        # Step 3: Filter Jobs
-        print("\n🔄 Step 3: Filtering jobs...")
-        filter_input = {
-            "jobs": jobs
-        }
-        if filter_countries:
-            filter_input["countries"] = filter_countries
-        if filter_keywords:
-            filter_input["keywords"] = filter_keywords
-        
-        filter_result = self.filter_tool._run(json.dumps(filter_input))
-        
-        if "error" in filter_result:
-            return {"error": f"Job filtering failed: {filter_result['error']}"}
-        
-        filtered_jobs = filter_result["jobs"]
-        workflow_results["jobs_filtered"] = len(filtered_jobs)
-        workflow_results["steps"].append({
-            "step": 3,
-            "name": "job_filtering",
-            "status": "success",
-            "filtered_jobs": len(filtered_jobs),
-            "filter_rate": filter_result["filter_rate"]
-        })
-        print(f"✅ Filtered to {len(filtered_jobs)} jobs ({filter_result['filter_rate']})")
-        
-        # Step 4: Match Jobs
-        print("\n🔄 Step 4: Matching jobs to profile...")
-        match_input = {
-            "profile": profile,
-            "jobs": filtered_jobs,
-            "top_n": top_n
+        def match_jobs(inputs: Dict[str, Any]) -> Dict[str, Any]:
+            print("\n🔄 Step 4: Matching jobs to profile...")
+            match_result = self.match_tool.match(inputs["profile"], inputs["filter"]["jobs"], top_n=top_n)
+            if "error" in match_result:
+                raise StageError("match", f"Job matching failed: {match_result['error']}")
+            print(f"✅ Found {len(match_result['matches'])} top matches")
+            return match_result
+        
+        scheduler = WorkflowScheduler()
+        scheduler.add_stage("profile", parse_profile, timeout=timeouts.get("profile"))
+        scheduler.add_stage("search", search_jobs, timeout=timeouts.get("search"))
+        scheduler.add_stage("prepare_profile", prepare_profile, depends_on=["profile"], timeout=timeouts.get("prepare_profile"))
+        scheduler.add_stage("filter", filter_jobs, depends_on=["search"], timeout=timeouts.get("filter"))
+        scheduler.add_stage("match", match_jobs, depends_on=["profile", "prepare_profile", "filter"], timeout=timeouts.get("match"))
+        
+        with recording(trace_path) as recorder:
+            try:
+                results = scheduler.run()
+            except StageError as e:
+                return {"error": str(e), "stage_timings": scheduler.timings, "instrumentation": recorder.summary()}
+        
+        stages = recorder.stages("stage.")
+        
+        def cost(stage: str) -> Dict[str, float]:
+            return {key: stages.get(stage, {}).get(key) for key in ("wall_s", "cpu_s")}
+        
+        jobs = results["search"]["jobs"]
+        filter_result = results["filter"]
+        match_result = results["match"]
+        return {
+            "steps": [
+                dict({"step": 1, "name": "profile_parsing", "status": "success"}, **cost("profile")),
+                dict({"step": 2, "name": "job_search", "status": "success", "total_jobs": len(jobs)}, **cost("search")),
+                dict({
+                    "step": 3,
+                    "name": "job_filtering",
+                    "status": "success",
+                    "filtered_jobs": len(filter_result["jobs"]),
+                    "filter_rate": filter_result["filter_rate"]
+                }, **cost("filter")),
+                dict({
+                    "step": 4,
+                    "name": "job_matching",
+                    "status": "success",
+                    "top_matches": len(match_result["matches"]),
+                    "timings": match_result.get("timings", {})
+                }, **cost("match"))
+            ],
+            "profile": results["profile"],
+            "jobs_found": len(jobs),
+            "jobs_filtered": len(filter_result["jobs"]),
+            "top_matches": match_result["matches"],
+            "stage_timings": scheduler.timings,
+            "instrumentation": recorder.summary()
         }
+    
+    def stream_workflow(
+        self,
+        profile_source: str,
+        profile_path: Optional[str] = None,
+        profile_data: Optional[Dict] = None,
+        job_query: str = "AI engineer",
+        job_location: str = "Berlin",
+        filter_countries: Optional[List[str]] = None,
+        filter_keywords: Optional[List[str]] = None,
+        top_n: int = 3,
+        max_pages: int = 5,
+        max_results: Optional[int] = None,
+        batch_size: int = 64,
+        job_source: Optional[Iterable[Dict[str, Any]]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Run the workflow as a stream: postings flow from the search through the
+        filter criteria into micro-batched embedding and a running top-N, so
+        memory stays flat and provisional matches are available early.
         
-        match_result = self.match_tool._run(json.dumps(match_input))
+        Args:
+            profile_source: 'pdf', 'json', or 'dict'
+            profile_path: Path to PDF or JSON file
+            profile_data: Direct profile dictionary
+            job_query: Job search query
+            job_location: Job location
+            filter_countries: List of country codes
+            filter_keywords: List of keywords for filtering
+            top_n: Number of top matches to return
+            max_pages: Adzuna result pages to stream
+            max_results: Maximum postings to stream
+            batch_size: Postings embedded per micro-batch
+            job_source: Iterable of postings to use instead of the Adzuna search
         
-        if "error" in match_result:
-            return {"error": f"Job matching failed: {match_result['error']}"}
+        Yields:
+            Snapshots with provisional "matches", "jobs_seen", "jobs_scored" and
+            "timings"; the last one has "final" set and carries the profile.
+            A dictionary with "error" is yielded if a stage fails.
+        """
+        from job_corpus import get_job_corpus
+        from job_filter import build_job_predicate
+        from pipeline import stream_matches
         
-        matches = match_result["matches"]
-        workflow_results["top_matches"] = matches
-        workflow_results["steps"].append({
-            "step": 4,
-            "name": "job_matching",
-            "status": "success",
-            "top_matches": len(matches)
-        })
-        print(f"✅ Found {len(matches)} top matches")
+        profile_result = self.profile_tool.parse(profile_source, path=profile_path, data=profile_data)
+        if "error" in profile_result:
+            yield {"error": f"Profile parsing failed: {profile_result['error']}"}
+            return
+        profile = profile_result["profile"]
         
-        return workflow_results
+        if job_source is None:
+            from adzuna_client import stream_jobs
+            from job_search import get_response_cache
+            job_source = stream_jobs(
+                job_query, job_location,
+                max_pages=max_pages, max_results=max_results,
+                cache=get_response_cache()
+            )
+        predicate = build_job_predicate(countries=filter_countries, keywords=filter_keywords)
+        
+        try:
+            for snapshot in stream_matches(
+                profile, job_source, top_n=top_n, batch_size=batch_size,
+                predicate=predicate, corpus=get_job_corpus()
+            ):
+                if snapshot["final"]:
+                    snapshot["profile"] = profile
+                yield snapshot
+        except Exception as e:
+            yield {"error": f"Streaming workflow failed: {str(e)}"}
     
     def call_tool(self, tool_name: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Call a specific tool directly.
+        Call a specific tool directly, passing input_data to its run_dict
+        entry point without a JSON round-trip.
         
         Args:
             tool_name: Name of the tool to call
@@ -168,22 +288,24 @@ class JobMatchAgent:
         Returns:
             Tool result
         """
-        if tool_name not in self.tools:
+        if tool_name not in self._tools and tool_name not in TOOL_CLASSES:
             return {"error": f"Unknown tool: {tool_name}"}
         
-        tool = self.tools[tool_name]
-        input_str = json.dumps(input_data)
-        
-        return tool._run(input_str)
+        tool = self.get_tool(tool_name)
+        if hasattr(tool, "run_dict"):
+            return tool.run_dict(input_data)
+        return tool._run(json.dumps(input_data))
     
     def list_tools(self) -> List[Dict[str, str]]:
-        """List all available tools"""
+        """List all available tools without constructing the ones not yet used"""
+        descriptions = dict(TOOL_DESCRIPTIONS)
+        descriptions.update({name: tool.description for name, tool in self._tools.items()})
         return [
             {
                 "name": name,
-                "description": tool.description
+                "description": description
             }
-            for name, tool in self.tools.items()
+            for name, description in descriptions.items()
         ]
     
     def display_results(self, workflow_results: Dict[str, Any]) -> None:
@@ -210,6 +332,8 @@ class JobMatchAgent:
             print(f"    🏢 {job.get('employer_name', 'N/A')}")
             print(f"    📍 {job.get('job_city', 'N/A')}, {job.get('job_country', 'N/A')}")
             print(f"    🔗 {job.get('job_apply_link', 'N/A')}")
+            if 'match_score' in job:
+                print(f"    🎯 Score: {job['match_score']:.3f}")
         
         print("\n" + "=" * 80)
 
@@ -0,0 +1,163 @@
+import contextvars
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+from instrumentation import profile_thread, span
+
+
+class StageError(Exception):
+    """A workflow stage failed; the message is reported as the workflow error."""
+
+    def __init__(self, stage: str, message: str):
+        super().__init__(message)
+        self.stage = stage
+
+
+class StageTimeout(StageError):
+    """A workflow stage ran past its timeout."""
+
+
+class Stage:
+    """One node of a workflow graph: a callable of its dependencies' results."""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Dict[str, Any]], Any],
+        depends_on: Iterable[str] = (),
+        timeout: Optional[float] = None
+    ):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.timeout = timeout
+
+
+class WorkflowScheduler:
+    """
+    Runs a dependency graph of stages on a thread pool.
+
+    Each stage starts as soon as all of its dependencies have finished and
+    receives their results as a {stage name: result} dictionary, so
+    independent stages overlap and the wall time approaches the longest path
+    through the graph. Stages run in a copy of the caller's context and are
+    recorded as "stage.<name>" spans. When a stage raises or exceeds its
+    timeout, stages not yet started are skipped, `cancelled` is set for
+    running stages that check it, and the error is raised from run(). Running
+    stages cannot be interrupted; their results are discarded.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+        self.stages: Dict[str, Stage] = {}
+        self.timings: Dict[str, Dict[str, Any]] = {}
+        self.cancelled = threading.Event()
+
+    def add_stage(
+        self,
+        name: str,
+        func: Callable[[Dict[str, Any]], Any],
+        depends_on: Iterable[str] = (),
+        timeout: Optional[float] = None
+    ) -> "WorkflowScheduler":
+        """
+        Add a stage. Dependencies must already be added, which keeps the graph acyclic.
+
+        Args:
+            name: Unique stage name
+            func: Called with the results of depends_on; its return value is the stage result
+            depends_on: Names of stages that must finish first
+            timeout: Seconds the stage may run before the workflow fails
+
+        Returns:
+            The scheduler, for chaining
+        """
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        stage = Stage(name, func, depends_on, timeout)
+        missing = [dependency for dependency in stage.depends_on if dependency not in self.stages]
+        if missing:
+            raise ValueError(f"Stage {name} depends on unknown stages: {', '.join(missing)}")
+        self.stages[name] = stage
+        return self
+
+    @staticmethod
+    def _run_stage(stage: Stage, inputs: Dict[str, Any]) -> Any:
+        with profile_thread(), span(f"stage.{stage.name}"):
+            return stage.func(inputs)
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run every stage once, as concurrently as dependencies allow.
+
+        Returns:
+            Results by stage name. `timings` then holds each stage's start offset,
+            duration and status (done, failed, timeout, cancelled or skipped).
+
+        Raises:
+            StageError: The first stage to fail or time out
+        """
+        results: Dict[str, Any] = {}
+        pending = dict(self.stages)
+        running: Dict[Future, Tuple[str, Optional[float]]] = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_workers or max(len(self.stages), 1),
+                                      thread_name_prefix="workflow-stage")
+        start = time.perf_counter()
+        self.timings = {}
+        self.cancelled.clear()
+
+        def finish(name: str, status: str) -> None:
+            timing = self.timings[name]
+            timing["seconds"] = round(time.perf_counter() - start - timing["start"], 4)
+            timing["status"] = status
+
+        try:
+            while pending or running:
+                ready = [name for name, stage in pending.items() if all(d in results for d in stage.depends_on)]
+                for name in ready:
+                    stage = pending.pop(name)
+                    self.timings[name] = {"start": round(time.perf_counter() - start, 4)}
+                    deadline = time.perf_counter() + stage.timeout if stage.timeout is not None else None
+                    future = executor.submit(
+                        contextvars.copy_context().run, self._run_stage, stage, {d: results[d] for d in stage.depends_on}
+                    )
+                    running[future] = (name, deadline)
+
+                deadlines = [deadline for _, deadline in running.values() if deadline is not None]
+                wait_for = max(min(deadlines) - time.perf_counter(), 0) if deadlines else None
+                done, _ = wait(running, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name, _ = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except StageError:
+                        finish(name, "failed")
+                        raise
+                    except Exception as exc:
+                        finish(name, "failed")
+                        raise StageError(name, f"{name} failed: {exc}") from exc
+                    finish(name, "done")
+
+                now = time.perf_counter()
+                for future, (name, deadline) in list(running.items()):
+                    if deadline is not None and now >= deadline:
+                        running.pop(future)
+                        finish(name, "timeout")
+                        raise StageTimeout(name, f"{name} timed out after {self.stages[name].timeout}s")
+        except BaseException:
+            self.cancelled.set()
+            for name, _ in running.values():
+                finish(name, "cancelled")
+            for name in pending:
+                self.timings[name] = {"start": None, "seconds": 0.0, "status": "skipped"}
+            raise
+        finally:
+            # Do not wait for abandoned stages; queued ones are dropped
+            executor.shutdown(wait=False, cancel_futures=True)
+        return results
@@ -0,0 +1,209 @@
+import json
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from similarity import normalize_rows, top_k_indices
+
+
+def spherical_kmeans(vectors: np.ndarray, n_clusters: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """
+    Cluster L2-normalized vectors by cosine similarity.
+
+    Args:
+        vectors: L2-normalized training vectors
+        n_clusters: Number of centroids
+        iterations: Lloyd iterations
+        seed: Random seed for the initial centroids
+
+    Returns:
+        L2-normalized centroid matrix of shape (n_clusters, dim)
+    """
+    rng = np.random.default_rng(seed)
+    n_clusters = min(n_clusters, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = assign_to_centroids(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, vectors)
+        empty = ~sums.any(axis=1)
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+def assign_to_centroids(vectors: np.ndarray, centroids: np.ndarray, block_size: int = 8192) -> np.ndarray:
+    """Return the index of the most similar centroid for each vector."""
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), block_size):
+        assignments[start:start + block_size] = np.argmax(vectors[start:start + block_size] @ centroids.T, axis=1)
+    return assignments
+
+
+class IVFIndex:
+    """
+    Inverted-file approximate nearest-neighbour index over job embeddings.
+
+    Vectors are L2-normalized and assigned to the nearest of n_lists k-means
+    centroids. A query scans only the n_probe most similar lists, so n_probe
+    trades recall for latency: n_probe == n_lists is an exact search.
+    """
+
+    def __init__(self, centroids: np.ndarray, n_probe: int = 8):
+        self.centroids = normalize_rows(centroids)
+        self.n_probe = n_probe
+        self.dim = self.centroids.shape[1]
+        self._vectors = np.empty((0, self.dim), dtype=np.float32)
+        self._assignments = np.empty(0, dtype=np.int32)
+        self._alive = np.empty(0, dtype=bool)
+        self._ids: List[str] = []
+        self._row_of = {}
+        self._lists: Optional[List[np.ndarray]] = None
+
+    @classmethod
+    def build(
+        cls,
+        vectors: np.ndarray,
+        ids: Sequence[str],
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        iterations: int = 10,
+        train_size: int = 65536,
+        seed: int = 0
+    ) -> "IVFIndex":
+        """
+        Train centroids on a sample of vectors and index all of them.
+
+        Args:
+            vectors: Embedding matrix, one row per job
+            ids: job_id for each row
+            n_lists: Number of inverted lists (default: about sqrt of the corpus size)
+            n_probe: Lists scanned per query
+            iterations: k-means iterations
+            train_size: Maximum number of vectors used to train centroids
+            seed: Random seed
+
+        Returns:
+            Populated index
+        """
+        vectors = normalize_rows(vectors)
+        if n_lists is None:
+            n_lists = max(1, int(np.sqrt(len(vectors))))
+        rng = np.random.default_rng(seed)
+        sample = vectors if len(vectors) <= train_size else vectors[rng.choice(len(vectors), train_size, replace=False)]
+        index = cls(spherical_kmeans(sample, n_lists, iterations=iterations, seed=seed), n_probe=n_probe)
+        index.add(vectors, ids)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def add(self, vectors: np.ndarray, ids: Sequence[str]) -> None:
+        """
+        Insert vectors; an id that is already indexed is replaced, and an id
+        repeated within ids keeps its last vector.
+        """
+        ids = [str(job_id) for job_id in ids]
+        last_row = {job_id: row for row, job_id in enumerate(ids)}
+        if len(last_row) < len(ids):
+            keep = sorted(last_row.values())
+            vectors = np.asarray(vectors)[keep]
+            ids = [ids[row] for row in keep]
+        if ids and not len(self.centroids):
+            raise ValueError("Index has no centroids; build it from at least one vector")
+        self.remove(job_id for job_id in ids if job_id in self._row_of)
+        vectors = normalize_rows(vectors)
+        start = len(self._ids)
+        self._vectors = np.concatenate([self._vectors, vectors])
+        self._assignments = np.concatenate([self._assignments, assign_to_centroids(vectors, self.centroids)])
+        self._alive = np.concatenate([self._alive, np.ones(len(ids), dtype=bool)])
+        for offset, job_id in enumerate(ids):
+            self._row_of[job_id] = start + offset
+        self._ids.extend(ids)
+        self._lists = None
+
+    def remove(self, ids: Iterable[str]) -> int:
+        """Delete vectors by job_id and return how many were removed."""
+        rows = [self._row_of.pop(str(job_id)) for job_id in list(ids) if str(job_id) in self._row_of]
+        if rows:
+            self._alive[rows] = False
+            self._lists = None
+        return len(rows)
+
+    def _inverted_lists(self) -> List[np.ndarray]:
+        """Group live rows by centroid, rebuilding after inserts or deletes."""
+        if self._lists is None:
+            live_rows = np.flatnonzero(self._alive)
+            order = np.argsort(self._assignments[live_rows], kind='stable')
+            sorted_rows = live_rows[order]
+            bounds = np.searchsorted(self._assignments[sorted_rows], np.arange(len(self.centroids) + 1))
+            self._lists = [sorted_rows[bounds[i]:bounds[i + 1]] for i in range(len(self.centroids))]
+        return self._lists
+
+    def search(self, queries: np.ndarray, k: int, n_probe: Optional[int] = None) -> Tuple[List[List[str]], np.ndarray]:
+        """
+        Find the k most similar jobs for each query vector.
+
+        Args:
+            queries: Query matrix, one row per query
+            k: Number of neighbours
+            n_probe: Lists scanned per query (default: the index setting)
+
+        Returns:
+            Tuple of job_id lists and a score matrix padded with -inf
+        """
+        queries = normalize_rows(queries)
+        result_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        if not len(self):
+            return [[] for _ in range(len(queries))], result_scores
+        n_probe = min(n_probe or self.n_probe, len(self.centroids))
+        lists = self._inverted_lists()
+        probes = top_k_indices(queries @ self.centroids.T, n_probe)
+
+        result_ids: List[List[str]] = []
+        for q, query in enumerate(queries):
+            rows = np.concatenate([lists[probe] for probe in probes[q]])
+            if not len(rows):
+                result_ids.append([])
+                continue
+            scores = self._vectors[rows] @ query
+            best = top_k_indices(scores.reshape(1, -1), k)[0]
+            result_ids.append([self._ids[rows[i]] for i in best])
+            result_scores[q, :len(best)] = scores[best]
+        return result_ids, result_scores
+
+    def compact(self) -> None:
+        """Drop deleted rows from storage."""
+        live_rows = np.flatnonzero(self._alive)
+        self._vectors = np.ascontiguousarray(self._vectors[live_rows])
+        self._assignments = self._assignments[live_rows]
+        self._alive = np.ones(len(live_rows), dtype=bool)
+        self._ids = [self._ids[row] for row in live_rows]
+        self._row_of = {job_id: row for row, job_id in enumerate(self._ids)}
+        self._lists = None
+
+    def save(self, directory: str) -> None:
+        """Write the index as .npy files plus a JSON manifest, compacting it first."""
+        self.compact()
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / 'centroids.npy', self.centroids)
+        np.save(path / 'vectors.npy', self._vectors)
+        np.save(path / 'assignments.npy', self._assignments)
+        with open(path / 'index.json', 'w', encoding='utf-8') as f:
+            json.dump({"n_probe": self.n_probe, "ids": self._ids}, f)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "IVFIndex":
+        """Load a saved index, memory-mapping the vector matrix unless mmap is False."""
+        path = Path(directory)
+        with open(path / 'index.json', 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        index = cls(np.load(path / 'centroids.npy'), n_probe=manifest["n_probe"])
+        index._vectors = np.load(path / 'vectors.npy', mmap_mode='r' if mmap else None)
+        index._assignments = np.load(path / 'assignments.npy')
+        index._alive = np.ones(len(manifest["ids"]), dtype=bool)
+        index._ids = manifest["ids"]
+        index._row_of = {job_id: row for row, job_id in enumerate(index._ids)}
+        return index
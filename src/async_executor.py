@@ -0,0 +1,123 @@
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+_thread_executor = None
+_process_executor = None
+_executor_lock = threading.Lock()
+
+
+class BoundedExecutor:
+    """
+    Runs blocking calls from async code on a shared executor.
+
+    At most max_pending calls are submitted at once; further callers wait on
+    an asyncio semaphore instead of queueing work inside the executor, so a
+    burst of requests applies backpressure to the callers rather than growing
+    an unbounded backlog. One semaphore is kept per event loop, since asyncio
+    primitives cannot be shared across loops. Thread executors run calls in a
+    copy of the caller's context, so instrumentation spans nest correctly.
+    """
+
+    def __init__(self, executor: Executor, max_pending: int):
+        self.executor = executor
+        self.max_pending = max_pending
+        self.in_flight = 0
+        self.waiting = 0
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_pending)
+            return semaphore
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Await func(*args, **kwargs) on the executor without blocking the event loop.
+
+        For a process executor, func and its arguments must be picklable.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore(loop)
+        self.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        def finished(_: Any = None) -> None:
+            self.in_flight -= 1
+            semaphore.release()
+
+        self.in_flight += 1
+        try:
+            call = functools.partial(func, *args, **kwargs)
+            if isinstance(self.executor, ThreadPoolExecutor):
+                call = functools.partial(contextvars.copy_context().run, call)
+            future = loop.run_in_executor(self.executor, call)
+            # A cancelled caller cannot stop a running call, so its slot is only freed when the call ends
+            future.add_done_callback(finished)
+        except BaseException:
+            # Nothing was submitted (e.g. the executor was shut down), so free the slot now
+            finished()
+            raise
+        return await asyncio.shield(future)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the underlying executor."""
+        self.executor.shutdown(wait=wait)
+
+
+def get_thread_executor() -> BoundedExecutor:
+    """
+    Return the process-wide executor for blocking I/O and GIL-releasing work
+    (model inference, numpy, SQLite, file writes).
+    ASYNC_THREAD_WORKERS (default 4) and ASYNC_THREAD_MAX_PENDING (default:
+    the worker count) configure it.
+    """
+    global _thread_executor
+    if _thread_executor is None:
+        with _executor_lock:
+            if _thread_executor is None:
+                workers = int(os.getenv("ASYNC_THREAD_WORKERS", "4"))
+                _thread_executor = BoundedExecutor(
+                    ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tool-worker"),
+                    int(os.getenv("ASYNC_THREAD_MAX_PENDING", str(workers)))
+                )
+    return _thread_executor
+
+
+def get_process_executor() -> BoundedExecutor:
+    """
+    Return the process-wide executor for pure-Python CPU-bound work such as
+    PDF parsing, which would hold the GIL in a thread.
+    ASYNC_PROCESS_WORKERS (default: CPU count) and ASYNC_PROCESS_MAX_PENDING
+    (default: the worker count) configure it.
+    """
+    global _process_executor
+    if _process_executor is None:
+        with _executor_lock:
+            if _process_executor is None:
+                workers = int(os.getenv("ASYNC_PROCESS_WORKERS", str(os.cpu_count() or 1)))
+                _process_executor = BoundedExecutor(
+                    ProcessPoolExecutor(max_workers=workers),
+                    int(os.getenv("ASYNC_PROCESS_MAX_PENDING", str(workers)))
+                )
+    return _process_executor
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    """Shut down the shared executors; they are recreated on next use."""
+    global _thread_executor, _process_executor
+    with _executor_lock:
+        for executor in (_thread_executor, _process_executor):
+            if executor is not None:
+                executor.shutdown(wait=wait)
+        _thread_executor = _process_executor = None
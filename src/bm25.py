@@ -0,0 +1,114 @@
+from collections import Counter
+from typing import Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+
+from keyword_matcher import tokenize
+
+RRF_K = 60
+
+
+class BM25Index:
+    """
+    Okapi BM25 over pre-normalized (lemmatized) documents.
+
+    Each posting stores its term's precomputed BM25 weight for the document,
+    so scoring a query is a scatter-add over the posting lists of its terms.
+    """
+
+    def __init__(self, documents: Iterable[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.vocabulary: Dict[str, int] = {}
+        token_lists = [tokenize(text) for text in documents]
+        lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+        add_term = self.vocabulary.setdefault
+        term_ids = np.fromiter(
+            (add_term(token, len(self.vocabulary)) for tokens in token_lists for token in tokens),
+            dtype=np.int64, count=int(lengths.sum())
+        )
+        stride = max(len(token_lists), 1)
+        doc_ids = np.repeat(np.arange(len(token_lists), dtype=np.int64), lengths)
+
+        # Count (term, document) pairs; sorting by term then document groups each posting list
+        pairs, freqs = np.unique(term_ids * stride + doc_ids, return_counts=True)
+        terms = pairs // stride
+        self.n_docs = len(token_lists)
+        self.doc_lengths = lengths.astype(np.float32)
+        self.postings = (pairs % stride).astype(np.int32)
+        self.offsets = np.searchsorted(terms, np.arange(len(self.vocabulary) + 1))
+
+        doc_freqs = np.diff(self.offsets)
+        self.idf = np.log1p((self.n_docs - doc_freqs + 0.5) / (doc_freqs + 0.5)).astype(np.float32)
+        average_length = float(self.doc_lengths.mean()) if self.n_docs else 0.0
+        freqs = freqs.astype(np.float32)
+        norms = k1 * (1 - b + b * self.doc_lengths[self.postings] / (average_length or 1.0))
+        self.weights = (self.idf[terms] * freqs * (k1 + 1) / (freqs + norms)).astype(np.float32)
+
+    def __len__(self) -> int:
+        return self.n_docs
+
+    def scores(self, query: str) -> np.ndarray:
+        """
+        Score every document against a query.
+
+        Args:
+            query: Query text, normalized like the documents
+
+        Returns:
+            float32 BM25 scores, one per document
+        """
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        for term, count in Counter(tokenize(query)).items():
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                continue
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            # Postings of one term hold distinct documents, so fancy-index += is safe
+            scores[self.postings[start:end]] += count * self.weights[start:end]
+        return scores
+
+    def top_k(self, query: str, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the k best documents for a query, best first.
+
+        Ties, including documents sharing no term with the query, keep
+        document order.
+
+        Returns:
+            Tuple of document indices and their scores
+        """
+        scores = self.scores(query)
+        k = max(min(k, self.n_docs), 0)
+        if k == 0:
+            candidates = np.empty(0, dtype=np.int64)
+        elif k < self.n_docs:
+            threshold = np.partition(scores, self.n_docs - k)[self.n_docs - k]
+            above = np.flatnonzero(scores > threshold)
+            candidates = np.concatenate([above, np.flatnonzero(scores == threshold)[:k - len(above)]])
+        else:
+            candidates = np.arange(self.n_docs)
+        order = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return order, scores[order]
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[int]], k: int = RRF_K) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fuse several rankings of the same items by reciprocal rank.
+
+    Each item scores sum(1 / (k + rank)) over the rankings it appears in, with
+    ranks starting at 1; a larger k flattens the advantage of the top ranks.
+
+    Args:
+        rankings: Item ids, best first, one sequence per ranker
+        k: Rank smoothing constant
+
+    Returns:
+        Tuple of item ids and fused scores, best first
+    """
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            fused[int(item)] = fused.get(int(item), 0.0) + 1.0 / (k + rank)
+    items = sorted(fused, key=lambda item: -fused[item])
+    return np.asarray(items, dtype=np.int64), np.asarray([fused[item] for item in items], dtype=np.float32)
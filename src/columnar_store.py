@@ -0,0 +1,301 @@
+"""
+Columnar on-disk job corpus.
+
+Each job field is stored as its own column file: UTF-8 values concatenated into
+one byte file plus an offsets array, all memory-mapped on load so opening the
+corpus costs the same for a thousand postings as for a million.
+job_country and job_employment_type are also stored as categorical codes with
+one packed bitmap per category, and title + description get an inverted token
+index, so JobFilterTool-style filters run as mask operations and posting-list
+lookups instead of a Python loop over dicts.
+
+Usage:
+    python src/columnar_store.py data/job_postings.json data/job_columns
+"""
+import json
+import re
+import sys
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from keyword_matcher import TokenIndex
+
+CATEGORICAL_FIELDS = ('job_country', 'job_employment_type')
+KEYWORD_FIELDS = ('job_title', 'job_description')
+SEPARATOR = b'\x00'
+
+
+class StringColumn:
+    """
+    Read-only view of a memory-mapped string column.
+
+    Value i is data[offsets[i]:offsets[i + 1] - 1]; every value is followed by a
+    NUL separator so byte-level searches never match across two rows.
+    """
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row: int) -> str:
+        start, end = int(self.offsets[row]), int(self.offsets[row + 1]) - 1
+        return self.data[start:end].tobytes().decode('utf-8')
+
+    def rows_containing(self, keywords: Sequence[str]) -> np.ndarray:
+        """
+        Return the sorted rows whose value contains any keyword. Keywords are
+        lowercased with str.lower, so call this on a lowercased column to ignore case.
+        """
+        if not len(self.data):
+            return np.empty(0, dtype=np.int64)
+        text = memoryview(self.data)
+        starts = []
+        for keyword in keywords:
+            # A literal pattern uses the fast substring search; consuming the rest of
+            # the row after a hit yields at most one match per row
+            pattern = re.compile(re.escape(keyword.lower().encode('utf-8')) + b'[^\x00]*')
+            starts.append(np.fromiter((match.start() for match in pattern.finditer(text)), dtype=np.int64))
+        starts = np.concatenate(starts) if starts else np.empty(0, dtype=np.int64)
+        return np.unique(np.searchsorted(self.offsets, starts, side='right') - 1)
+
+
+def _write_string_column(path: Path, field: str, values: Iterable[str], search_copy: bool = False) -> int:
+    """
+    Write one string column and return the number of rows.
+    With search_copy, also write the values lowercased with str.lower to
+    <field>.lower.bin with their own <field>.search.offsets.npy, since
+    lowercasing can change the byte length of non-ASCII values.
+    """
+    offsets = [0]
+    lower_offsets = [0]
+    with open(path / f'{field}.bin', 'wb') as f, \
+            open(path / f'{field}.lower.bin', 'wb') if search_copy else nullcontext() as lower:
+        for value in values:
+            encoded = value.encode('utf-8') + SEPARATOR
+            f.write(encoded)
+            offsets.append(offsets[-1] + len(encoded))
+            if lower is not None:
+                lowered = value.lower().encode('utf-8') + SEPARATOR
+                lower.write(lowered)
+                lower_offsets.append(lower_offsets[-1] + len(lowered))
+    np.save(path / f'{field}.offsets.npy', np.asarray(offsets, dtype=np.int64))
+    if search_copy:
+        np.save(path / f'{field}.search.offsets.npy', np.asarray(lower_offsets, dtype=np.int64))
+    return len(offsets) - 1
+
+
+def _field_value(job: Dict[str, Any], field: str) -> str:
+    value = job.get(field)
+    return '' if value is None else str(value)
+
+
+class ColumnarJobStore:
+    """
+    Memory-mapped columnar job corpus.
+
+    Columns are opened lazily on first access; job(i) and jobs(rows) rebuild
+    posting dictionaries only for the rows asked for. Field values are stored
+    as strings.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        with open(self.directory / 'columns.json', 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        self.fields: List[str] = manifest["fields"]
+        self.categories: Dict[str, List[str]] = manifest["categories"]
+        self._length: int = manifest["rows"]
+        self._columns: Dict[Tuple[str, bool], StringColumn] = {}
+        self._codes: Dict[str, np.ndarray] = {}
+        self._bitmaps: Dict[str, np.ndarray] = {}
+        self._token_index: Optional[TokenIndex] = None
+
+    @classmethod
+    def write(cls, jobs: Sequence[Dict[str, Any]], directory: str, fields: Optional[Sequence[str]] = None) -> "ColumnarJobStore":
+        """
+        Write job postings as column files and open the store.
+
+        Args:
+            jobs: Job posting dictionaries
+            directory: Where to write the columns
+            fields: Fields to store (default: every key seen, in first-seen order)
+
+        Returns:
+            Opened store
+        """
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        if fields is None:
+            fields = list(dict.fromkeys(key for job in jobs for key in job))
+        fields = list(fields)
+
+        for field in fields:
+            _write_string_column(
+                path, field, (_field_value(job, field) for job in jobs), search_copy=field in KEYWORD_FIELDS
+            )
+
+        categories = {}
+        for field in CATEGORICAL_FIELDS:
+            lookup: Dict[str, int] = {}
+            codes = np.fromiter(
+                (lookup.setdefault(_field_value(job, field), len(lookup)) for job in jobs),
+                dtype=np.int32, count=len(jobs)
+            )
+            bitmaps = np.stack([np.packbits(codes == code) for code in range(len(lookup))]) \
+                if lookup else np.empty((0, 0), dtype=np.uint8)
+            np.save(path / f'{field}.codes.npy', codes)
+            np.save(path / f'{field}.bitmaps.npy', bitmaps)
+            categories[field] = list(lookup)
+
+        TokenIndex.build(
+            f"{_field_value(job, 'job_title')}\n{_field_value(job, 'job_description')}" for job in jobs
+        ).save(str(path / 'tokens'))
+
+        with open(path / 'columns.json', 'w', encoding='utf-8') as f:
+            json.dump({"rows": len(jobs), "fields": fields, "categories": categories}, f, ensure_ascii=False)
+        return cls(directory)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def column(self, field: str, lowered: bool = False) -> StringColumn:
+        """
+        Return a string column, memory-mapping it on first use.
+        lowered selects the lowercased search copy written for KEYWORD_FIELDS.
+        """
+        key = (field, lowered)
+        if key not in self._columns:
+            if field not in self.fields:
+                raise KeyError(f"Unknown field: {field}")
+            data_path = self.directory / (f'{field}.lower.bin' if lowered else f'{field}.bin')
+            offsets_path = self.directory / (f'{field}.search.offsets.npy' if lowered else f'{field}.offsets.npy')
+            if lowered and not offsets_path.exists():
+                raise FileNotFoundError(
+                    f"{offsets_path} is missing; rebuild the store with ColumnarJobStore.write or convert_json"
+                )
+            data = np.memmap(data_path, dtype=np.uint8, mode='r') if data_path.stat().st_size else np.empty(0, np.uint8)
+            offsets = np.load(offsets_path, mmap_mode='r')
+            self._columns[key] = StringColumn(data, offsets)
+        return self._columns[key]
+
+    def codes(self, field: str) -> np.ndarray:
+        """Return the categorical codes of a field; categories[field][code] is the value."""
+        if field not in self._codes:
+            self._codes[field] = np.load(self.directory / f'{field}.codes.npy', mmap_mode='r')
+        return self._codes[field]
+
+    def bitmaps(self, field: str) -> np.ndarray:
+        """Return the packed per-category row bitmaps of a field."""
+        if field not in self._bitmaps:
+            self._bitmaps[field] = np.load(self.directory / f'{field}.bitmaps.npy', mmap_mode='r')
+        return self._bitmaps[field]
+
+    def category_mask(self, field: str, matches) -> np.ndarray:
+        """
+        Return a boolean row mask for the categories of a field accepted by matches,
+        a function of the category value, by OR-ing their bitmaps.
+        """
+        selected = [code for code, value in enumerate(self.categories[field]) if matches(value)]
+        if not selected:
+            return np.zeros(len(self), dtype=bool)
+        packed = np.bitwise_or.reduce(self.bitmaps(field)[selected], axis=0)
+        return np.unpackbits(packed, count=len(self)).astype(bool)
+
+    @property
+    def token_index(self) -> TokenIndex:
+        """Inverted token index over job_title + job_description, loaded on first use."""
+        if self._token_index is None:
+            self._token_index = TokenIndex.load(str(self.directory / 'tokens'))
+        return self._token_index
+
+    def word_mask(self, keywords: Sequence[str]) -> np.ndarray:
+        """
+        Return a boolean row mask of postings containing any keyword as whole words
+        in the title or description, answered from the token index; phrases are
+        verified against the text of the candidate rows only.
+        """
+        def text_of(row: int) -> str:
+            return f"{self.column('job_title')[row]}\n{self.column('job_description')[row]}"
+
+        return self.token_index.mask(keywords, verify=text_of)
+
+    def keyword_mask(self, keywords: Sequence[str], fields: Sequence[str] = KEYWORD_FIELDS) -> np.ndarray:
+        """
+        Return a boolean row mask of postings containing any keyword in fields,
+        ignoring case like str.lower. Only KEYWORD_FIELDS have the lowercased search copy.
+        """
+        mask = np.zeros(len(self), dtype=bool)
+        if not keywords:
+            return mask
+        for field in fields:
+            if field in self.fields and field in KEYWORD_FIELDS:
+                mask[self.column(field, lowered=True).rows_containing(keywords)] = True
+        return mask
+
+    def filter_mask(
+        self,
+        countries: Optional[Sequence[str]] = None,
+        job_types: Optional[Sequence[str]] = None,
+        keywords: Optional[Sequence[str]] = None,
+        whole_words: bool = False
+    ) -> np.ndarray:
+        """
+        Vectorized equivalent of job_filter.build_job_predicate over the whole store.
+
+        Args:
+            countries: Accepted country substrings (default: the JobFilterTool defaults)
+            job_types: Accepted employment type substrings; empty types always pass
+            keywords: Keywords required in the title or description
+            whole_words: Match keywords as whole words via the token index;
+                by default keywords match as substrings, like JobFilterTool
+
+        Returns:
+            Boolean row mask
+        """
+        from job_filter import DEFAULT_COUNTRIES, DEFAULT_JOB_TYPES, DEFAULT_KEYWORDS
+
+        countries = countries if countries is not None else DEFAULT_COUNTRIES
+        job_types = job_types if job_types is not None else DEFAULT_JOB_TYPES
+        keywords = keywords if keywords is not None else DEFAULT_KEYWORDS
+
+        mask = self.category_mask('job_country', lambda value: any(c in value.lower() for c in countries))
+        mask &= self.category_mask(
+            'job_employment_type', lambda value: not value or any(jt in value.lower() for jt in job_types)
+        )
+        if not mask.any():
+            return mask
+        return mask & (self.word_mask(keywords) if whole_words else self.keyword_mask(keywords))
+
+    def job(self, row: int) -> Dict[str, str]:
+        """Rebuild the posting dictionary of one row."""
+        return {field: self.column(field)[row] for field in self.fields}
+
+    def jobs(self, rows: Optional[Iterable[int]] = None) -> List[Dict[str, str]]:
+        """Rebuild posting dictionaries for the given rows, or for every row."""
+        return list(self.iter_jobs(rows))
+
+    def iter_jobs(self, rows: Optional[Iterable[int]] = None) -> Iterator[Dict[str, str]]:
+        """Yield posting dictionaries row by row without materializing the corpus."""
+        for row in (range(len(self)) if rows is None else rows):
+            yield self.job(int(row))
+
+
+def convert_json(json_path: str, directory: str) -> ColumnarJobStore:
+    """Convert a saved job postings JSON file ({"data": [...]}) to the columnar format."""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        payload = json.load(f)
+    jobs = payload.get("data", []) if isinstance(payload, dict) else payload
+    return ColumnarJobStore.write(jobs, directory)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("Usage: python src/columnar_store.py <job_postings.json> <output_dir>")
+    store = convert_json(sys.argv[1], sys.argv[2])
+    print(f"💾 Wrote {len(store)} jobs as {len(store.fields)} columns to {sys.argv[2]}")
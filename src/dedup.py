@@ -0,0 +1,238 @@
+import re
+import zlib
+from itertools import chain
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MAX_BUCKET_PAIRS = 64
+MAX_VOCABULARY = 1 << 20
+SHINGLE_BASE = np.uint64(1000003)
+
+_token_pattern = re.compile(r'\w+')
+
+
+class _TokenHashes(dict):
+    """Token -> crc32 map that hashes unseen tokens on lookup."""
+
+    def __missing__(self, token: str) -> int:
+        value = self[token] = zlib.crc32(token.encode('utf-8'))
+        return value
+
+
+_token_hashes = _TokenHashes()
+
+
+def shingle_documents(texts: Sequence[str], size: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hash the word shingles of many texts at once.
+
+    Token hashes are combined polynomially over a sliding window across the
+    whole batch; each text is followed by size - 1 zero tokens so windows never
+    mix two texts, and a text shorter than size gives one shingle.
+
+    Args:
+        texts: Input texts
+        size: Words per shingle
+
+    Returns:
+        Tuple of concatenated uint64 shingle hashes and the shingle count of each
+        text (0 for a text without words)
+    """
+    if len(_token_hashes) > MAX_VOCABULARY:
+        _token_hashes.clear()
+    token_lists = [_token_pattern.findall(text.lower()) for text in texts]
+    lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+    counts = np.where(lengths > 0, np.maximum(lengths - size + 1, 1), 0)
+    if not counts.sum():
+        return np.empty(0, dtype=np.uint64), counts
+
+    padding = [''] * (size - 1)
+    padded = np.array(
+        list(map(_token_hashes.__getitem__, chain.from_iterable(tokens + padding for tokens in token_lists))),
+        dtype=np.uint64
+    )
+    windows = np.lib.stride_tricks.sliding_window_view(padded, size)
+    values = (windows * SHINGLE_BASE ** np.arange(size, dtype=np.uint64)).sum(axis=1)
+
+    # Keep the first counts[d] windows of each text
+    text_starts = np.cumsum(np.r_[0, lengths[:-1] + size - 1])
+    keep = np.repeat(text_starts, counts) + (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))
+    return values[keep], counts
+
+
+def shingles(text: str, size: int = 5) -> np.ndarray:
+    """Return the unique shingle hashes of one text."""
+    values, _ = shingle_documents([text], size)
+    return np.unique(values)
+
+
+def minhash_signatures(
+    values: np.ndarray,
+    counts: np.ndarray,
+    num_perm: int = 128,
+    seed: int = 0,
+    chunk_size: int = 65536
+) -> np.ndarray:
+    """
+    Compute MinHash signatures with multiply-shift hashing, (a * x + b) >> 32
+    in wrapping 64-bit arithmetic, which avoids a modulo per hash.
+
+    Args:
+        values: Concatenated shingle hashes, as returned by shingle_documents
+        counts: Number of shingles of each document
+        num_perm: Signature length
+        seed: Random seed for the hash functions
+        chunk_size: Shingles hashed per step, bounding memory to num_perm * chunk_size
+
+    Returns:
+        uint32 matrix of shape (len(counts), num_perm); rows of documents
+        without shingles are left at the maximum value
+    """
+    rng = np.random.default_rng(seed)
+    a = (rng.integers(0, 1 << 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1))[:, None]
+    b = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)[:, None]
+    signatures = np.full((len(counts), num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+
+    documents = np.flatnonzero(counts)
+    ends = np.cumsum(counts)
+    starts = ends - counts
+    first = 0
+    while first < len(documents):
+        # Take whole documents until the chunk is full
+        last = max(first + 1, int(np.searchsorted(ends[documents], starts[documents[first]] + chunk_size, side='right')))
+        members = documents[first:last]
+        chunk = values[starts[members[0]]:ends[members[-1]]]
+        hashed = ((a * chunk[None, :] + b) >> np.uint64(32)).astype(np.uint32)
+        signatures[members] = np.minimum.reduceat(hashed, starts[members] - starts[members[0]], axis=1).T
+        first = last
+    return signatures
+
+
+class UnionFind:
+    """Disjoint sets over 0..n-1 with path halving and union by size."""
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, x: int, y: int) -> None:
+        x, y = self.find(x), self.find(y)
+        if x == y:
+            return
+        if self.size[x] < self.size[y]:
+            x, y = y, x
+        self.parent[y] = x
+        self.size[x] += self.size[y]
+
+
+def lsh_clusters(signatures: np.ndarray, bands: int = 16, threshold: float = 0.8, valid: Optional[np.ndarray] = None) -> List[List[int]]:
+    """
+    Group near-duplicate signatures.
+
+    Each signature is split into bands; documents sharing any band bucket are
+    candidates, and candidates whose estimated Jaccard similarity reaches the
+    threshold are merged with union-find, so clustering stays sub-quadratic.
+
+    Args:
+        signatures: MinHash matrix, one row per document
+        bands: Number of LSH bands (must divide the signature length)
+        threshold: Minimum estimated Jaccard similarity to merge two documents
+        valid: Optional mask of documents to consider; others stay singletons
+
+    Returns:
+        Clusters as lists of document indices in input order, ordered by their
+        first member
+    """
+    n, num_perm = signatures.shape
+    if num_perm % bands:
+        raise ValueError(f"bands ({bands}) must divide the signature length ({num_perm})")
+    rows = num_perm // bands
+    candidates = np.flatnonzero(valid) if valid is not None else np.arange(n)
+    sets = UnionFind(n)
+    checked = set()
+
+    def similar(i: int, j: int) -> bool:
+        return np.count_nonzero(signatures[i] == signatures[j]) >= threshold * num_perm
+
+    multipliers = np.random.default_rng(0).integers(1, 1 << 63, rows, dtype=np.uint64)
+    for band in range(bands):
+        keys = (signatures[candidates, band * rows:(band + 1) * rows].astype(np.uint64) * multipliers).sum(axis=1)
+        order = np.argsort(keys, kind='stable')
+        starts = np.flatnonzero(np.r_[True, np.diff(keys[order]) != 0])
+        sizes = np.diff(np.r_[starts, len(order)])
+        for start, size in zip(starts[sizes > 1].tolist(), sizes[sizes > 1].tolist()):
+            members = candidates[np.sort(order[start:start + size])].tolist()
+            if len(members) * (len(members) - 1) // 2 <= MAX_BUCKET_PAIRS:
+                pairs = ((i, j) for k, i in enumerate(members) for j in members[k + 1:])
+            else:
+                pairs = ((members[0], j) for j in members[1:])
+            for i, j in pairs:
+                if (i, j) in checked or sets.find(i) == sets.find(j):
+                    continue
+                checked.add((i, j))
+                if similar(i, j):
+                    sets.union(i, j)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(n):
+        clusters.setdefault(sets.find(i), []).append(i)
+    return sorted(clusters.values(), key=lambda cluster: cluster[0])
+
+
+def find_duplicate_clusters(
+    jobs: Sequence[Dict[str, Any]],
+    threshold: float = 0.8,
+    num_perm: int = 128,
+    bands: int = 16,
+    shingle_size: int = 5,
+    seed: int = 0
+) -> List[List[int]]:
+    """
+    Cluster near-duplicate job postings by job_title + job_description.
+
+    Args:
+        jobs: Job postings
+        threshold: Minimum estimated Jaccard similarity of shingle sets
+        num_perm: MinHash signature length
+        bands: LSH bands; with 16 bands of 8 rows, pairs above about 0.7
+            similarity are very likely to become candidates
+        shingle_size: Words per shingle
+        seed: Random seed for the hash functions
+
+    Returns:
+        Clusters of indices into jobs; the first index of each cluster is its
+        representative
+    """
+    values, counts = shingle_documents(
+        [f"{job.get('job_title', '')} {job.get('job_description', '')}" for job in jobs], shingle_size
+    )
+    signatures = minhash_signatures(values, counts, num_perm=num_perm, seed=seed)
+    return lsh_clusters(signatures, bands=bands, threshold=threshold, valid=counts > 0)
+
+
+def deduplicate_jobs(jobs: Sequence[Dict[str, Any]], **kwargs: Any) -> Tuple[List[Dict[str, Any]], Dict[int, List[Dict[str, Any]]]]:
+    """
+    Keep one representative per near-duplicate cluster.
+
+    Args:
+        jobs: Job postings
+        kwargs: Passed to find_duplicate_clusters
+
+    Returns:
+        Tuple of representative postings and a map from each representative's
+        position in that list to the postings it stands in for
+    """
+    representatives = []
+    duplicates = {}
+    for cluster in find_duplicate_clusters(jobs, **kwargs):
+        if len(cluster) > 1:
+            duplicates[len(representatives)] = [jobs[i] for i in cluster[1:]]
+        representatives.append(jobs[cluster[0]])
+    return representatives, duplicates
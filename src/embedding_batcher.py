@@ -0,0 +1,134 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+class _Request:
+    """Texts submitted by one caller and the slot its vectors are returned in."""
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.vectors: Optional[np.ndarray] = None
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+
+class MicroBatchingEmbedder:
+    """
+    Coalesces concurrent embed_documents calls into shared model batches.
+
+    A worker thread takes the first queued request, waits up to window_ms for
+    more to arrive (or until max_batch texts are queued), embeds the unique
+    texts of all of them in one model call and hands each caller its rows.
+    Under concurrent load the model sees a few large batches instead of many
+    small ones; a lone caller pays at most the window in extra latency.
+    Requests larger than max_batch are embedded on their own, never split.
+    """
+
+    def __init__(self, model: Any, window_ms: float = 5.0, max_batch: int = 256):
+        """
+        Args:
+            model: Embedder providing embed_documents(list of str) -> vectors
+            window_ms: How long the first request of a batch waits for others
+            max_batch: Texts after which a batch is embedded without waiting
+        """
+        self.model = model
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.batches = 0
+        self.requests = 0
+        self.texts = 0
+        self._queue: List[_Request] = []
+        self._queued_texts = 0
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+
+    def embed_documents(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts, possibly in a batch shared with concurrent callers."""
+        request = _Request([str(text) for text in texts])
+        if not request.texts:
+            return np.empty((0, 0), dtype=np.float32)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("MicroBatchingEmbedder is closed")
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._worker.start()
+            self._queue.append(request)
+            self._queued_texts += len(request.texts)
+            self._condition.notify()
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.vectors
+
+    def embed_query(self, text: str) -> np.ndarray:
+        """Embed a single text."""
+        return self.embed_documents([text])[0]
+
+    def _take_batch(self) -> List[_Request]:
+        """Wait for a batch of requests; an empty list means the embedder was closed."""
+        with self._condition:
+            while not self._queue and not self._closed:
+                self._condition.wait()
+            deadline = time.monotonic() + self.window
+            while not self._closed and self._queued_texts < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            batch: List[_Request] = []
+            size = 0
+            while self._queue and (not batch or size + len(self._queue[0].texts) <= self.max_batch):
+                request = self._queue.pop(0)
+                batch.append(request)
+                size += len(request.texts)
+            self._queued_texts -= size
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+            # Requests often share texts (the same skills, popular postings); embed each once
+            rows: Dict[str, int] = {}
+            for request in batch:
+                for text in request.texts:
+                    rows.setdefault(text, len(rows))
+            try:
+                vectors = np.asarray(self.model.embed_documents(list(rows)), dtype=np.float32)
+            except BaseException as exc:
+                for request in batch:
+                    request.error = exc
+                    request.done.set()
+                continue
+
+            self.batches += 1
+            self.requests += len(batch)
+            self.texts += len(rows)
+            for request in batch:
+                request.vectors = vectors[[rows[text] for text in request.texts]]
+                request.done.set()
+
+    def stats(self) -> Dict[str, float]:
+        """Return batch counters: batches run, requests served and unique texts embedded."""
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "texts": self.texts,
+            "requests_per_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            "texts_per_batch": round(self.texts / self.batches, 1) if self.batches else 0.0
+        }
+
+    def close(self) -> None:
+        """Stop the worker once queued requests are served."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._worker is not None:
+            self._worker.join()
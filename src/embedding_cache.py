@@ -0,0 +1,305 @@
+import atexit
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# Hits only refresh LRU timestamps in memory; they are written at most this often
+TOUCH_FLUSH_SECONDS = 30.0
+# Keys per "IN (...)" lookup, below SQLite's host parameter limit
+LOOKUP_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    dim INTEGER,
+    count INTEGER NOT NULL,
+    generation INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rows (
+    key TEXT PRIMARY KEY,
+    row INTEGER NOT NULL,
+    used REAL NOT NULL
+) WITHOUT ROWID;
+INSERT OR IGNORE INTO meta (id, dim, count, generation) VALUES (0, NULL, 0, 0);
+"""
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially different copies of a text share a cache entry."""
+    return ' '.join(str(text).split())
+
+
+def text_key(model_name: str, text: str) -> str:
+    """Return the content address of a text for a given embedding model."""
+    payload = f"{model_name}\n{normalize_text(text)}".encode('utf-8')
+    return hashlib.sha1(payload).hexdigest()
+
+
+def _flush_at_exit(ref: "weakref.ref[EmbeddingCache]") -> None:
+    cache = ref()
+    if cache is not None:
+        cache.close()
+
+
+class EmbeddingCache:
+    """
+    Persistent, content-addressed embedding cache.
+
+    Vectors are appended to a float32 file that is read back through a memory
+    map, and an SQLite index maps text hashes to rows. The index's meta row
+    records how many rows are committed, so rows a crashed or concurrent writer
+    appended past it are never read and are overwritten by the next append.
+    Writes run in an IMMEDIATE transaction, which also serializes processes
+    sharing the directory. When the vector file grows beyond max_bytes, the
+    least recently used rows are copied into a new file generation.
+    """
+
+    def __init__(self, cache_dir: str, model_name: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.model_name = model_name
+        self.max_bytes = max_bytes
+        self.directory = Path(cache_dir) / re.sub(r'[^A-Za-z0-9_.-]+', '_', model_name)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.directory / 'index.sqlite3'
+        self.dim: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self._vectors: Optional[np.ndarray] = None
+        self._mapped: Tuple[int, int] = (-1, 0)
+        self._touched: Dict[str, float] = {}
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+        # Autocommit mode: transactions are opened explicitly with BEGIN
+        self._conn = sqlite3.connect(str(self.index_path), timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        atexit.register(_flush_at_exit, weakref.ref(self))
+
+    def _vectors_path(self, generation: int) -> Path:
+        return self.directory / f'vectors.{generation}.f32'
+
+    def _meta(self) -> Tuple[Optional[int], int, int]:
+        dim, count, generation = self._conn.execute("SELECT dim, count, generation FROM meta").fetchone()
+        self.dim = dim
+        return dim, count, generation
+
+    def _matrix(self, dim: int, count: int, generation: int) -> np.ndarray:
+        """Return the memory-mapped committed rows, remapping when another write committed."""
+        if self._mapped != (generation, count) or self._vectors is None:
+            self._vectors = np.memmap(self._vectors_path(generation), dtype=np.float32, mode='r', shape=(count, dim))
+            self._mapped = (generation, count)
+        return self._vectors
+
+    def _read(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Copy the cached vectors of keys out of one consistent snapshot of the index."""
+        for attempt in range(2):
+            self._conn.execute("BEGIN")
+            try:
+                dim, count, generation = self._meta()
+                rows: Dict[str, int] = {}
+                for i in range(0, len(keys), LOOKUP_CHUNK):
+                    chunk = keys[i:i + LOOKUP_CHUNK]
+                    rows.update(self._conn.execute(
+                        f"SELECT key, row FROM rows WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                    ))
+                if not rows:
+                    return {}
+                positions = np.fromiter(rows.values(), dtype=np.int64, count=len(rows))
+                return dict(zip(rows, np.array(self._matrix(dim, count, generation)[positions])))
+            except FileNotFoundError:
+                # Another process compacted and removed this generation after our snapshot
+                if attempt:
+                    raise
+            finally:
+                self._conn.execute("COMMIT")
+        return {}
+
+    def _write_touched(self) -> None:
+        """Write pending LRU timestamps; the caller holds a write transaction."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE rows SET used = MAX(used, ?) WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()]
+            )
+            self._touched.clear()
+        self._flushed_at = time.monotonic()
+
+    def _store(self, vectors: Dict[str, np.ndarray]) -> None:
+        """Append vectors for keys not stored yet, evicting if the file outgrows max_bytes."""
+        stale_generations: List[int] = []
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            dim, count, generation = self._meta()
+            # Another caller or process may have stored some of these texts meanwhile
+            present = set()
+            keys = list(vectors)
+            for i in range(0, len(keys), LOOKUP_CHUNK):
+                chunk = keys[i:i + LOOKUP_CHUNK]
+                present.update(key for (key,) in self._conn.execute(
+                    f"SELECT key FROM rows WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ))
+            new_keys = [key for key in keys if key not in present]
+            if new_keys:
+                block = np.ascontiguousarray(np.stack([vectors[key] for key in new_keys]), dtype=np.float32)
+                dim = dim or block.shape[1]
+                with open(self._vectors_path(generation), 'ab') as f:
+                    # Drop rows past the committed count, left by a writer that never committed
+                    f.truncate(count * dim * 4)
+                    f.write(block.tobytes())
+                now = time.time()
+                self._conn.executemany(
+                    "INSERT INTO rows (key, row, used) VALUES (?, ?, ?)",
+                    [(key, count + offset, now) for offset, key in enumerate(new_keys)]
+                )
+                count += len(new_keys)
+                self._conn.execute("UPDATE meta SET dim = ?, count = ?", (dim, count))
+                self._write_touched()
+                if count * dim * 4 > self.max_bytes:
+                    stale_generations = list(range(generation + 1))
+                    self._evict(dim, count, generation)
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._meta()
+        for stale in stale_generations:
+            try:
+                self._vectors_path(stale).unlink()
+            except OSError:
+                # Missing, or still mapped on platforms that forbid deleting mapped files
+                pass
+
+    def _evict(self, dim: int, count: int, generation: int) -> None:
+        """Copy the most recently used rows that fit in max_bytes into the next file generation."""
+        keep = max(int(self.max_bytes * 0.9) // (dim * 4), 0)
+        survivors = self._conn.execute(
+            "SELECT key, row, used FROM rows ORDER BY used DESC LIMIT ?", (keep,)
+        ).fetchall()
+        survivors.sort(key=lambda survivor: survivor[1])
+        old = np.memmap(self._vectors_path(generation), dtype=np.float32, mode='r', shape=(count, dim))
+        kept = np.array(old[[row for _, row, _ in survivors]]) if survivors else np.empty((0, dim), np.float32)
+        del old
+        kept.astype(np.float32).tofile(self._vectors_path(generation + 1))
+        self._conn.execute("DELETE FROM rows")
+        self._conn.executemany(
+            "INSERT INTO rows (key, row, used) VALUES (?, ?, ?)",
+            [(key, row, used) for row, (key, _, used) in enumerate(survivors)]
+        )
+        self._conn.execute("UPDATE meta SET count = ?, generation = ?", (len(survivors), generation + 1))
+        self._vectors = None
+
+    def get_or_compute(
+        self,
+        texts: Sequence[str],
+        compute: Callable[[List[str]], Sequence[Sequence[float]]]
+    ) -> np.ndarray:
+        """
+        Return embeddings for texts, calling compute only for texts not yet cached.
+
+        The lock is released while compute runs, so concurrent callers can look
+        up and embed in parallel (or share a micro-batch). Texts embedded by two
+        callers at once are stored only once. A fully cached call does not write
+        to disk.
+
+        Args:
+            texts: Texts to embed
+            compute: Function that embeds a list of texts
+
+        Returns:
+            float32 array with one row per input text
+        """
+        texts = [str(text) for text in texts]
+        if not texts:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+
+        keys = [text_key(self.model_name, text) for text in texts]
+        with self._lock:
+            vectors = self._read(list(dict.fromkeys(keys)))
+            now = time.time()
+            for key in vectors:
+                self._touched[key] = now
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors and key not in missing:
+                missing[key] = text
+
+        with self._lock:
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+        if missing:
+            computed = np.asarray(compute(list(missing.values())), dtype=np.float32)
+            fresh = dict(zip(missing, computed))
+            vectors.update(fresh)
+            with self._lock:
+                self._store(fresh)
+        elif time.monotonic() - self._flushed_at > TOUCH_FLUSH_SECONDS:
+            self.flush()
+
+        return np.stack([vectors[key] for key in keys]).astype(np.float32, copy=False)
+
+    def flush(self) -> None:
+        """Write LRU timestamps of cache hits that are still only held in memory."""
+        with self._lock:
+            if not self._touched:
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._write_touched()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def close(self) -> None:
+        """Flush pending timestamps and close the index."""
+        try:
+            self.flush()
+        except sqlite3.ProgrammingError:
+            # Already closed
+            return
+        with self._lock:
+            self._vectors = None
+            self._conn.close()
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and the current on-disk size."""
+        total = self.hits + self.misses
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+            dim, count, _ = self._meta()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": entries,
+            "bytes": count * (dim or 0) * 4
+        }
+
+    def clear(self) -> None:
+        """Remove every cached vector for this model."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                _, _, generation = self._meta()
+                self._conn.execute("DELETE FROM rows")
+                self._conn.execute("UPDATE meta SET dim = NULL, count = 0, generation = ?", (generation + 1,))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._touched.clear()
+            self._vectors = None
+            self._meta()
+            for stale in range(generation + 1):
+                try:
+                    self._vectors_path(stale).unlink()
+                except OSError:
+                    pass
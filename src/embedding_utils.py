@@ -1,16 +1,165 @@
 import os
-from langchain_huggingface import HuggingFaceEmbeddings
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 from dotenv import load_dotenv
+from embedding_cache import EmbeddingCache, DEFAULT_MAX_BYTES
+from instrumentation import count, observe, span
+from similarity import normalize_rows, blockwise_top_k
 
 load_dotenv()
 
-# Use Hugging Face embeddings as fallback
-model = HuggingFaceEmbeddings(
-    model_name="sentence-transformers/all-MiniLM-L6-v2",
-    model_kwargs={'device': 'cpu'}
-)
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+# The model is built on first use so importing this module stays cheap
+_model = None
+_model_name = MODEL_NAME
+_cache = None
+
+
+def get_model():
+    '''
+    Return the process-wide Hugging Face embedding model, building it on first use.
+    '''
+    global _model
+    if _model is None:
+        from langchain_huggingface import HuggingFaceEmbeddings
+
+        # Use Hugging Face embeddings as fallback
+        _model = HuggingFaceEmbeddings(
+            model_name=MODEL_NAME,
+            model_kwargs={'device': 'cpu'}
+        )
+    return _model
+
+
+def get_model_name():
+    '''
+    Return the name of the active embedding model, used to namespace cached vectors.
+    '''
+    return _model_name
+
+
+def set_model(embedding_model, model_name):
+    '''
+    Replace the embedding model, e.g. with a stub for offline benchmarks.
+    The model must provide embed_documents(list of str) -> list of vectors.
+    '''
+    global _model, _model_name, _cache
+    _model = embedding_model
+    _model_name = model_name
+    _cache = None
+
+
+def enable_micro_batching(window_ms=None, max_batch=None):
+    '''
+    Route embeddings through a MicroBatchingEmbedder so concurrent callers
+    (e.g. server requests) share model batches. The model name is kept, so
+    cached vectors stay valid. EMBED_BATCH_WINDOW_MS (default 5) and
+    EMBED_MAX_BATCH (default 256) configure it. Returns the batcher.
+    '''
+    from embedding_batcher import MicroBatchingEmbedder
+
+    model = get_model()
+    if isinstance(model, MicroBatchingEmbedder):
+        return model
+    batcher = MicroBatchingEmbedder(
+        model,
+        window_ms=float(window_ms if window_ms is not None else os.getenv("EMBED_BATCH_WINDOW_MS", "5")),
+        max_batch=int(max_batch if max_batch is not None else os.getenv("EMBED_MAX_BATCH", "256"))
+    )
+    set_model(batcher, _model_name)
+    return batcher
+
+
+def warm_up():
+    '''
+    Load the embedding model and run one dummy embedding so the first real call is fast.
+    '''
+    get_model().embed_documents(["warm up"])
+
+
+def get_embedding_cache():
+    '''
+    Return the process-wide on-disk embedding cache.
+    Set EMBEDDING_CACHE_DIR to an empty string to disable caching.
+    '''
+    global _cache
+    cache_dir = os.getenv("EMBEDDING_CACHE_DIR", "data/embedding_cache")
+    if not cache_dir:
+        return None
+    if _cache is None:
+        max_mb = os.getenv("EMBEDDING_CACHE_MAX_MB")
+        max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES
+        _cache = EmbeddingCache(cache_dir, _model_name, max_bytes=max_bytes)
+    return _cache
+
+
+def embed_documents(texts):
+    '''
+    Embed a list of strings, reusing cached vectors for texts seen before.
+    Returns a float32 numpy array with one row per text.
+    '''
+    texts = list(texts)
+    computed = []
+
+    def compute(missing):
+        computed.append(len(missing))
+        count("embedding.computed", len(missing))
+        observe("embedding.batch_size", len(missing))
+        return get_model().embed_documents(list(missing))
+
+    with span("embedding.embed_documents", texts=len(texts)):
+        count("embedding.texts", len(texts))
+        cache = get_embedding_cache()
+        if cache is None:
+            return np.asarray(compute(texts), dtype=np.float32)
+        vectors = cache.get_or_compute(texts, compute)
+        count("embedding.cache_lookups", len(texts))
+        count("embedding.cache_hits", len(texts) - sum(computed))
+        return vectors
+
+
+class SkillExpander:
+    '''
+    Expand skill lists with their nearest terms from a fixed vocabulary.
+    The term matrix is embedded and L2-normalized once, then every skill
+    is scored against it with blocked matrix multiplies.
+    '''
+
+    def __init__(self, terms, term_embeddings=None):
+        keep = [i for i, term in enumerate(terms) if term]
+        self.terms = [str(terms[i]) for i in keep]
+        if term_embeddings is None:
+            term_embeddings = embed_documents(self.terms) if self.terms else np.empty((0, 0))
+        else:
+            term_embeddings = np.asarray(term_embeddings)[keep]
+        self.term_matrix = normalize_rows(term_embeddings)
+
+    def expand_many(self, skill_lists, top_k=2):
+        '''
+        Expand several skill lists at once, embedding all of their skills in one batch.
+        Returns one expanded list per input list, original skills first.
+        '''
+        cleaned = [[str(skill) for skill in skills if skill] for skills in skill_lists]
+        flat = [skill for skills in cleaned for skill in skills]
+        if not flat or not self.terms:
+            return cleaned
+
+        top_indices, _ = blockwise_top_k(normalize_rows(embed_documents(flat)), self.term_matrix, top_k)
+
+        expanded_lists = []
+        offset = 0
+        for skills in cleaned:
+            rows = top_indices[offset:offset + len(skills)]
+            offset += len(skills)
+            expanded = skills + [self.terms[idx] for idx in rows.ravel()]
+            expanded_lists.append(list(dict.fromkeys(expanded)))
+        return expanded_lists
+
+    def expand(self, skills, top_k=2):
+        '''
+        Expand a single skill list.
+        '''
+        return self.expand_many([skills], top_k=top_k)[0]
 
 
 def expand_skills_with_embeddings(skills, possible_terms, top_k=2):
@@ -22,23 +171,7 @@ def expand_skills_with_embeddings(skills, possible_terms, top_k=2):
     if not skills or not possible_terms:
         return skills if skills else []
     
-    # Convert to strings if needed
-    skills = [str(skill) for skill in skills if skill]
-    possible_terms = [str(term) for term in possible_terms if term]
-    
-    if not skills or not possible_terms:
-        return skills
-    
-    skill_embeddings = model.embed_documents(skills)
-    all_term_embeddings = model.embed_documents(possible_terms)
-
-    expanded = set(skills)
-    for skill_emb in skill_embeddings:
-        similarities = cosine_similarity([skill_emb], all_term_embeddings)[0]
-        top_indices = np.argsort(similarities)[-top_k:]
-        for idx in top_indices:
-            expanded.add(possible_terms[idx])
-    return list(expanded)
+    return SkillExpander(possible_terms).expand(skills, top_k=top_k)
 
 
 def embed_text_list(text_list):
@@ -55,7 +188,7 @@ def embed_text_list(text_list):
     if not text_list:
         return []
     
-    return np.array(model.embed_documents(text_list))
+    return embed_documents(text_list)
 
 
 
@@ -0,0 +1,124 @@
+"""
+Batch resume ingestion.
+
+Parses every PDF under a directory across a process pool and streams one JSON
+line per file to the output as results arrive. Parsed profiles are cached by
+PDF content hash and parser version, so a re-run only parses new or changed
+files.
+
+Usage:
+    python src/ingest_profiles.py data/resumes --output data/profiles.jsonl
+    python src/ingest_profiles.py data/resumes --workers 8 --pattern "*.pdf"
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+sys.path.append(str(Path(__file__).parent))
+from profile_cache import ProfileCache, file_sha256, get_profile_cache
+
+
+def _parse_worker(path: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Parse one PDF in a worker process, returning (profile, error)."""
+    from parse_profile import parse_pdf
+
+    try:
+        return parse_pdf(path), None
+    except Exception as exc:
+        return None, f"{type(exc).__name__}: {exc}"
+
+
+def _write_record(out: TextIO, record: Dict[str, Any]) -> None:
+    out.write(json.dumps(record, ensure_ascii=False) + '\n')
+    out.flush()
+
+
+def ingest_directory(
+    directory: str,
+    output_path: str = "data/profiles.jsonl",
+    workers: Optional[int] = None,
+    cache: Optional[ProfileCache] = None,
+    pattern: str = "*.pdf"
+) -> Dict[str, Any]:
+    """
+    Parse every matching PDF under a directory and write profiles to JSONL.
+
+    Cached profiles are written straight away; the rest are parsed across
+    `workers` processes (default: CPU count) and written as each finishes, so
+    output order follows completion, not file order. Files with identical
+    content are parsed once.
+
+    Args:
+        directory: Directory searched recursively
+        output_path: JSONL file with one {"path", "sha256", "cached", "profile"}
+            or {"path", "sha256", "error"} record per file
+        workers: Worker processes
+        cache: Parsed-profile cache (default: none)
+        pattern: Glob pattern for resume files
+
+    Returns:
+        Counts of files, cached, parsed and failed, and elapsed seconds
+    """
+    start = time.perf_counter()
+    paths = sorted(path for path in Path(directory).rglob(pattern) if path.is_file())
+    stats = {"files": len(paths), "cached": 0, "parsed": 0, "failed": 0}
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+    with open(output_path, 'w', encoding='utf-8') as out:
+        pending: Dict[str, List[str]] = {}
+        for path in paths:
+            digest = file_sha256(str(path))
+            profile = cache.get(digest) if cache is not None else None
+            if profile is not None:
+                stats["cached"] += 1
+                _write_record(out, {"path": str(path), "sha256": digest, "cached": True, "profile": profile})
+            else:
+                pending.setdefault(digest, []).append(str(path))
+
+        if pending:
+            with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+                futures = {pool.submit(_parse_worker, same[0]): digest for digest, same in pending.items()}
+                for future in as_completed(futures):
+                    digest = futures[future]
+                    profile, error = future.result()
+                    if profile is not None and cache is not None:
+                        cache.put(digest, profile)
+                    for path in pending[digest]:
+                        if error:
+                            stats["failed"] += 1
+                            _write_record(out, {"path": path, "sha256": digest, "error": error})
+                        else:
+                            stats["parsed"] += 1
+                            _write_record(out, {"path": path, "sha256": digest, "cached": False, "profile": profile})
+
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Parse a directory of resume PDFs into JSONL profiles")
+    parser.add_argument('directory', type=str, help='Directory of PDF resumes (searched recursively)')
+    parser.add_argument('--output', type=str, default='data/profiles.jsonl',
+                        help='JSONL output path (default: data/profiles.jsonl)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: CPU count)')
+    parser.add_argument('--pattern', type=str, default='*.pdf',
+                        help='File glob pattern (default: *.pdf)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Parse every file, ignoring the profile cache')
+    args = parser.parse_args()
+
+    cache = None if args.no_cache else get_profile_cache()
+    stats = ingest_directory(args.directory, args.output, workers=args.workers, cache=cache, pattern=args.pattern)
+    print(f"📄 {stats['files']} files: {stats['parsed']} parsed, {stats['cached']} cached, "
+          f"{stats['failed']} failed in {stats['seconds']}s")
+    print(f"💾 Saved profiles to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
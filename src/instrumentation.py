@@ -0,0 +1,294 @@
+"""
+Lightweight tracing for the matching workflow.
+
+Code marks units of work with `span()` and bumps metrics with `count()` and
+`observe()`. Nothing is recorded unless a `recording()` is active in the
+current context, so instrumented code costs a context-variable lookup when
+tracing is off. The recorder travels through contextvars, so spans opened in
+worker threads nest under their caller as long as the thread runs in a copied
+context (`WorkflowScheduler` and `BoundedExecutor` do this).
+
+Spans follow the OpenTelemetry data model (trace and span ids, parent, start
+and end in Unix nanoseconds, attributes) and can be written as JSON lines.
+"""
+import cProfile
+import contextvars
+import functools
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:
+    # Windows has no resource module; peak_rss_mb falls back to psutil
+    resource = None
+
+# From 3.12 cProfile runs on sys.monitoring: one profiler per interpreter, and it sees every thread
+PER_THREAD_PROFILERS = sys.version_info < (3, 12)
+
+_recorder: contextvars.ContextVar[Optional["Recorder"]] = contextvars.ContextVar("instrumentation_recorder", default=None)
+_parent_span: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("instrumentation_parent_span", default=None)
+_profilers: contextvars.ContextVar[Optional[List[cProfile.Profile]]] = contextvars.ContextVar("instrumentation_profilers", default=None)
+
+# Counter pairs reported as cache hit rates: (hits counter, total or misses counter, counts a total)
+CACHE_COUNTERS = {
+    "embedding_cache": ("embedding.cache_hits", "embedding.cache_lookups", True),
+    "lemmatizer_cache": ("lemmatizer.cache_hits", "lemmatizer.texts", True),
+    "profile_cache": ("profile_cache.hits", "profile_cache.misses", False),
+    "response_cache": ("response_cache.hits", "response_cache.misses", False)
+}
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MiB, or None where it cannot be read."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / 2**20 if sys.platform == "darwin" else peak / 2**10, 1)
+    try:
+        import psutil
+    except ImportError:
+        return None
+    memory = psutil.Process().memory_info()
+    # peak_wset is the Windows peak working set; other platforms only report the current RSS
+    return round(getattr(memory, "peak_wset", memory.rss) / 2**20, 1)
+
+
+class Recorder:
+    """Collects spans, counters and observed values for one traced run."""
+
+    def __init__(self):
+        self.trace_id = uuid.uuid4().hex
+        self.spans: List[Dict[str, Any]] = []
+        self.counters: Dict[str, float] = {}
+        self.observations: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    def add_span(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self.spans.append(record)
+
+    def count(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            stats = self.observations.get(name)
+            if stats is None:
+                self.observations[name] = {"count": 1, "total": value, "min": value, "max": value}
+            else:
+                stats["count"] += 1
+                stats["total"] += value
+                stats["min"] = min(stats["min"], value)
+                stats["max"] = max(stats["max"], value)
+
+    def stages(self, prefix: str) -> Dict[str, Dict[str, Any]]:
+        """Return wall and CPU seconds of the spans named prefix + stage, keyed by stage."""
+        with self._lock:
+            return {
+                record["name"][len(prefix):]: {
+                    "wall_s": record["attributes"]["wall_s"],
+                    "cpu_s": record["attributes"]["cpu_s"],
+                    "status": record["status"]
+                }
+                for record in self.spans if record["name"].startswith(prefix)
+            }
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Aggregate the run: total wall and process CPU time, per-name span
+        totals, counters, batch statistics, cache hit rates and peak memory.
+        """
+        with self._lock:
+            spans: Dict[str, Dict[str, float]] = {}
+            for record in self.spans:
+                totals = spans.setdefault(record["name"], {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0})
+                totals["calls"] += 1
+                totals["wall_s"] = round(totals["wall_s"] + record["attributes"]["wall_s"], 6)
+                totals["cpu_s"] = round(totals["cpu_s"] + record["attributes"]["cpu_s"], 6)
+            counters = dict(self.counters)
+            observations = {
+                name: dict(stats, mean=round(stats["total"] / stats["count"], 3))
+                for name, stats in self.observations.items()
+            }
+
+        caches = {}
+        for cache, (hits_name, other_name, other_is_total) in CACHE_COUNTERS.items():
+            hits = counters.get(hits_name, 0)
+            total = counters.get(other_name, 0) if other_is_total else hits + counters.get(other_name, 0)
+            if total:
+                caches[cache] = {"hits": hits, "lookups": total, "hit_rate": round(hits / total, 3)}
+
+        return {
+            "trace_id": self.trace_id,
+            "wall_s": round(time.perf_counter() - self._start, 6),
+            "cpu_s": round(time.process_time() - self._cpu_start, 6),
+            "spans": spans,
+            "counters": counters,
+            "batches": observations,
+            "caches": caches,
+            "peak_rss_mb": peak_rss_mb()
+        }
+
+    def write_jsonl(self, path: str) -> None:
+        """Append every span and then the summary to a JSON lines file."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            for record in list(self.spans):
+                f.write(json.dumps(dict(record, kind="span"), ensure_ascii=False) + '\n')
+            f.write(json.dumps(dict(self.summary(), kind="summary"), ensure_ascii=False) + '\n')
+
+
+def current_recorder() -> Optional[Recorder]:
+    """Return the recorder active in this context, if any."""
+    return _recorder.get()
+
+
+@contextmanager
+def recording(path: Optional[str] = None) -> Iterator[Recorder]:
+    """
+    Record spans and metrics for the enclosed code.
+
+    Nested recordings reuse the outer recorder, so a traced caller sees the
+    spans of traced callees.
+
+    Args:
+        path: JSON lines file to append spans and the summary to on exit
+            (default: INSTRUMENTATION_LOG, empty to disable)
+    """
+    outer = _recorder.get()
+    if outer is not None:
+        yield outer
+        return
+    recorder = Recorder()
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+        path = path if path is not None else os.getenv("INSTRUMENTATION_LOG", "")
+        if path:
+            recorder.write_jsonl(path)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Time the enclosed code as a span with wall time, the calling thread's CPU
+    time and the process's peak RSS at the end.
+
+    Yields a dictionary of attributes that the enclosed code may extend
+    (e.g. with result sizes). Does nothing when no recording is active.
+    """
+    recorder = _recorder.get()
+    if recorder is None:
+        yield attributes
+        return
+    span_id = uuid.uuid4().hex[:16]
+    token = _parent_span.set(span_id)
+    start_ns = time.time_ns()
+    start = time.perf_counter()
+    cpu_start = time.thread_time()
+    status = "ok"
+    try:
+        yield attributes
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        _parent_span.reset(token)
+        attributes.update(
+            wall_s=round(time.perf_counter() - start, 6),
+            cpu_s=round(time.thread_time() - cpu_start, 6),
+            peak_rss_mb=peak_rss_mb()
+        )
+        recorder.add_span({
+            "name": name,
+            "trace_id": recorder.trace_id,
+            "span_id": span_id,
+            "parent_id": _parent_span.get(),
+            "thread": threading.current_thread().name,
+            "start_time_unix_nano": start_ns,
+            "end_time_unix_nano": time.time_ns(),
+            "status": status,
+            "attributes": attributes
+        })
+
+
+def traced(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorate a function so each call is recorded as a span named name."""
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name: str, value: float = 1) -> None:
+    """Add value to a counter of the active recording."""
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.count(name, value)
+
+
+def observe(name: str, value: float) -> None:
+    """Record one value (e.g. a batch size) of a distribution of the active recording."""
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.observe(name, value)
+
+
+@contextmanager
+def profiling(path: str) -> Iterator[None]:
+    """
+    Profile the enclosed code with cProfile and dump merged stats to path.
+
+    Before Python 3.12, cProfile only sees the thread it is enabled in, so
+    worker threads that call profile_thread() in a copied context are profiled
+    separately and merged in. From 3.12 the profiler sees every thread itself.
+    """
+    profilers: List[cProfile.Profile] = []
+    token = _profilers.set(profilers)
+    main = cProfile.Profile()
+    main.enable()
+    try:
+        yield
+    finally:
+        main.disable()
+        _profilers.reset(token)
+        stats = pstats.Stats(main)
+        for profiler in profilers:
+            stats.add(profiler)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        stats.dump_stats(path)
+
+
+@contextmanager
+def profile_thread() -> Iterator[None]:
+    """
+    Profile the enclosed code in a worker thread when profiling() is active.
+    A no-op from Python 3.12, where profiling() already covers all threads.
+    """
+    profilers = _profilers.get()
+    if profilers is None or not PER_THREAD_PROFILERS:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profilers.append(profiler)
@@ -0,0 +1,237 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    lemma TEXT,
+    embedding BLOB,
+    model TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_last_seen ON jobs (last_seen);
+"""
+
+_corpus = None
+
+
+def content_hash(job: Dict[str, Any]) -> str:
+    """Hash the fields that feed lemmatization and embedding."""
+    text = ' '.join(f"{job.get('job_title', '')}\n{job.get('job_description', '')}".split())
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class JobCorpus:
+    """
+    Persistent job corpus keyed by job_id.
+
+    Postings are upserted on every search; a changed content hash invalidates the
+    stored lemma and embedding so only new or changed rows are recomputed.
+    first_seen/last_seen timestamps drive expiry of stale postings.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "JobCorpus":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def upsert(self, jobs: Sequence[Dict[str, Any]], now: Optional[float] = None, touch: bool = True) -> Dict[str, int]:
+        """
+        Insert new postings and refresh existing ones.
+
+        Args:
+            jobs: Job postings with a job_id
+            now: Timestamp to record (default: current time)
+            touch: Refresh last_seen of existing postings. Only search ingestion
+                should; with False, unchanged postings are left as they are and
+                changed ones keep their last_seen, so expire() still sees them age
+
+        Returns:
+            Counts of new, changed and unchanged postings
+        """
+        now = now if now is not None else time.time()
+        counts = {"new": 0, "changed": 0, "unchanged": 0}
+        with self._lock, self._conn:
+            for job in jobs:
+                job_id = str(job.get("job_id") or "")
+                if not job_id:
+                    continue
+                digest = content_hash(job)
+                payload = json.dumps(job, ensure_ascii=False)
+                row = self._conn.execute("SELECT content_hash FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+                if row is None:
+                    counts["new"] += 1
+                    self._conn.execute(
+                        "INSERT INTO jobs (job_id, content_hash, payload, first_seen, last_seen) VALUES (?, ?, ?, ?, ?)",
+                        (job_id, digest, payload, now, now)
+                    )
+                elif row[0] != digest:
+                    counts["changed"] += 1
+                    self._conn.execute(
+                        "UPDATE jobs SET content_hash = ?, payload = ?, last_seen = MAX(last_seen, ?), "
+                        "lemma = NULL, embedding = NULL, model = NULL WHERE job_id = ?",
+                        (digest, payload, now if touch else 0, job_id)
+                    )
+                else:
+                    counts["unchanged"] += 1
+                    if not touch:
+                        continue
+                    self._conn.execute(
+                        "UPDATE jobs SET payload = ?, last_seen = ? WHERE job_id = ?",
+                        (payload, now, job_id)
+                    )
+        return counts
+
+    def expire(self, max_age_days: float, now: Optional[float] = None) -> int:
+        """Delete postings not seen for max_age_days and return how many were removed."""
+        cutoff = (now if now is not None else time.time()) - max_age_days * 86400
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM jobs WHERE last_seen < ?", (cutoff,)).rowcount
+
+    def get_jobs(self, job_ids: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """Return stored postings, all of them or the given job_ids in order."""
+        with self._lock:
+            if job_ids is None:
+                rows = self._conn.execute("SELECT payload FROM jobs ORDER BY first_seen").fetchall()
+                return [json.loads(payload) for (payload,) in rows]
+            found = {}
+            for job_id in job_ids:
+                row = self._conn.execute("SELECT payload FROM jobs WHERE job_id = ?", (str(job_id),)).fetchone()
+                if row:
+                    found[str(job_id)] = json.loads(row[0])
+        return [found[str(job_id)] for job_id in job_ids if str(job_id) in found]
+
+    def seen(self, job_id: str) -> Optional[Tuple[float, float]]:
+        """Return (first_seen, last_seen) for a posting, or None if unknown."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT first_seen, last_seen FROM jobs WHERE job_id = ?", (str(job_id),)
+            ).fetchone()
+
+    def _lemmas_for(self, jobs: Sequence[Dict[str, Any]], stored: Dict[str, str]) -> Dict[str, str]:
+        """Lemmatize and store postings whose job_id has no entry in stored; return stored."""
+        from match_jobs import compose_job_text
+        from text_preprocessing import lemmatize_texts
+
+        missing = {str(job["job_id"]): job for job in jobs if str(job["job_id"]) not in stored}
+        if missing:
+            lemmas = lemmatize_texts([compose_job_text(job) for job in missing.values()])
+            with self._lock, self._conn:
+                for job_id, lemma in zip(missing, lemmas):
+                    stored[job_id] = lemma
+                    self._conn.execute("UPDATE jobs SET lemma = ? WHERE job_id = ?", (lemma, job_id))
+        return stored
+
+    def lemmas(self, jobs: Sequence[Dict[str, Any]]) -> List[str]:
+        """
+        Return lemmatized text for postings, lemmatizing only those not stored yet.
+
+        Lexical retrieval needs no embeddings, so none are computed. Like
+        representations(), this does not refresh last_seen.
+
+        Args:
+            jobs: Job postings with a job_id
+
+        Returns:
+            Lemmatized texts, aligned to jobs
+        """
+        self.upsert(jobs, touch=False)
+        job_ids = [str(job["job_id"]) for job in jobs]
+        with self._lock:
+            stored = {}
+            for job_id in job_ids:
+                row = self._conn.execute("SELECT lemma FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+                if row and row[0] is not None:
+                    stored[job_id] = row[0]
+        stored = self._lemmas_for(jobs, stored)
+        return [stored[job_id] for job_id in job_ids]
+
+    def representations(self, jobs: Sequence[Dict[str, Any]]) -> Tuple[List[str], np.ndarray]:
+        """
+        Return lemmatized text and embeddings for postings, computing only what is missing.
+
+        Postings are upserted first, so a changed description is recomputed.
+        Matching is not a sighting: last_seen of known postings is not refreshed.
+        Lemmas stored by lemmas() are reused; embeddings are reused only when
+        they come from the active model.
+
+        Args:
+            jobs: Job postings with a job_id
+
+        Returns:
+            Tuple of lemmatized texts and a float32 embedding matrix, aligned to jobs
+        """
+        from embedding_utils import embed_documents, get_model_name
+        from match_jobs import compose_job_text
+
+        model_name = get_model_name()
+        self.upsert(jobs, touch=False)
+        job_ids = [str(job["job_id"]) for job in jobs]
+        with self._lock:
+            lemmas: Dict[str, str] = {}
+            vectors: Dict[str, np.ndarray] = {}
+            for job_id in job_ids:
+                row = self._conn.execute(
+                    "SELECT lemma, embedding, model FROM jobs WHERE job_id = ?", (job_id,)
+                ).fetchone()
+                if row and row[0] is not None:
+                    lemmas[job_id] = row[0]
+                if row and row[1] is not None and row[2] == model_name:
+                    vectors[job_id] = np.frombuffer(row[1], dtype=np.float32)
+
+        lemmas = self._lemmas_for(jobs, lemmas)
+        missing = {str(job["job_id"]): job for job in jobs if str(job["job_id"]) not in vectors}
+        if missing:
+            embeddings = embed_documents([compose_job_text(job) for job in missing.values()])
+            with self._lock, self._conn:
+                for job_id, embedding in zip(missing, embeddings):
+                    vector = np.asarray(embedding, dtype=np.float32)
+                    vectors[job_id] = vector
+                    self._conn.execute(
+                        "UPDATE jobs SET embedding = ?, model = ? WHERE job_id = ?",
+                        (vector.tobytes(), model_name, job_id)
+                    )
+
+        matrix = np.vstack([vectors[job_id] for job_id in job_ids]) if job_ids else np.empty((0, 0), np.float32)
+        return [lemmas[job_id] for job_id in job_ids], matrix
+
+
+def get_job_corpus() -> Optional[JobCorpus]:
+    """
+    Return the process-wide job corpus.
+    Set JOB_CORPUS_PATH to an empty string to disable it.
+    """
+    global _corpus
+    path = os.getenv("JOB_CORPUS_PATH", "data/job_corpus.sqlite3")
+    if not path:
+        return None
+    if _corpus is None:
+        _corpus = JobCorpus(path)
+    return _corpus
@@ -0,0 +1,47 @@
+from keyword_matcher import KeywordMatcher
+
+DEFAULT_COUNTRIES = ['de', 'germany', 'uk', 'united kingdom', 'nl', 'netherlands']
+DEFAULT_JOB_TYPES = ['full-time', 'fulltime', 'contract', 'permanent', 'remote']
+DEFAULT_KEYWORDS = [
+    'ai', 'artificial intelligence', 'machine learning', 'ml', 'nlp',
+    'data scientist', 'engineer', 'developer', 'python'
+]
+
+
+def build_job_predicate(countries=None, job_types=None, keywords=None, whole_words=False):
+    """
+    Build the JobFilterTool criteria as a function of one job posting, so the
+    same filter can run over a list or a stream of postings.
+    A job passes when its country matches, its employment type matches (or is
+    empty), and a keyword appears in its title or description. Keywords are
+    compiled into one pattern that scans the text once, and match as
+    substrings, so 'engineer' also matches 'Engineering'; with whole_words they
+    must match whole words, so 'ml' does not match 'html' (nor 'engineer'
+    'engineering').
+    """
+    valid_countries = countries if countries is not None else DEFAULT_COUNTRIES
+    valid_types = job_types if job_types is not None else DEFAULT_JOB_TYPES
+    matcher = KeywordMatcher(keywords if keywords is not None else DEFAULT_KEYWORDS, word_boundaries=whole_words)
+
+    def predicate(job):
+        country = (job.get('job_country') or '').lower()
+        job_type = (job.get('job_employment_type') or '').lower()
+
+        country_match = any(c in country for c in valid_countries)
+        type_match = not job_type or any(jt in job_type for jt in valid_types)
+        if not (country_match and type_match):
+            return False
+        # Title and description are joined by a newline so a phrase cannot span them
+        return matcher.matches(f"{job.get('job_title') or ''}\n{job.get('job_description') or ''}")
+
+    return predicate
+
+
+def filter_jobs(jobs, countries=None, job_types=None, keywords=None, whole_words=False):
+    """
+    Return the jobs that pass build_job_predicate's criteria.
+    Every call scans each posting once; to filter a large corpus repeatedly,
+    use ColumnarJobStore.filter_mask, which answers from bitmaps and a token index.
+    """
+    predicate = build_job_predicate(countries, job_types, keywords, whole_words=whole_words)
+    return [job for job in jobs if predicate(job)]
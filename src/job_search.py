@@ -1,14 +1,218 @@
 import os
 import requests
 import json
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
 from dotenv import load_dotenv
+from instrumentation import count
 
 load_dotenv()
 
-def query_and_save_jobs(query, job_location="Berlin, Germany", output_path="data/job_postings.json"):
+ADZUNA_BASE_URL = os.getenv("ADZUNA_BASE_URL", "https://api.adzuna.com/v1/api/jobs")
+
+# Request parameters that identify the caller rather than the search
+CREDENTIAL_PARAMS = {'app_id', 'app_key'}
+
+_response_cache = None
+
+
+class ResponseCache:
+    """
+    On-disk cache of Adzuna search responses keyed by normalized request parameters.
+
+    Entries younger than ttl are served as fresh. Entries within stale_ttl after
+    that are served immediately while a background request refreshes them
+    (stale-while-revalidate). The cache is capped at max_bytes, evicting the
+    least recently used responses first.
+    """
+
+    def __init__(self, path, ttl=3600, stale_ttl=21600, max_bytes=100 * 1024 * 1024):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "evictions": 0, "revalidations": 0}
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, body TEXT NOT NULL, size INTEGER NOT NULL, "
+            "fetched_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(url, params):
+        """
+        Hash the URL and search parameters, ignoring credentials, case and extra whitespace.
+        """
+        normalized = {
+            name: ' '.join(str(value).lower().split())
+            for name, value in params.items()
+            if name not in CREDENTIAL_PARAMS
+        }
+        payload = json.dumps({"url": url, "params": normalized}, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def lookup(self, url, params):
+        """
+        Return (data, state) where state is 'fresh', 'stale' or None on a miss.
+        """
+        key = self.make_key(url, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT body, fetched_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl + self.stale_ttl:
+                self.stats["misses"] += 1
+                count("response_cache.misses")
+                return None, None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            state = "fresh" if now - row[1] <= self.ttl else "stale"
+            self.stats["hits" if state == "fresh" else "stale_hits"] += 1
+        count("response_cache.hits")
+        return json.loads(row[0]), state
+
+    def store(self, url, params, data):
+        """
+        Cache a response body and evict least recently used entries over the size cap.
+        """
+        key = self.make_key(url, params)
+        body = json.dumps(data)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, body, size, fetched_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, body, len(body), now, now)
+            )
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                for old_key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (old_key,))
+                    total -= size
+                    self.stats["evictions"] += 1
+            self._conn.commit()
+
+    def revalidate_in_background(self, url, params):
+        """
+        Refresh a stale entry on a daemon thread, at most once at a time per key.
+        """
+        key = self.make_key(url, params)
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            self.stats["revalidations"] += 1
+
+        def refresh():
+            try:
+                response = requests.get(url, params=params, timeout=30)
+                if response.status_code == 200:
+                    self.store(url, params, response.json())
+            except requests.RequestException:
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def hit_rate(self):
+        """
+        Fraction of lookups served from the cache, fresh or stale.
+        """
+        served = self.stats["hits"] + self.stats["stale_hits"]
+        total = served + self.stats["misses"]
+        return served / total if total else 0.0
+
+
+def get_response_cache():
+    """
+    Return the process-wide Adzuna response cache.
+    ADZUNA_CACHE_PATH (empty to disable), ADZUNA_CACHE_TTL, ADZUNA_CACHE_STALE_TTL
+    and ADZUNA_CACHE_MAX_MB configure it.
+    """
+    global _response_cache
+    path = os.getenv("ADZUNA_CACHE_PATH", "data/adzuna_cache.sqlite3")
+    if not path:
+        return None
+    if _response_cache is None:
+        _response_cache = ResponseCache(
+            path,
+            ttl=float(os.getenv("ADZUNA_CACHE_TTL", "3600")),
+            stale_ttl=float(os.getenv("ADZUNA_CACHE_STALE_TTL", "21600")),
+            max_bytes=int(float(os.getenv("ADZUNA_CACHE_MAX_MB", "100")) * 1024 * 1024)
+        )
+    return _response_cache
+
+
+def transform_adzuna_job(job):
+    """
+    Transform one Adzuna result into the job posting structure used across the project.
+    """
+    # Extract location info more carefully
+    location_info = job.get("location", {})
+    city = "Berlin"  # Default
+    if isinstance(location_info, dict):
+        if "area" in location_info and location_info["area"]:
+            city = location_info["area"][0] if isinstance(location_info["area"], list) else location_info["area"]
+        elif "display_name" in location_info:
+            city = location_info["display_name"]
+    
+    return {
+        "job_id": str(job.get("id", "")),
+        "job_title": job.get("title", ""),
+        "employer_name": job.get("company", {}).get("display_name", ""),
+        "job_description": job.get("description", ""),
+        "job_city": city,
+        "job_country": "DE",
+        "job_apply_link": job.get("redirect_url", ""),
+        "job_employment_type": "Full-time",
+        "job_publisher": "Adzuna"
+    }
+
+
+def save_jobs(transformed_data, output_path, corpus=None, max_age_days=30):
+    """
+    Save transformed job data to a JSON file and, when a JobCorpus is given,
+    upsert the postings into it and expire postings not seen for max_age_days.
+    Set JOB_COLUMNS_DIR to also write a memory-mappable columnar copy.
+    """
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(transformed_data, f, indent=4)
+    print(f"💾 Saved {len(transformed_data['data'])} jobs to {output_path}")
+
+    columns_dir = os.getenv("JOB_COLUMNS_DIR", "")
+    if columns_dir:
+        from columnar_store import ColumnarJobStore
+
+        ColumnarJobStore.write(transformed_data["data"], columns_dir)
+        print(f"💾 Saved columnar copy to {columns_dir}")
+
+    if corpus is not None:
+        counts = corpus.upsert(transformed_data["data"])
+        counts["expired"] = corpus.expire(max_age_days)
+        transformed_data["corpus"] = counts
+        print(f"🗂️ Corpus: {counts['new']} new, {counts['changed']} changed, {counts['unchanged']} unchanged, {counts['expired']} expired")
+    return transformed_data
+
+
+def query_and_save_jobs(query, job_location="Berlin, Germany", output_path="data/job_postings.json", corpus=None, max_age_days=30, max_pages=1, max_results=None, cache=None):
     """
     Search for jobs using the Adzuna API with location filtering,
     log progress, and save results to a JSON file.
+    When a JobCorpus is given, postings are upserted into it and postings
+    not seen for max_age_days are expired.
+    With max_pages > 1, pages are fetched concurrently by AdzunaFetcher,
+    up to max_results postings.
+    When a ResponseCache is given, cached responses are reused within its TTL.
     """
     print(f"🔁 Fetching jobs for: '{query}' in '{job_location}'")
     
@@ -21,67 +225,152 @@ def query_and_save_jobs(query, job_location="Berlin, Germany", output_path="data
         print("📝 Get free API keys at: https://developer.adzuna.com/")
         return {}
     
+    if max_pages > 1:
+        from adzuna_client import AdzunaError, fetch_jobs
+
+        try:
+            jobs = fetch_jobs(query, job_location, max_pages=max_pages, max_results=max_results, app_id=app_id, app_key=app_key, cache=cache)
+        except AdzunaError as exc:
+            print(f"❗️ {exc}")
+            return {}
+        print(f"✔️ Retrieved {len(jobs)} job postings from Adzuna (up to {max_pages} pages)")
+        return save_jobs({"status": "OK", "data": jobs}, output_path, corpus=corpus, max_age_days=max_age_days)
+    
     # Adzuna API parameters
     params = {
         'app_id': app_id,
         'app_key': app_key,
         'what': query,
-        'where': 'Berlin',
+        'where': job_location,
         'results_per_page': 50,
         'content-type': 'application/json'
     }
 
-    url = 'https://api.adzuna.com/v1/api/jobs/de/search/1'
-    response = requests.get(url, params=params)
+    url = f'{ADZUNA_BASE_URL}/de/search/1'
+    data = None
+    if cache is not None:
+        data, state = cache.lookup(url, params)
+        if state == "stale":
+            cache.revalidate_in_background(url, params)
+        if data is not None:
+            print(f"⚡ Served from response cache ({state})")
 
-    if response.status_code == 200:
+    if data is None:
+        response = requests.get(url, params=params)
+        if response.status_code != 200:
+            print(f"❗️ Adzuna API Error: {response.status_code}")
+            print(f"Response: {response.text}")
+            return {}
         data = response.json()
-        num = len(data.get("results", []))
-        print(f"✔️ Retrieved {num} job postings from Adzuna")
-        
-        # Debug: Print raw data structure
-        if data.get("results"):
-            print("🔍 Sample raw job data:")
-            sample_job = data["results"][0]
-            print(f"Keys: {list(sample_job.keys())}")
-            print(f"Title: {sample_job.get('title', 'N/A')}")
-            print(f"Company: {sample_job.get('company', {})}")
-            print(f"Location: {sample_job.get('location', {})}")
-        
-        # Transform Adzuna format to match existing structure
-        transformed_data = {
-            "status": "OK",
-            "data": []
-        }
-        
-        for job in data.get("results", []):
-            # Extract location info more carefully
-            location_info = job.get("location", {})
-            city = "Berlin"  # Default
-            if isinstance(location_info, dict):
-                if "area" in location_info and location_info["area"]:
-                    city = location_info["area"][0] if isinstance(location_info["area"], list) else location_info["area"]
-                elif "display_name" in location_info:
-                    city = location_info["display_name"]
-            
-            transformed_job = {
-                "job_id": str(job.get("id", "")),
-                "job_title": job.get("title", ""),
-                "employer_name": job.get("company", {}).get("display_name", ""),
-                "job_description": job.get("description", ""),
-                "job_city": city,
-                "job_country": "DE",
-                "job_apply_link": job.get("redirect_url", ""),
-                "job_employment_type": "Full-time",
-                "job_publisher": "Adzuna"
-            }
-            transformed_data["data"].append(transformed_job)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(transformed_data, f, indent=4)
-        print(f"💾 Saved {len(transformed_data['data'])} jobs to {output_path}")
-        return transformed_data
-    else:
-        print(f"❗️ Adzuna API Error: {response.status_code}")
-        print(f"Response: {response.text}")
-        return {}
\ No newline at end of file
+        if cache is not None:
+            cache.store(url, params, data)
+
+    num = len(data.get("results", []))
+    print(f"✔️ Retrieved {num} job postings from Adzuna")
+    
+    # Debug: Print raw data structure
+    if data.get("results"):
+        print("🔍 Sample raw job data:")
+        sample_job = data["results"][0]
+        print(f"Keys: {list(sample_job.keys())}")
+        print(f"Title: {sample_job.get('title', 'N/A')}")
+        print(f"Company: {sample_job.get('company', {})}")
+        print(f"Location: {sample_job.get('location', {})}")
+    
+    # Transform Adzuna format to match existing structure
+    transformed_data = {
+        "status": "OK",
+        "data": []
+    }
+    
+    for job in data.get("results", []):
+        transformed_data["data"].append(transform_adzuna_job(job))
+    
+    return save_jobs(transformed_data, output_path, corpus=corpus, max_age_days=max_age_days)
+
+
+def search_many_and_save_jobs(queries, locations, output_path="data/job_postings.json", corpus=None, max_age_days=30, max_pages=1, max_results=None, cache=None):
+    """
+    Search every query x location combination concurrently, merge the results
+    de-duplicated by job_id, and save them like query_and_save_jobs.
+    The result carries a "combinations" list with the count, unique postings,
+    latency and any error of each combination; if every combination failed,
+    nothing is saved and {} is returned like a failed single search.
+    """
+    from adzuna_client import AdzunaError, fan_out_jobs
+
+    queries = [queries] if isinstance(queries, str) else list(queries)
+    locations = [locations] if isinstance(locations, str) else list(locations)
+    print(f"🔁 Fetching jobs for {len(queries)} queries x {len(locations)} locations")
+
+    app_id = os.getenv("ADZUNA_APP_ID")
+    app_key = os.getenv("ADZUNA_APP_KEY")
+    if not app_id or not app_key:
+        print("❌ Adzuna API credentials not found. Please add ADZUNA_APP_ID and ADZUNA_APP_KEY to your .env file")
+        print("📝 Get free API keys at: https://developer.adzuna.com/")
+        return {}
+
+    start = time.perf_counter()
+    try:
+        jobs, combinations = fan_out_jobs(
+            queries, locations, max_pages=max_pages, max_results=max_results,
+            app_id=app_id, app_key=app_key, cache=cache
+        )
+    except AdzunaError as exc:
+        print(f"❗️ {exc}")
+        return {}
+    for combination in combinations:
+        if combination["error"]:
+            print(f"❗️ '{combination['query']}' in '{combination['location']}': {combination['error']}")
+    if all(combination["error"] for combination in combinations):
+        return {}
+    fetched = sum(combination["count"] for combination in combinations)
+    print(f"✔️ Retrieved {fetched} postings, {len(jobs)} unique, in {time.perf_counter() - start:.2f}s")
+
+    transformed_data = {"status": "OK", "data": jobs, "combinations": combinations}
+    return save_jobs(transformed_data, output_path, corpus=corpus, max_age_days=max_age_days)
+
+
+async def asearch_and_save_jobs(queries, locations, output_path="data/job_postings.json", corpus=None, max_age_days=30, max_pages=1, max_results=None, cache=None):
+    """
+    Async counterpart of query_and_save_jobs and search_many_and_save_jobs.
+    Pages are fetched with AdzunaFetcher's async client on the running event
+    loop, and saving (file and corpus writes) runs on the shared thread
+    executor, so the loop is never blocked.
+    Several combinations return a "combinations" list like
+    search_many_and_save_jobs.
+    """
+    from adzuna_client import AdzunaError, AdzunaFetcher
+    from async_executor import get_thread_executor
+
+    queries = [queries] if isinstance(queries, str) else list(queries)
+    locations = [locations] if isinstance(locations, str) else list(locations)
+    print(f"🔁 Fetching jobs for {len(queries)} queries x {len(locations)} locations")
+
+    app_id = os.getenv("ADZUNA_APP_ID")
+    app_key = os.getenv("ADZUNA_APP_KEY")
+    if not app_id or not app_key:
+        print("❌ Adzuna API credentials not found. Please add ADZUNA_APP_ID and ADZUNA_APP_KEY to your .env file")
+        print("📝 Get free API keys at: https://developer.adzuna.com/")
+        return {}
+
+    start = time.perf_counter()
+    try:
+        fetcher = AdzunaFetcher(app_id=app_id, app_key=app_key, cache=cache)
+        jobs, combinations = await fetcher.fan_out(queries, locations, max_pages=max_pages, max_results=max_results)
+    except AdzunaError as exc:
+        print(f"❗️ {exc}")
+        return {}
+    for combination in combinations:
+        if combination["error"]:
+            print(f"❗️ '{combination['query']}' in '{combination['location']}': {combination['error']}")
+    if all(combination["error"] for combination in combinations):
+        return {}
+    print(f"✔️ Retrieved {len(jobs)} unique postings in {time.perf_counter() - start:.2f}s")
+
+    transformed_data = {"status": "OK", "data": jobs}
+    if len(combinations) > 1:
+        transformed_data["combinations"] = combinations
+    return await get_thread_executor().run(
+        save_jobs, transformed_data, output_path, corpus=corpus, max_age_days=max_age_days
+    )
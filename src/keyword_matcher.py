@@ -0,0 +1,190 @@
+import json
+import re
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+_token_pattern = re.compile(r'\w+')
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase text once so keyword matching needs no per-keyword case handling."""
+    return (text or '').lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """Split normalized text into word tokens."""
+    return _token_pattern.findall(normalize_text(text))
+
+
+def keyword_pattern(keywords: Iterable[str]) -> str:
+    """
+    Build one regex alternation of the keywords, shaped as a trie so keywords
+    sharing a prefix share its test, and the longest keyword is tried first.
+    """
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def branch(node: Dict[str, dict]) -> str:
+        alternatives = [re.escape(char) + branch(child) for char, child in sorted(node.items()) if char]
+        if not alternatives:
+            return ''
+        body = alternatives[0] if len(alternatives) == 1 else f"(?:{'|'.join(alternatives)})"
+        # Greedy optional tail: a longer keyword wins, a shorter one is the backtrack
+        return f'(?:{body})?' if '' in node else body
+
+    return branch(trie)
+
+
+class KeywordMatcher:
+    """
+    Multi-keyword matcher over normalized text.
+
+    All keywords are compiled into a single pattern, so a text is scanned once
+    however many keywords there are. With word_boundaries a keyword must not be
+    preceded or followed by a word character, so 'ml' does not match 'html';
+    without, a keyword matches anywhere, like the `in` operator.
+    """
+
+    def __init__(self, keywords: Iterable[str], word_boundaries: bool = True):
+        self.keywords = sorted({normalize_text(keyword) for keyword in keywords if keyword}, key=len, reverse=True)
+        self.word_boundaries = word_boundaries
+        pattern = keyword_pattern(self.keywords)
+        if word_boundaries:
+            pattern = rf'(?<!\w)(?:{pattern})(?!\w)'
+        self._pattern = re.compile(pattern) if self.keywords else None
+
+    def search(self, normalized_text: str) -> bool:
+        """Return whether any keyword occurs in already-normalized text."""
+        return self._pattern is not None and self._pattern.search(normalized_text) is not None
+
+    def matches(self, text: str) -> bool:
+        """Return whether any keyword occurs in text."""
+        return self.search(normalize_text(text))
+
+
+class TokenIndex:
+    """
+    Inverted index from word tokens to sorted row ids.
+
+    A keyword matches the rows holding all of its tokens (a posting-list
+    intersection); a keyword filter is the union over keywords. Multi-word
+    keywords can be verified against the text to require the exact phrase.
+    """
+
+    def __init__(self, vocabulary: Dict[str, int], postings: np.ndarray, offsets: np.ndarray, n_rows: int):
+        self.vocabulary = vocabulary
+        self.postings = postings
+        self.offsets = offsets
+        self.n_rows = n_rows
+
+    @classmethod
+    def build(cls, texts: Iterable[str]) -> "TokenIndex":
+        """
+        Index texts by their distinct word tokens.
+
+        Args:
+            texts: One text per row
+
+        Returns:
+            Index over the texts
+        """
+        vocabulary: Dict[str, int] = {}
+        token_ids: List[int] = []
+        row_ids: List[int] = []
+        n_rows = 0
+        for row, text in enumerate(texts):
+            n_rows = row + 1
+            for token in set(tokenize(text)):
+                token_ids.append(vocabulary.setdefault(token, len(vocabulary)))
+                row_ids.append(row)
+        token_array = np.asarray(token_ids, dtype=np.int64)
+        row_array = np.asarray(row_ids, dtype=np.int32)
+        # Rows were appended in increasing order, so a stable sort keeps each posting list sorted
+        order = np.argsort(token_array, kind='stable')
+        postings = row_array[order]
+        offsets = np.searchsorted(token_array[order], np.arange(len(vocabulary) + 1)).astype(np.int64)
+        return cls(vocabulary, postings, offsets, n_rows)
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def posting_list(self, token: str) -> np.ndarray:
+        """Return the sorted rows containing a token."""
+        token_id = self.vocabulary.get(normalize_text(token))
+        if token_id is None:
+            return np.empty(0, dtype=np.int32)
+        return self.postings[self.offsets[token_id]:self.offsets[token_id + 1]]
+
+    def rows_with_all(self, tokens: Sequence[str]) -> np.ndarray:
+        """Intersect posting lists, shortest first."""
+        if not tokens:
+            return np.empty(0, dtype=np.int32)
+        lists = sorted((self.posting_list(token) for token in tokens), key=len)
+        rows = lists[0]
+        for other in lists[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows
+
+    def rows_matching(
+        self,
+        keywords: Iterable[str],
+        verify: Optional[Callable[[int], str]] = None
+    ) -> np.ndarray:
+        """
+        Return the sorted rows containing any keyword as whole words.
+
+        Args:
+            keywords: Keywords or phrases
+            verify: Optional function returning a row's text; when given, rows
+                found for multi-word keywords are checked for the exact phrase
+
+        Returns:
+            Sorted row ids
+        """
+        found = []
+        for keyword in keywords:
+            tokens = tokenize(keyword)
+            rows = self.rows_with_all(tokens)
+            # A keyword that is not a single plain token may need more than its tokens co-occurring
+            exact_token = len(tokens) == 1 and tokens[0] == normalize_text(keyword).strip()
+            if verify is not None and len(rows) and not exact_token:
+                matcher = KeywordMatcher([keyword])
+                rows = np.asarray([row for row in rows.tolist() if matcher.matches(verify(row))], dtype=np.int32)
+            found.append(rows)
+        if not found:
+            return np.empty(0, dtype=np.int32)
+        return np.unique(np.concatenate(found))
+
+    def mask(self, keywords: Iterable[str], verify: Optional[Callable[[int], str]] = None) -> np.ndarray:
+        """Return rows_matching as a boolean row mask."""
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self.rows_matching(keywords, verify)] = True
+        return mask
+
+    def save(self, directory: str) -> None:
+        """Write the index as .npy files plus a JSON vocabulary."""
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / 'postings.npy', self.postings)
+        np.save(path / 'offsets.npy', self.offsets)
+        with open(path / 'vocabulary.json', 'w', encoding='utf-8') as f:
+            json.dump({"rows": self.n_rows, "tokens": list(self.vocabulary)}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "TokenIndex":
+        """Load a saved index, memory-mapping the posting lists unless mmap is False."""
+        path = Path(directory)
+        with open(path / 'vocabulary.json', 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        vocabulary = {token: token_id for token_id, token in enumerate(manifest["tokens"])}
+        postings = np.load(path / 'postings.npy', mmap_mode='r' if mmap else None)
+        offsets = np.load(path / 'offsets.npy')
+        return cls(vocabulary, postings, offsets, manifest["rows"])
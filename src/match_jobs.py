@@ -1,44 +1,236 @@
 import json
-from sklearn.metrics.pairwise import cosine_similarity
-from embedding_utils import embed_text_list, expand_skills_with_embeddings
-from text_preprocessing import lemmatize_text
+import os
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from bm25 import BM25Index, reciprocal_rank_fusion
+from dedup import deduplicate_jobs
+from embedding_utils import embed_documents, SkillExpander
+from similarity import normalize_rows, top_k_indices, blockwise_top_k
+from instrumentation import count, traced
+from text_preprocessing import lemmatize_text, lemmatize_texts
 
+BM25_CACHE_SIZE = 4
 
-def match_profile_to_jobs(profile, job_postings, top_n=5):
+_bm25_indexes = OrderedDict()
+_bm25_lock = threading.Lock()
+
+
+def compose_job_text(job):
     '''
-    Match a user profile against job postings.
-    Expand skills with embeddings, lemmatize text, and calculate cosine similarity.
-    Return top N matches.
+    Return the text used to represent a job posting.
     '''
+    return job.get('job_title', '') + ' ' + job.get('job_description', '')
 
-    # 1. Prepare job text and lemmatize it for expansion
-    job_texts = [
-        job.get('job_title', '') + ' ' + job.get('job_description', '')
-        for job in job_postings
-    ]
-    lemmatized_job_texts = [lemmatize_text(text) for text in job_texts]
-
-    # 2. Expand skills using lemmatized job content
-    expanded_skills = expand_skills_with_embeddings(profile.get("skills", []), lemmatized_job_texts)
 
-    # 3. Compose profile text and lemmatize
-    profile_text = ' '.join(
+def compose_profile_text(profile, expanded_skills):
+    '''
+    Join expanded skills and the other profile sections into one text.
+    '''
+    return ' '.join(
         expanded_skills +
         profile.get('experience', []) +
         profile.get('education', []) +
         profile.get('certifications', []) +
         profile.get('projects', [])
     )
-    profile_text = lemmatize_text(profile_text)
 
-    # 4. Embed and compare
-    profile_embeddings = embed_text_list([profile_text])
-    job_embeddings = embed_text_list(job_texts)
 
-    cosine_similarities = cosine_similarity(profile_embeddings, job_embeddings).flatten()
+def get_retrieve_k():
+    '''
+    Return the default number of BM25 candidates embedded per query.
+    MATCH_RETRIEVE_K configures it; 0 (or less) embeds every posting.
+    '''
+    return max(int(os.getenv("MATCH_RETRIEVE_K", "300")), 0)
+
+
+def get_bm25_index(job_texts, lemmatize=lemmatize_texts):
+    '''
+    Return a BM25 index over the lemmatized job texts, reusing the index built
+    for the same job pool by a recent call. Pools are keyed by their raw text,
+    so a cached pool is not lemmatized again; lemmatize(job_texts) supplies
+    the lemmas when the index has to be built.
+    '''
+    key = (len(job_texts), hash(tuple(job_texts)))
+    with _bm25_lock:
+        index = _bm25_indexes.get(key)
+        if index is not None:
+            _bm25_indexes.move_to_end(key)
+            return index
+    index = BM25Index(lemmatize(job_texts))
+    with _bm25_lock:
+        _bm25_indexes[key] = index
+        while len(_bm25_indexes) > BM25_CACHE_SIZE:
+            _bm25_indexes.popitem(last=False)
+    return index
+
+
+@traced("match.retrieve_candidates")
+def retrieve_candidates(profile, job_postings, k, timings=None, corpus=None):
+    '''
+    Lexical pre-retrieval: rank postings by BM25 between their lemmatized text
+    and the lemmatized profile. Skills are not expanded here: expansion needs
+    the embeddings of the postings, which retrieval exists to avoid computing.
+    When a JobCorpus is given, stored lemmas are reused.
+    Returns the indices of the k best postings, best first.
+    '''
+    timings = timings if timings is not None else {}
+    start = time.perf_counter()
+    lemmatize = lemmatize_texts
+    if corpus is not None and all(job.get('job_id') for job in job_postings):
+        def lemmatize(_):
+            return corpus.lemmas(job_postings)
+    index = get_bm25_index([compose_job_text(job) for job in job_postings], lemmatize)
+    query = lemmatize_text(compose_profile_text(profile, profile.get("skills", []) or []))
+    candidates, _ = index.top_k(query, k)
+    timings["retrieve"] = time.perf_counter() - start
+    return candidates
+
+
+def prepare_jobs(job_postings, timings=None, corpus=None):
+    '''
+    Build the job representations shared by every matching path.
+    When a JobCorpus is given, stored lemmas and embeddings are reused and
+    only new or changed postings are recomputed.
+    Returns (lemmatized job texts, L2-normalized job embedding matrix).
+    '''
+    timings = timings if timings is not None else {}
+
+    if corpus is not None and all(job.get('job_id') for job in job_postings):
+        start = time.perf_counter()
+        lemmatized_job_texts, job_embeddings = corpus.representations(job_postings)
+        timings["job_representations"] = time.perf_counter() - start
+        return lemmatized_job_texts, normalize_rows(job_embeddings)
+
+    # 1. Prepare job text and lemmatize it for expansion
+    start = time.perf_counter()
+    job_texts = [compose_job_text(job) for job in job_postings]
+    lemmatized_job_texts = lemmatize_texts(job_texts)
+    timings["lemmatize_jobs"] = time.perf_counter() - start
+
+    # 2. Embed jobs once
+    start = time.perf_counter()
+    job_matrix = normalize_rows(embed_documents(job_texts))
+    timings["embed_jobs"] = time.perf_counter() - start
+
+    return lemmatized_job_texts, job_matrix
+
+
+@traced("match.rank_profile_against_jobs")
+def rank_profile_against_jobs(profile, job_postings, top_n=5, corpus=None, deduplicate=False, retrieve_k=None):
+    '''
+    Staged matcher: each job is lemmatized and embedded exactly once, and the
+    same job embeddings drive both skill expansion and scoring.
+    With deduplicate, near-duplicate postings are clustered first and only one
+    representative per cluster is embedded; matched representatives carry the
+    job_ids of their copies in "duplicate_job_ids".
+    With retrieve_k, only the retrieve_k best postings by BM25 are embedded,
+    and the top_n are chosen by reciprocal rank fusion of the BM25 and cosine
+    rankings. Scores are cosine similarities and matches are returned in
+    cosine order, so scores never increase down the list.
+    Returns (matches, timings) where matches is a list of (job, score) tuples,
+    best first, and timings maps each stage name to seconds.
+    '''
+    timings = {}
+    if not job_postings:
+        return [], timings
+
+    duplicates = {}
+    if deduplicate:
+        start = time.perf_counter()
+        job_postings, duplicates = deduplicate_jobs(job_postings)
+        timings["deduplicate"] = time.perf_counter() - start
+
+    lexical_ranking = None
+    if retrieve_k and retrieve_k > 0 and len(job_postings) > retrieve_k:
+        candidates = retrieve_candidates(profile, job_postings, retrieve_k, timings, corpus=corpus)
+        job_postings = [job_postings[idx] for idx in candidates]
+        duplicates = {
+            position: duplicates[idx] for position, idx in enumerate(candidates.tolist()) if idx in duplicates
+        }
+        # Candidates come back best first, so position is the lexical rank
+        lexical_ranking = np.arange(len(job_postings))
+
+    count("match.jobs_ranked", len(job_postings))
+    lemmatized_job_texts, job_matrix = prepare_jobs(job_postings, timings, corpus=corpus)
+
+    # 3. Expand skills using lemmatized job content and the job embeddings
+    start = time.perf_counter()
+    expanded_skills = profile.get("skills", []) or []
+    if expanded_skills:
+        expander = SkillExpander(lemmatized_job_texts, term_embeddings=job_matrix)
+        expanded_skills = expander.expand(expanded_skills)
+    timings["expand_skills"] = time.perf_counter() - start
+
+    # 4. Compose profile text, lemmatize and embed
+    start = time.perf_counter()
+    profile_text = lemmatize_text(compose_profile_text(profile, expanded_skills))
+    profile_vector = normalize_rows(embed_documents([profile_text]))
+    timings["embed_profile"] = time.perf_counter() - start
 
     # 5. Score and sort
-    scored_jobs = list(zip(job_postings, cosine_similarities))
-    scored_jobs.sort(key=lambda x: x[1], reverse=True)
+    start = time.perf_counter()
+    cosine_similarities = profile_vector @ job_matrix.T
+    if lexical_ranking is None:
+        top_indices = top_k_indices(cosine_similarities, top_n)[0]
+    else:
+        semantic_ranking = top_k_indices(cosine_similarities, len(job_postings))[0]
+        top_indices = reciprocal_rank_fusion([lexical_ranking, semantic_ranking])[0][:top_n]
+        top_indices = top_indices[np.argsort(-cosine_similarities[0, top_indices], kind='stable')]
+    matches = [(job_postings[idx], float(cosine_similarities[0, idx])) for idx in top_indices]
+    if deduplicate:
+        matches = [
+            (dict(job, duplicate_job_ids=[duplicate.get('job_id') for duplicate in duplicates.get(idx, [])]), score)
+            for idx, (job, score) in zip(top_indices, matches)
+        ]
+    timings["score"] = time.perf_counter() - start
+
+    return matches, timings
+
 
-    return [job for job, _ in scored_jobs[:top_n]]
\ No newline at end of file
+@traced("match.match_profiles_to_jobs")
+def match_profiles_to_jobs(profiles, job_postings, top_n=5, block_size=256, job_block_size=8192, corpus=None):
+    '''
+    Match many profiles against one job pool.
+    Jobs are lemmatized and embedded once; profiles are expanded, embedded and
+    scored block_size at a time, so memory stays bounded for large batches.
+    Returns (indices, scores) arrays of shape (len(profiles), top_n), best first,
+    where indices point into job_postings.
+    '''
+    top_n = min(top_n, len(job_postings))
+    indices = np.empty((len(profiles), top_n), dtype=np.int64)
+    scores = np.empty((len(profiles), top_n), dtype=np.float32)
+    if not profiles or not job_postings:
+        return indices, scores
+
+    lemmatized_job_texts, job_matrix = prepare_jobs(job_postings, corpus=corpus)
+    expander = SkillExpander(lemmatized_job_texts, term_embeddings=job_matrix)
+
+    for start in range(0, len(profiles), block_size):
+        block = profiles[start:start + block_size]
+        expanded = expander.expand_many([profile.get("skills", []) or [] for profile in block])
+        profile_texts = lemmatize_texts([
+            compose_profile_text(profile, skills) for profile, skills in zip(block, expanded)
+        ])
+        profile_matrix = normalize_rows(embed_documents(profile_texts))
+        block_indices, block_scores = blockwise_top_k(
+            profile_matrix, job_matrix, top_n, corpus_block_size=job_block_size
+        )
+        indices[start:start + len(block)] = block_indices
+        scores[start:start + len(block)] = block_scores
+    return indices, scores
+
+
+def match_profile_to_jobs(profile, job_postings, top_n=5, deduplicate=False, retrieve_k=None):
+    '''
+    Match a user profile against job postings.
+    Expand skills with embeddings, lemmatize text, and calculate cosine similarity.
+    With deduplicate, near-duplicate postings count once; with retrieve_k, only
+    the best BM25 candidates are embedded.
+    Return top N matches.
+    '''
+    matches, _ = rank_profile_against_jobs(
+        profile, job_postings, top_n=top_n, deduplicate=deduplicate, retrieve_k=retrieve_k
+    )
+    return [job for job, _ in matches]
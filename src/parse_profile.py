@@ -1,17 +1,27 @@
 import re
 
-from langchain_community.document_loaders import PyMuPDFLoader
-
 default_path = 'data/profile.pdf'
 
-def extract_text_from_pdf(path):
+# Bump when parsing rules change so cached profiles are re-parsed
+PARSER_VERSION = '2'
+
+def iter_pdf_lines(path):
     '''
-    Extract linkedin profile text from a pdf file
+    Yield the text lines of a pdf page by page, extracting each page only when
+    the previous one has been consumed. Closing the generator stops extraction.
     '''
+    from langchain_community.document_loaders import PyMuPDFLoader
+
     loader = PyMuPDFLoader(path)
-    docs = loader.load()
-    text = docs[0].page_content  
-    return text
+    for page in loader.lazy_load():
+        yield from page.page_content.splitlines()
+
+
+def extract_text_from_pdf(path):
+    '''
+    Extract linkedin profile text from all pages of a pdf file
+    '''
+    return '\n'.join(iter_pdf_lines(path))
 
 
 def normalize_heading(value):
@@ -110,55 +120,111 @@ def extract_name_headline(lines, headings):
     return name, headline
 
 
-def parse_profile(text):
-    lines = text.splitlines()
-    alias_map = {
-        'summary': 'summary',
-        'experience': 'experience',
-        'education': 'education',
-        'skills': 'skills',
-        'top skills': 'skills',
-        'languages': 'languages',
-        'certifications': 'certifications',
-        'contact': 'contact',
-        'honors awards': 'ignore',
-        'honorsawards': 'ignore',
-        'publications': 'ignore'
-    }
-    headings = []
-    for idx, raw in enumerate(lines):
-        canonical = alias_map.get(normalize_heading(raw))
+HEADING_ALIASES = {
+    'summary': 'summary',
+    'experience': 'experience',
+    'education': 'education',
+    'skills': 'skills',
+    'top skills': 'skills',
+    'languages': 'languages',
+    'certifications': 'certifications',
+    'contact': 'contact',
+    'honors awards': 'ignore',
+    'honorsawards': 'ignore',
+    'publications': 'ignore'
+}
+
+PROFILE_SECTIONS = ('skills', 'languages', 'certifications', 'experience', 'education')
+
+
+class ProfileParser:
+    '''
+    Single-pass profile parser fed one line at a time.
+    A section closes when the next heading starts; once every wanted section
+    has closed and the name and headline are known, done is set and the
+    remaining lines can be skipped. Feeding every line gives the same result
+    as parsing the whole text; stopping early ignores a section heading that
+    repeats after it closed.
+    '''
+
+    def __init__(self, wanted=PROFILE_SECTIONS):
+        self.wanted = set(wanted)
+        self.sections = {label: [] for label in ('summary',) + PROFILE_SECTIONS}
+        self.closed = set()
+        self.current = None
+        self.name = ''
+        self.headline = ''
+        self.done = False
+        # Lines are kept only until the name and headline are resolved
+        self._lines = []
+        self._headings = []
+        self._resolved = False
+
+    def feed(self, raw):
+        canonical = HEADING_ALIASES.get(normalize_heading(raw))
+        if not self._resolved:
+            if canonical == 'summary' and not any(label == 'summary' for _, label in self._headings):
+                self.name, self.headline = extract_name_headline(self._lines, self._headings + [(len(self._lines), 'summary')])
+                self._resolved = bool(self.name and self.headline)
+            if not self._resolved:
+                if canonical:
+                    self._headings.append((len(self._lines), canonical))
+                self._lines.append(raw)
+            else:
+                self._lines, self._headings = [], []
+
         if canonical:
-            headings.append((idx, canonical))
-    sections = {
-        'summary': [],
-        'skills': [],
-        'languages': [],
-        'certifications': [],
-        'experience': [],
-        'education': []
-    }
-    for position, label in headings:
-        next_index = next((idx for idx, _ in headings if idx > position), len(lines))
-        if label not in sections:
-            continue
-        entries = []
-        for line_index in range(position + 1, next_index):
-            entry = clean_entry(lines[line_index])
-            if should_skip_line(entry):
-                continue
-            if entry:
-                entries.append(entry)
-        if entries:
-            sections[label].extend(entries)
-    name, headline = extract_name_headline(lines, headings)
-    profile = {
-        'name': name,
-        'headline': headline,
-        'skills': unique_preserve(sections['skills']),
-        'languages': unique_preserve(sections['languages']),
-        'certifications': unique_preserve(sections['certifications']),
-        'experience': sections['experience'],
-        'education': sections['education']
-    }
-    return profile
+            if self.current is not None:
+                self.closed.add(self.current)
+            self.current = canonical
+            self.done = self._resolved and self.wanted <= self.closed
+            return
+        if self.current not in self.sections:
+            return
+        entry = clean_entry(raw)
+        if not should_skip_line(entry):
+            self.sections[self.current].append(entry)
+
+    def profile(self):
+        if not self._resolved:
+            self.name, self.headline = extract_name_headline(self._lines, self._headings)
+        return {
+            'name': self.name,
+            'headline': self.headline,
+            'skills': unique_preserve(self.sections['skills']),
+            'languages': unique_preserve(self.sections['languages']),
+            'certifications': unique_preserve(self.sections['certifications']),
+            'experience': self.sections['experience'],
+            'education': self.sections['education']
+        }
+
+
+def parse_profile_lines(lines, wanted=PROFILE_SECTIONS, stop_early=True):
+    '''
+    Parse profile lines from any iterable. With stop_early, parsing stops as
+    soon as the wanted sections are complete and a generator source is closed.
+    '''
+    parser = ProfileParser(wanted)
+    try:
+        for line in lines:
+            parser.feed(line)
+            if stop_early and parser.done:
+                break
+    finally:
+        close = getattr(lines, 'close', None)
+        if close is not None:
+            close()
+    return parser.profile()
+
+
+def parse_profile(text):
+    # The text is already in memory, so every line is parsed
+    return parse_profile_lines(text.splitlines(), stop_early=False)
+
+
+def parse_pdf(path, wanted=PROFILE_SECTIONS):
+    '''
+    Parse a linkedin profile pdf, extracting pages lazily and stopping once
+    the wanted sections are complete.
+    '''
+    return parse_profile_lines(iter_pdf_lines(path), wanted)
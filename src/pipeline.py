@@ -0,0 +1,134 @@
+import heapq
+import itertools
+import time
+from embedding_utils import embed_documents, SkillExpander
+from match_jobs import compose_profile_text, prepare_jobs
+from similarity import normalize_rows
+from text_preprocessing import lemmatize_text
+
+
+def batched(iterable, batch_size):
+    '''
+    Yield lists of up to batch_size items from an iterable.
+    '''
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+class StreamingRanker:
+    '''
+    Running top-N of job postings against one profile.
+    Postings arrive in micro-batches; each batch is lemmatized, embedded and
+    scored, and only the best top_n postings are kept, so memory does not grow
+    with the number of postings seen.
+    The profile is embedded once, with skills expanded against the first
+    non-empty batch, since later postings are not known yet.
+    '''
+
+    def __init__(self, profile, top_n=5, corpus=None):
+        self.profile = profile
+        self.top_n = top_n
+        self.corpus = corpus
+        self.profile_vector = None
+        self.seen = 0
+        self.scored = 0
+        self.batches = 0
+        self.timings = {}
+        self._heap = []
+        self._ids = set()
+        self._counter = itertools.count()
+
+    def _add_timing(self, stage, seconds):
+        self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+
+    def _embed_profile(self, lemmatized_job_texts, job_matrix):
+        start = time.perf_counter()
+        expanded_skills = self.profile.get("skills", []) or []
+        if expanded_skills:
+            expander = SkillExpander(lemmatized_job_texts, term_embeddings=job_matrix)
+            expanded_skills = expander.expand(expanded_skills)
+        self._add_timing("expand_skills", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        profile_text = lemmatize_text(compose_profile_text(self.profile, expanded_skills))
+        self.profile_vector = normalize_rows(embed_documents([profile_text]))[0]
+        self._add_timing("embed_profile", time.perf_counter() - start)
+
+    def add_batch(self, jobs):
+        '''
+        Score a micro-batch of postings and update the running top-N.
+        '''
+        if not jobs:
+            return
+        self.batches += 1
+        self.scored += len(jobs)
+        batch_timings = {}
+        lemmatized_job_texts, job_matrix = prepare_jobs(jobs, batch_timings, corpus=self.corpus)
+        for stage, seconds in batch_timings.items():
+            self._add_timing(stage, seconds)
+        if self.profile_vector is None:
+            self._embed_profile(lemmatized_job_texts, job_matrix)
+
+        start = time.perf_counter()
+        scores = job_matrix @ self.profile_vector
+        for job, score in zip(jobs, scores.tolist()):
+            job_id = job.get('job_id')
+            if job_id and job_id in self._ids:
+                continue
+            entry = (score, next(self._counter), job)
+            if len(self._heap) < self.top_n:
+                heapq.heappush(self._heap, entry)
+            elif score > self._heap[0][0]:
+                evicted = heapq.heapreplace(self._heap, entry)[2]
+                self._ids.discard(evicted.get('job_id'))
+            else:
+                continue
+            if job_id:
+                self._ids.add(job_id)
+        self._add_timing("score", time.perf_counter() - start)
+
+    def top(self):
+        '''
+        Return the current best postings as (job, score) tuples, best first.
+        '''
+        return [(job, score) for score, _, job in sorted(self._heap, key=lambda entry: (-entry[0], entry[1]))]
+
+    def snapshot(self, final=False):
+        '''
+        Return the current matches and progress counters as a dictionary.
+        '''
+        return {
+            "final": final,
+            "matches": [dict(job, match_score=round(score, 4)) for job, score in self.top()],
+            "jobs_seen": self.seen,
+            "jobs_scored": self.scored,
+            "batches": self.batches,
+            "timings": {stage: round(seconds, 4) for stage, seconds in self.timings.items()}
+        }
+
+
+def stream_matches(profile, jobs, top_n=5, batch_size=64, predicate=None, corpus=None):
+    '''
+    Rank a stream of job postings against a profile as they arrive.
+    jobs may be any iterable, such as adzuna_client.stream_jobs; postings
+    rejected by predicate are dropped before embedding. Yields a provisional
+    snapshot after every micro-batch and a final one when the stream ends.
+    '''
+    ranker = StreamingRanker(profile, top_n=top_n, corpus=corpus)
+
+    def counted(source):
+        for job in source:
+            ranker.seen += 1
+            yield job
+
+    kept = counted(jobs)
+    if predicate is not None:
+        kept = filter(predicate, kept)
+    for batch in batched(kept, batch_size):
+        ranker.add_batch(batch)
+        yield ranker.snapshot()
+    yield ranker.snapshot(final=True)
@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from instrumentation import count
+from parse_profile import PARSER_VERSION
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    sha256 TEXT NOT NULL,
+    parser_version TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    parsed_at REAL NOT NULL,
+    PRIMARY KEY (sha256, parser_version)
+);
+"""
+
+_profile_cache = None
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """Hash a file's content in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ProfileCache:
+    """
+    Parsed profiles keyed by PDF content hash and parser version.
+
+    Renamed or copied files hit the same entry, and bumping PARSER_VERSION
+    makes every cached profile a miss so they are re-parsed with the new rules.
+    """
+
+    def __init__(self, path: str, parser_version: str = PARSER_VERSION):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.parser_version = parser_version
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def get(self, sha256: str) -> Optional[Dict[str, Any]]:
+        """Return the cached profile for a content hash, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT profile FROM profiles WHERE sha256 = ? AND parser_version = ?",
+                (sha256, self.parser_version)
+            ).fetchone()
+        count("profile_cache.hits" if row else "profile_cache.misses")
+        return json.loads(row[0]) if row else None
+
+    def put(self, sha256: str, profile: Dict[str, Any]) -> None:
+        """Store a parsed profile."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO profiles (sha256, parser_version, profile, parsed_at) VALUES (?, ?, ?, ?)",
+                (sha256, self.parser_version, json.dumps(profile, ensure_ascii=False), time.time())
+            )
+
+
+def get_profile_cache() -> Optional[ProfileCache]:
+    """
+    Return the process-wide parsed-profile cache.
+    Set PROFILE_CACHE_PATH to an empty string to disable it.
+    """
+    global _profile_cache
+    path = os.getenv("PROFILE_CACHE_PATH", "data/profile_cache.sqlite3")
+    if not path:
+        return None
+    if _profile_cache is None:
+        _profile_cache = ProfileCache(path)
+    return _profile_cache
+
+
+def parse_pdf_cached(path: str, cache: Optional[ProfileCache] = None) -> Tuple[Dict[str, Any], bool]:
+    """
+    Parse a PDF profile, reusing the cached result for identical content.
+
+    Returns:
+        Tuple of the profile and whether it came from the cache
+    """
+    from parse_profile import parse_pdf
+
+    if cache is None:
+        return parse_pdf(path), False
+    digest = file_sha256(path)
+    profile = cache.get(digest)
+    if profile is not None:
+        return profile, True
+    profile = parse_pdf(path)
+    cache.put(digest, profile)
+    return profile, False
+
+
+async def parse_pdf_cached_async(path: str, cache: Optional[ProfileCache] = None) -> Tuple[Dict[str, Any], bool]:
+    """
+    parse_pdf_cached without blocking the event loop: hashing and cache access
+    run on the shared thread executor and parsing on the process executor.
+
+    Returns:
+        Tuple of the profile and whether it came from the cache
+    """
+    from async_executor import get_process_executor, get_thread_executor
+    from parse_profile import parse_pdf
+
+    threads = get_thread_executor()
+    digest = None
+    if cache is not None:
+        digest = await threads.run(file_sha256, path)
+        profile = await threads.run(cache.get, digest)
+        if profile is not None:
+            return profile, True
+    profile = await get_process_executor().run(parse_pdf, path)
+    if cache is not None:
+        await threads.run(cache.put, digest, profile)
+    return profile, False
@@ -0,0 +1,126 @@
+import json
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from similarity import blockwise_top_k, normalize_rows, top_k_indices
+
+PRECISIONS = ('float16', 'int8')
+
+
+def quantize(vectors: np.ndarray, precision: str = 'int8') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compress vectors to a reduced-precision form.
+
+    Args:
+        vectors: float matrix, one row per vector
+        precision: 'float16' or 'int8' (symmetric, one scale per vector)
+
+    Returns:
+        Tuple of codes and per-row float32 scales
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if precision == 'float16':
+        return vectors.astype(np.float16), np.ones(len(vectors), dtype=np.float32)
+    if precision == 'int8':
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales.astype(np.float32)
+    raise ValueError(f"Unknown precision: {precision}. Use one of {PRECISIONS}")
+
+
+class QuantizedEmbeddingStore:
+    """
+    Job embedding store with reduced-precision first-pass scoring.
+
+    Vectors are kept in memory as float16 or int8 codes. A query is scored against
+    the codes to build a shortlist, which is then re-ranked against the full
+    float32 vectors, memory-mapped from disk only when first needed.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        with open(self.directory / 'store.json', 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        self.precision = manifest["precision"]
+        self.ids: List[str] = manifest["ids"]
+        self.codes = np.load(self.directory / 'codes.npy')
+        self.scales = np.load(self.directory / 'scales.npy')
+        self._full: Optional[np.ndarray] = None
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, ids: Sequence[str], directory: str, precision: str = 'int8') -> "QuantizedEmbeddingStore":
+        """
+        Normalize vectors, write full-precision and quantized copies and open the store.
+
+        Args:
+            vectors: Embedding matrix, one row per job
+            ids: job_id for each row
+            directory: Where to write the store
+            precision: 'float16' or 'int8'
+
+        Returns:
+            Opened store
+        """
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        full = normalize_rows(vectors)
+        codes, scales = quantize(full, precision)
+        np.save(path / 'vectors.npy', full)
+        np.save(path / 'codes.npy', codes)
+        np.save(path / 'scales.npy', scales)
+        with open(path / 'store.json', 'w', encoding='utf-8') as f:
+            json.dump({"precision": precision, "ids": [str(job_id) for job_id in ids]}, f)
+        return cls(directory)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def full_vectors(self) -> np.ndarray:
+        """Full-precision vectors, memory-mapped on first access."""
+        if self._full is None:
+            self._full = np.load(self.directory / 'vectors.npy', mmap_mode='r')
+        return self._full
+
+    def memory_bytes(self) -> int:
+        """Resident size of the quantized codes and scales."""
+        return self.codes.nbytes + self.scales.nbytes
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        shortlist: Optional[int] = None,
+        rerank: bool = True
+    ) -> Tuple[List[List[str]], np.ndarray]:
+        """
+        Find the k most similar jobs for each query.
+
+        Args:
+            queries: Query matrix, one row per query
+            k: Number of results per query
+            shortlist: Candidates kept from the quantized pass (default: max(4 * k, 50))
+            rerank: Re-score the shortlist with full-precision vectors
+
+        Returns:
+            Tuple of job_id lists and a (len(queries), k) score matrix
+        """
+        queries = normalize_rows(queries)
+        k = min(k, len(self.ids))
+        shortlist = max(shortlist or max(4 * k, 50), k)
+        candidates, approx_scores = blockwise_top_k(queries, self.codes, shortlist, corpus_scales=self.scales)
+        if not rerank:
+            return [[self.ids[i] for i in row[:k]] for row in candidates], approx_scores[:, :k]
+
+        result_ids: List[List[str]] = []
+        result_scores = np.empty((len(queries), k), dtype=np.float32)
+        for q, query in enumerate(queries):
+            rows = np.sort(candidates[q])
+            exact = np.asarray(self.full_vectors[rows], dtype=np.float32) @ query
+            best = top_k_indices(exact.reshape(1, -1), k)[0]
+            result_ids.append([self.ids[rows[i]] for i in best])
+            result_scores[q] = exact[best]
+        return result_ids, result_scores
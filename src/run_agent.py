@@ -1,9 +1,38 @@
 import argparse
 import json
+from contextlib import nullcontext
 from pathlib import Path
 import sys
 sys.path.append(str(Path(__file__).parent))
 from agents import JobMatchAgent
+from instrumentation import profiling
+
+
+def run_streaming(agent, args, profile_source, profile_path):
+    """Run the streaming workflow, printing provisional matches, and return results for display"""
+    snapshot = {}
+    for snapshot in agent.stream_workflow(
+        profile_source=profile_source,
+        profile_path=profile_path,
+        job_query=args.query,
+        job_location=args.location,
+        filter_countries=args.countries,
+        filter_keywords=args.keywords,
+        top_n=args.top,
+        max_pages=args.max_pages
+    ):
+        if "error" in snapshot:
+            return snapshot
+        if not snapshot["final"] and snapshot["matches"]:
+            best = snapshot["matches"][0]
+            print(f"⏳ {snapshot['jobs_seen']} seen, {snapshot['jobs_scored']} scored, "
+                  f"best so far: {best.get('job_title', 'N/A')} ({best['match_score']:.3f})")
+    return {
+        "profile": snapshot.get("profile", {}),
+        "jobs_found": snapshot.get("jobs_seen", 0),
+        "jobs_filtered": snapshot.get("jobs_scored", 0),
+        "top_matches": snapshot.get("matches", [])
+    }
 
 
 def main():
@@ -23,6 +52,12 @@ Examples:
   
   # More matches
   python src/run_agent.py --pdf data/resume.pdf --top 5
+  
+  # Stream several result pages, printing provisional matches as they arrive
+  python src/run_agent.py --pdf data/resume.pdf --stream --max-pages 10
+  
+  # Profile the run and export its spans
+  python src/run_agent.py --pdf data/resume.pdf --profile --trace-file data/trace.jsonl
         """
     )
     
@@ -45,6 +80,18 @@ Examples:
     parser.add_argument('--keywords', nargs='+',
                        help='Keywords for filtering (optional)')
     
+    # Streaming options
+    parser.add_argument('--stream', action='store_true',
+                       help='Stream postings through filtering and ranking as they arrive')
+    parser.add_argument('--max-pages', type=int, default=5,
+                       help='Result pages to stream (default: 5)')
+    
+    # Diagnostics
+    parser.add_argument('--profile', nargs='?', const='data/workflow.prof', metavar='PATH',
+                       help='Write cProfile stats of the run (default path: data/workflow.prof)')
+    parser.add_argument('--trace-file', type=str, metavar='PATH',
+                       help='Append workflow spans and summary as JSON lines')
+    
     args = parser.parse_args()
     
     # Initialize agent
@@ -72,19 +119,32 @@ Examples:
     print("\n" + "=" * 80)
     
     # Run workflow
-    results = agent.run_workflow(
-        profile_source=profile_source,
-        profile_path=profile_path,
-        job_query=args.query,
-        job_location=args.location,
-        filter_countries=args.countries,
-        filter_keywords=args.keywords,
-        top_n=args.top
-    )
+    with profiling(args.profile) if args.profile else nullcontext():
+        if args.stream:
+            results = run_streaming(agent, args, profile_source, profile_path)
+        else:
+            results = agent.run_workflow(
+                profile_source=profile_source,
+                profile_path=profile_path,
+                job_query=args.query,
+                job_location=args.location,
+                filter_countries=args.countries,
+                filter_keywords=args.keywords,
+                top_n=args.top,
+                trace_path=args.trace_file
+            )
     
     # Display results
     agent.display_results(results)
 
+    if isinstance(results, dict) and "stage_timings" in results:
+        print("\n⏱️ Stages: " + ", ".join(
+            f"{name} {timing['seconds']:.2f}s ({timing['status']})"
+            for name, timing in results["stage_timings"].items()
+        ))
+    if args.profile:
+        print(f"📈 Saved profile to {args.profile} (inspect with: python -m pstats {args.profile})")
+
     if profile_source == "pdf" and isinstance(results, dict) and "profile" in results:
         output_path = Path('data/linkedin_profile.json')
         try:
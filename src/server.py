@@ -0,0 +1,281 @@
+import argparse
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+sys.path.append(str(Path(__file__).parent))
+import embedding_utils
+import text_preprocessing
+from agents import JobMatchAgent
+from async_executor import shutdown_executors
+
+MAX_BODY_BYTES = 32 * 1024 * 1024
+# run_workflow arguments that name server-side output files
+SERVER_ONLY_PARAMS = {"trace_path"}
+
+
+def _json_default(value: Any) -> Any:
+    """Encode numpy scalars and arrays that tools leave in their results."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+class MatchServer(ThreadingHTTPServer):
+    """
+    HTTP server that keeps one warm JobMatchAgent for every request.
+
+    Each request runs on its own thread; at most max_concurrent of them do
+    work at once, the rest wait for a slot. Embedding calls from concurrent
+    requests are coalesced by the MicroBatchingEmbedder installed at startup.
+    Profile paths in requests are resolved inside profile_dir and rejected
+    outside it; without a profile_dir, profiles must be sent as data.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        agent: JobMatchAgent,
+        max_concurrent: int = 8,
+        batcher: Any = None,
+        profile_dir: Optional[str] = None
+    ):
+        super().__init__(address, MatchRequestHandler)
+        self.agent = agent
+        self.batcher = batcher
+        self.profile_dir = Path(profile_dir).resolve() if profile_dir else None
+        self.started = time.time()
+        self.requests = 0
+        self._requests_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._workflow_params = set(inspect.signature(agent.run_workflow).parameters)
+
+    def count_request(self) -> None:
+        with self._requests_lock:
+            self.requests += 1
+
+    def health(self) -> Dict[str, Any]:
+        """Uptime, request count, embedder and cache statistics."""
+        cache = embedding_utils.get_embedding_cache()
+        return {
+            "status": "ok",
+            "uptime_s": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "embedding_model": embedding_utils.get_model_name(),
+            "embedding_batches": self.batcher.stats() if self.batcher is not None else None,
+            "embedding_cache": cache.stats() if cache is not None else None,
+            "lemmatizer_cache": text_preprocessing.get_lemmatizer().cache_info()
+        }
+
+    def resolve_profile_path(self, path: Any) -> str:
+        """
+        Map a requested profile path into profile_dir.
+
+        Raises:
+            ValueError: Paths are disabled, or the path leaves profile_dir
+        """
+        if self.profile_dir is None:
+            raise ValueError("Profile paths are disabled on this server; send the profile as data")
+        if not isinstance(path, str) or not path:
+            raise ValueError("Profile path must be a non-empty string")
+        resolved = (self.profile_dir / path).resolve()
+        if not resolved.is_relative_to(self.profile_dir):
+            raise ValueError("Profile path must be inside the server's profile directory")
+        return str(resolved)
+
+    def run_workflow(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Run the full workflow with the JSON body as run_workflow keyword arguments."""
+        unknown = sorted(set(body) - (self._workflow_params - SERVER_ONLY_PARAMS))
+        if unknown:
+            return 400, {"error": f"Unsupported workflow parameters: {', '.join(unknown)}"}
+        if "profile_source" not in body:
+            return 400, {"error": "profile_source is required"}
+        if body.get("profile_path") is not None:
+            try:
+                body = dict(body, profile_path=self.resolve_profile_path(body["profile_path"]))
+            except ValueError as exc:
+                return 400, {"error": str(exc)}
+        with self._slots:
+            results = self.agent.run_workflow(**body)
+        return (500 if "error" in results else 200), results
+
+    def call_tool(self, tool_name: str, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Call one tool with the JSON body as its input dictionary."""
+        if tool_name == "profile_parser" and body.get("path") is not None:
+            try:
+                body = dict(body, path=self.resolve_profile_path(body["path"]))
+            except ValueError as exc:
+                return 400, {"error": str(exc)}
+        with self._slots:
+            result = self.agent.call_tool(tool_name, body)
+        if isinstance(result, dict) and "error" in result:
+            return (404 if result["error"].startswith("Unknown tool") else 400), result
+        return 200, result
+
+
+class MatchRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON endpoints:
+        GET  /health            server, embedder and cache statistics
+        GET  /tools             available tools
+        POST /workflow          run_workflow; the body holds its keyword arguments
+        POST /tools/<name>      call_tool; the body is the tool's input dictionary
+    """
+
+    server: MatchServer
+    server_version = "JobMatchAI"
+    # Keep-alive lets clients reuse one connection for many requests
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send(200, self.server.health())
+        elif self.path == "/tools":
+            self._send(200, {"tools": self.server.agent.list_tools()})
+        else:
+            self._send(404, {"error": f"Not found: {self.path}"})
+
+    def do_POST(self) -> None:
+        body = self._read_body()
+        if body is None:
+            return
+        self.server.count_request()
+        start = time.perf_counter()
+        try:
+            if self.path == "/workflow":
+                status, payload = self.server.run_workflow(body)
+            elif self.path.startswith("/tools/"):
+                status, payload = self.server.call_tool(self.path[len("/tools/"):], body)
+            else:
+                status, payload = 404, {"error": f"Not found: {self.path}"}
+        except Exception as exc:
+            status, payload = 500, {"error": str(exc)}
+        self._send(status, payload, elapsed=time.perf_counter() - start)
+
+    def _read_body(self) -> Optional[Dict[str, Any]]:
+        """Decode the JSON object body, answering 400/413 and returning None when invalid."""
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self._send(413, {"error": "Request body too large"})
+            return None
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            self._send(400, {"error": "Invalid JSON input"})
+            return None
+        if not isinstance(body, dict):
+            self._send(400, {"error": "Request body must be a JSON object"})
+            return None
+        return body
+
+    def _send(self, status: int, payload: Dict[str, Any], elapsed: Optional[float] = None) -> None:
+        data = json.dumps(payload, ensure_ascii=False, default=_json_default).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        if elapsed is not None:
+            self.send_header("Server-Timing", f"total;dur={elapsed * 1000:.1f}")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if os.getenv("SERVER_ACCESS_LOG", "1") != "0":
+            super().log_message(format, *args)
+
+
+def create_server(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    agent: Optional[JobMatchAgent] = None,
+    warm_up: bool = True,
+    max_concurrent: Optional[int] = None,
+    batch_window_ms: Optional[float] = None,
+    max_batch: Optional[int] = None,
+    profile_dir: Optional[str] = None
+) -> MatchServer:
+    """
+    Build a server with warm models and micro-batched embeddings.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind (0 picks a free one)
+        agent: Agent to serve (default: a new JobMatchAgent)
+        warm_up: Construct the tools and load the spaCy and embedding models now
+        max_concurrent: Requests doing work at once (default: SERVER_MAX_CONCURRENT or 8)
+        batch_window_ms: Embedding batch window (default: EMBED_BATCH_WINDOW_MS or 5)
+        max_batch: Texts per shared embedding batch (default: EMBED_MAX_BATCH or 256)
+        profile_dir: Directory request profile paths are resolved in
+            (default: SERVER_PROFILE_DIR or data; empty to accept profile data only)
+
+    Returns:
+        The bound server; call serve_forever() to handle requests
+    """
+    agent = agent or JobMatchAgent()
+    if warm_up:
+        agent.warm_up()
+    batcher = embedding_utils.enable_micro_batching(batch_window_ms, max_batch)
+    if max_concurrent is None:
+        max_concurrent = int(os.getenv("SERVER_MAX_CONCURRENT", "8"))
+    if profile_dir is None:
+        profile_dir = os.getenv("SERVER_PROFILE_DIR", "data")
+    return MatchServer((host, port), agent, max_concurrent=max_concurrent, batcher=batcher, profile_dir=profile_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="JobMatch AI - matching server with warm models",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python src/server.py --port 8000
+
+  curl -s localhost:8000/health
+  curl -s -X POST localhost:8000/workflow -d '{"profile_source": "pdf", "profile_path": "resume.pdf"}'
+  curl -s -X POST localhost:8000/tools/job_matcher -d @match_input.json
+        """
+    )
+    parser.add_argument('--host', type=str, default=os.getenv("SERVER_HOST", "127.0.0.1"),
+                       help='Interface to bind (default: SERVER_HOST or 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=int(os.getenv("SERVER_PORT", "8000")),
+                       help='Port to bind (default: SERVER_PORT or 8000)')
+    parser.add_argument('--max-concurrent', type=int,
+                       help='Requests doing work at once (default: SERVER_MAX_CONCURRENT or 8)')
+    parser.add_argument('--batch-window-ms', type=float,
+                       help='Embedding batch window (default: EMBED_BATCH_WINDOW_MS or 5)')
+    parser.add_argument('--max-batch', type=int,
+                       help='Texts per shared embedding batch (default: EMBED_MAX_BATCH or 256)')
+    parser.add_argument('--profile-dir', type=str,
+                       help='Directory request profile paths are resolved in '
+                            '(default: SERVER_PROFILE_DIR or data; empty accepts profile data only)')
+    args = parser.parse_args()
+
+    print("🤖 Loading models...")
+    server = create_server(
+        args.host, args.port,
+        max_concurrent=args.max_concurrent,
+        batch_window_ms=args.batch_window_ms,
+        max_batch=args.max_batch,
+        profile_dir=args.profile_dir
+    )
+    host, port = server.server_address[:2]
+    print(f"🚀 Serving on http://{host}:{port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if server.batcher is not None:
+            server.batcher.close()
+        shutdown_executors(wait=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import numpy as np
+
+
+def normalize_rows(matrix):
+    '''
+    L2-normalize each row of a matrix so dot products become cosine similarities.
+    Zero rows are left as zeros.
+    '''
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k_indices(scores, k):
+    '''
+    Return the column indices of the k largest scores in each row, best first.
+    Uses argpartition so only the k selected columns are sorted.
+    '''
+    scores = np.asarray(scores)
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    if k < scores.shape[1]:
+        candidates = np.argpartition(scores, -k, axis=1)[:, -k:]
+    else:
+        candidates = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=1), axis=1)
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+def blockwise_top_k(queries, corpus, k, query_block_size=256, corpus_block_size=8192, corpus_scales=None):
+    '''
+    Score every query row against every corpus row and keep the k best per query.
+    Scores are computed in query_block_size x corpus_block_size tiles and merged
+    with argpartition, so memory stays bounded regardless of corpus size.
+    The corpus may be a memory map or a reduced-precision matrix: each tile is
+    cast to float32 on its own, and corpus_scales (one per row) rescales the
+    scores of quantized rows.
+    Inputs are expected to be L2-normalized; scores are dot products.
+    Returns (indices, scores) arrays of shape (len(queries), k), best first.
+    '''
+    queries = np.asarray(queries, dtype=np.float32)
+    k = max(min(k, len(corpus)), 0)
+    indices = np.empty((len(queries), k), dtype=np.int64)
+    scores = np.empty((len(queries), k), dtype=np.float32)
+    if k == 0:
+        return indices, scores
+
+    for q_start in range(0, len(queries), query_block_size):
+        query_block = queries[q_start:q_start + query_block_size]
+        best_indices = np.empty((len(query_block), 0), dtype=np.int64)
+        best_scores = np.empty((len(query_block), 0), dtype=np.float32)
+        for c_start in range(0, len(corpus), corpus_block_size):
+            tile = np.asarray(corpus[c_start:c_start + corpus_block_size], dtype=np.float32)
+            block_scores = query_block @ tile.T
+            if corpus_scales is not None:
+                block_scores *= corpus_scales[c_start:c_start + corpus_block_size]
+            local = top_k_indices(block_scores, k)
+            merged_scores = np.concatenate([best_scores, np.take_along_axis(block_scores, local, axis=1)], axis=1)
+            merged_indices = np.concatenate([best_indices, local + c_start], axis=1)
+            keep = top_k_indices(merged_scores, k)
+            best_scores = np.take_along_axis(merged_scores, keep, axis=1)
+            best_indices = np.take_along_axis(merged_indices, keep, axis=1)
+        indices[q_start:q_start + len(query_block)] = best_indices
+        scores[q_start:q_start + len(query_block)] = best_scores
+    return indices, scores
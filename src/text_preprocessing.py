@@ -1,16 +1,181 @@
-import spacy
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from instrumentation import count, observe, span
+
+MODEL_NAME = "en_core_web_sm"
+
+# Lemmas only need the tagger and attribute ruler, so skip the expensive components
+DISABLED_COMPONENTS = ["parser", "ner"]
+
+_lemmatizer = None
+_lemmatizer_lock = threading.Lock()
+
+
+class Lemmatizer:
+    '''
+    Shared spaCy lemmatizer.
+    Loads the pipeline once, lemmatizes batches through nlp.pipe and keeps
+    a bounded LRU cache of results keyed by text hash.
+    '''
+
+    def __init__(self, model_name=MODEL_NAME, batch_size=64, n_process=1, cache_size=10000):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._nlp = None
+        self._loaded = False
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    @property
+    def nlp(self):
+        '''
+        The spaCy pipeline, loaded on first access.
+        None when the model is not installed.
+        '''
+        with self._load_lock:
+            if not self._loaded:
+                import spacy
+
+                try:
+                    self._nlp = spacy.load(self.model_name, disable=DISABLED_COMPONENTS)
+                except OSError:
+                    print("spaCy model not found. Please run: python -m spacy download en_core_web_sm")
+                self._loaded = True
+        return self._nlp
+
+    @staticmethod
+    def _key(text):
+        return hashlib.sha1(text.encode('utf-8')).digest()
+
+    def _lookup(self, key):
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            self.misses += 1
+            return None
+
+    def _store(self, key, value):
+        with self._lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def lemmatize_many(self, texts, batch_size=None, n_process=None):
+        '''
+        Lemmatize a list of strings, running only uncached texts through nlp.pipe.
+        Returns lemmatized strings in input order.
+        '''
+        texts = [str(text) for text in texts]
+        with span("lemmatizer.lemmatize", texts=len(texts)):
+            return self._lemmatize_many(texts, batch_size, n_process)
+
+    def _lemmatize_many(self, texts, batch_size, n_process):
+        keys = [self._key(text) for text in texts]
+        results = [self._lookup(key) for key in keys]
+
+        pending = {}
+        for i, result in enumerate(results):
+            if result is None:
+                pending.setdefault(keys[i], texts[i])
+        count("lemmatizer.texts", len(texts))
+        count("lemmatizer.cache_hits", sum(result is not None for result in results))
+        if not pending:
+            return results
+        count("lemmatizer.computed", len(pending))
+        observe("lemmatizer.batch_size", len(pending))
+
+        nlp = self.nlp
+        if nlp is None:
+            lemmatized = [text.lower() for text in pending.values()]
+        else:
+            docs = nlp.pipe(
+                (text.lower() for text in pending.values()),
+                batch_size=batch_size or self.batch_size,
+                n_process=n_process or self.n_process
+            )
+            lemmatized = [
+                ' '.join(token.lemma_ for token in doc if not token.is_stop and not token.is_punct)
+                for doc in docs
+            ]
+
+        done = dict(zip(pending, lemmatized))
+        for key, value in done.items():
+            self._store(key, value)
+        return [result if result is not None else done[key] for key, result in zip(keys, results)]
+
+    def lemmatize(self, text):
+        '''
+        Lemmatize a single string.
+        '''
+        return self.lemmatize_many([text])[0]
+
+    def cache_info(self):
+        '''
+        Return cache hit/miss counters and current size.
+        '''
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._cache),
+            "max_size": self.cache_size
+        }
+
+
+def get_lemmatizer():
+    '''
+    Return the process-wide lemmatizer.
+    LEMMATIZER_BATCH_SIZE, LEMMATIZER_N_PROCESS and LEMMATIZER_CACHE_SIZE configure it.
+    '''
+    global _lemmatizer
+    if _lemmatizer is None:
+        with _lemmatizer_lock:
+            if _lemmatizer is None:
+                _lemmatizer = Lemmatizer(
+                    batch_size=int(os.getenv("LEMMATIZER_BATCH_SIZE", "64")),
+                    n_process=int(os.getenv("LEMMATIZER_N_PROCESS", "1")),
+                    cache_size=int(os.getenv("LEMMATIZER_CACHE_SIZE", "10000"))
+                )
+    return _lemmatizer
+
+
+def get_nlp():
+    '''
+    Return the spaCy English pipeline, loading it on first use.
+    Returns None when the model is not installed.
+    '''
+    return get_lemmatizer().nlp
+
+
+def warm_up():
+    '''
+    Load the spaCy pipeline ahead of the first lemmatization call.
+    '''
+    get_nlp()
+
+
+def lemmatize_texts(texts, batch_size=None, n_process=None):
+    '''
+    Lemmatize a list of text strings in batches using spaCy.
+    Returns a list of strings of lemmatized tokens.
+    '''
+    return get_lemmatizer().lemmatize_many(texts, batch_size=batch_size, n_process=n_process)
+
 
 def lemmatize_text(text):
     '''
     Lemmatize text string using spaCy.
     Returns a string of lemmatized tokens.
     '''
-    try:
-        nlp = spacy.load("en_core_web_sm")
-    except OSError:
-        print("spaCy model not found. Please run: python -m spacy download en_core_web_sm")
-        return text.lower()
-    
-    doc = nlp(text.lower())
-    lemmatized_tokens = [token.lemma_ for token in doc if not token.is_stop and not token.is_punct]
-    return ' '.join(lemmatized_tokens)
\ No newline at end of file
+    return get_lemmatizer().lemmatize(text)
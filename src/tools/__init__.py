@@ -1,7 +1,13 @@
-from .profile_tool import ProfileParserTool
-from .search_tool import JobSearchTool
-from .match_tool import JobMatcherTool
-from .filter_tool import JobFilterTool
+from importlib import import_module
+
+# Tools are imported on first access so that importing the package does not
+# pull in langchain, torch or spaCy before a tool is actually used
+_TOOL_MODULES = {
+    'ProfileParserTool': '.profile_tool',
+    'JobSearchTool': '.search_tool',
+    'JobMatcherTool': '.match_tool',
+    'JobFilterTool': '.filter_tool'
+}
 
 __all__ = [
     'ProfileParserTool',
@@ -10,3 +16,9 @@ __all__ = [
     'JobFilterTool'
 ]
 
+
+def __getattr__(name):
+    if name in _TOOL_MODULES:
+        module = import_module(_TOOL_MODULES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,70 @@
+"""Tool descriptions, kept free of heavy imports so tools can be listed without loading them."""
+
+PROFILE_PARSER_DESCRIPTION = """
+    Parse a user profile from PDF or JSON.
+    Input should be a JSON string with 'source' (pdf/json/dict) and 'path' or 'data'.
+    
+    Examples:
+    - {"source": "pdf", "path": "data/resume.pdf"}
+    - {"source": "json", "path": "data/profile.json"}
+    - {"source": "dict", "data": {"name": "John", "skills": ["Python"]}}
+    
+    Returns a structured profile dictionary with skills, experience, education, etc.
+    """
+
+JOB_SEARCH_DESCRIPTION = """
+    Search for jobs using the Adzuna API.
+    Input should be a JSON string with 'query' and optional 'location'.
+    Optional 'max_pages' and 'max_results' fetch several result pages concurrently.
+    'queries' and 'locations' lists search every combination in parallel and merge
+    the results, de-duplicated by job_id, with per-combination counts and latency.
+    
+    Examples:
+    - {"query": "AI engineer", "location": "Berlin"}
+    - {"query": "AI engineer", "location": "Berlin", "max_pages": 10, "max_results": 400}
+    - {"query": "Machine Learning", "location": "London"}
+    - {"queries": ["AI engineer", "ML engineer"], "locations": ["Berlin", "Munich"]}
+    - {"query": "Data Scientist"}
+    
+    Returns job postings from Adzuna API with titles, companies, descriptions, and apply links.
+    """
+
+JOB_FILTER_DESCRIPTION = """
+    Filter jobs based on location, type, and relevance criteria.
+    Input should be a JSON string with 'jobs' (list) and optional filters:
+    - 'countries': list of valid country codes (default: ['de', 'uk', 'nl'])
+    - 'job_types': list of valid job types (default: ['full-time', 'contract', 'remote'])
+    - 'keywords': list of required keywords for relevance
+    - 'whole_words': match keywords as whole words only (default: false, substrings match)
+    
+    Examples:
+    - {"jobs": [...], "countries": ["de", "uk"], "keywords": ["ai", "ml"]}
+    - {"jobs": [...], "job_types": ["remote", "full-time"]}
+    
+    Returns filtered list of jobs matching the criteria.
+    """
+
+JOB_MATCHER_DESCRIPTION = """
+    Match a user profile to job postings using embeddings and similarity.
+    Input should be a JSON string with 'profile' (dict) and 'jobs' (list).
+    Optional 'top_n' parameter (default: 3).
+    Near-duplicate postings are collapsed before embedding unless 'deduplicate' is false.
+    Optional 'retrieve_k' (default: 300): only the best BM25 candidates are embedded; 0 embeds all.
+    
+    Examples:
+    - {"profile": {...}, "jobs": [...], "top_n": 5}
+    - {"profile": {...}, "jobs": [...], "deduplicate": false}
+    - {"profile": {...}, "jobs": [...], "retrieve_k": 500}
+    - {"profile": {...}, "jobs": [...]}
+    
+    Returns top N matched jobs ranked by similarity score, each with a 'match_score'
+    and the 'duplicate_job_ids' of reposts it stands in for.
+    Profile should contain: skills, experience, education, certifications.
+    """
+
+TOOL_DESCRIPTIONS = {
+    'profile_parser': PROFILE_PARSER_DESCRIPTION,
+    'job_searcher': JOB_SEARCH_DESCRIPTION,
+    'job_filter': JOB_FILTER_DESCRIPTION,
+    'job_matcher': JOB_MATCHER_DESCRIPTION
+}
@@ -1,60 +1,57 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from langchain.tools import BaseTool
 import json
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+from instrumentation import traced
+from async_executor import get_thread_executor
+from job_filter import filter_jobs
+from .descriptions import JOB_FILTER_DESCRIPTION
 
 
 class JobFilterTool(BaseTool):
     name: str = "job_filter"
-    description: str = """
-    Filter jobs based on location, type, and relevance criteria.
-    Input should be a JSON string with 'jobs' (list) and optional filters:
-    - 'countries': list of valid country codes (default: ['de', 'uk', 'nl'])
-    - 'job_types': list of valid job types (default: ['full-time', 'contract', 'remote'])
-    - 'keywords': list of required keywords for relevance
-    
-    Examples:
-    - {"jobs": [...], "countries": ["de", "uk"], "keywords": ["ai", "ml"]}
-    - {"jobs": [...], "job_types": ["remote", "full-time"]}
-    
-    Returns filtered list of jobs matching the criteria.
-    """
+    description: str = JOB_FILTER_DESCRIPTION
     
     def _run(self, input_str: str) -> Dict[str, Any]:
-        """Filter jobs based on criteria"""
+        """Filter jobs based on criteria (JSON interface for LangChain)"""
         try:
             input_data = json.loads(input_str)
         except json.JSONDecodeError:
             return {"error": "Invalid JSON input"}
-        
-        jobs = input_data.get("jobs", [])
+        return self.run_dict(input_data)
+    
+    def run_dict(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Filter jobs from an already-decoded input dictionary"""
+        return self.filter(
+            input_data.get("jobs", []),
+            countries=input_data.get("countries"),
+            job_types=input_data.get("job_types"),
+            keywords=input_data.get("keywords"),
+            whole_words=input_data.get("whole_words", False)
+        )
+    
+    @traced("tool.job_filter")
+    def filter(
+        self,
+        jobs: List[Dict[str, Any]],
+        countries: Optional[List[str]] = None,
+        job_types: Optional[List[str]] = None,
+        keywords: Optional[List[str]] = None,
+        whole_words: bool = False
+    ) -> Dict[str, Any]:
+        """Filter job postings in process; the result holds the same posting objects"""
         if not jobs:
             return {"error": "Jobs list is required"}
         
-        valid_countries = input_data.get("countries", ['de', 'germany', 'uk', 'united kingdom', 'nl', 'netherlands'])
-        valid_types = input_data.get("job_types", ['full-time', 'fulltime', 'contract', 'permanent', 'remote'])
-        keywords = input_data.get("keywords", [
-            'ai', 'artificial intelligence', 'machine learning', 'ml', 'nlp', 
-            'data scientist', 'engineer', 'developer', 'python'
-        ])
-        
-        filtered = []
-        
-        for job in jobs:
-            country = (job.get('job_country') or '').lower()
-            job_type = (job.get('job_employment_type') or '').lower()
-            title = (job.get('job_title') or '').lower()
-            description = (job.get('job_description') or '').lower()
-            
-            country_match = any(c in country for c in valid_countries)
-            type_match = not job_type or any(jt in job_type for jt in valid_types)
-            
-            keyword_match = any(
-                kw in title or kw in description 
-                for kw in keywords
-            )
-            
-            if country_match and type_match and keyword_match:
-                filtered.append(job)
+        filtered = filter_jobs(
+            jobs,
+            countries=countries,
+            job_types=job_types,
+            keywords=keywords,
+            whole_words=whole_words
+        )
         
         return {
             "status": "success",
@@ -65,6 +62,6 @@ class JobFilterTool(BaseTool):
         }
     
     async def _arun(self, input_str: str) -> Dict[str, Any]:
-        """Async version"""
-        return self._run(input_str)
+        """Async version: decoding and filtering run on the shared thread executor"""
+        return await get_thread_executor().run(self._run, input_str)
 
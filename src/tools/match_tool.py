@@ -1,57 +1,78 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from langchain.tools import BaseTool
 import json
 from pathlib import Path
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
-from match_jobs import match_profile_to_jobs
+from instrumentation import traced
+from async_executor import get_thread_executor
+from match_jobs import get_retrieve_k, rank_profile_against_jobs
+from job_corpus import get_job_corpus
+from .descriptions import JOB_MATCHER_DESCRIPTION
 
 
 class JobMatcherTool(BaseTool):
     name: str = "job_matcher"
-    description: str = """
-    Match a user profile to job postings using embeddings and similarity.
-    Input should be a JSON string with 'profile' (dict) and 'jobs' (list).
-    Optional 'top_n' parameter (default: 3).
-    
-    Examples:
-    - {"profile": {...}, "jobs": [...], "top_n": 5}
-    - {"profile": {...}, "jobs": [...]}
-    
-    Returns top N matched jobs ranked by similarity score.
-    Profile should contain: skills, experience, education, certifications.
-    """
+    description: str = JOB_MATCHER_DESCRIPTION
     
     def _run(self, input_str: str) -> Dict[str, Any]:
-        """Match profile to jobs"""
+        """Match profile to jobs (JSON interface for LangChain)"""
         try:
             input_data = json.loads(input_str)
         except json.JSONDecodeError:
             return {"error": "Invalid JSON input"}
-        
-        profile = input_data.get("profile")
-        jobs = input_data.get("jobs")
-        
+        return self.run_dict(input_data)
+    
+    def run_dict(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Match profile to jobs from an already-decoded input dictionary"""
+        retrieve_k = input_data.get("retrieve_k")
+        if retrieve_k is not None:
+            try:
+                retrieve_k = max(int(retrieve_k), 0)
+            except (TypeError, ValueError):
+                return {"error": "retrieve_k must be an integer"}
+        return self.match(
+            input_data.get("profile"),
+            input_data.get("jobs"),
+            top_n=input_data.get("top_n", 3),
+            deduplicate=input_data.get("deduplicate", True),
+            retrieve_k=retrieve_k
+        )
+    
+    @traced("tool.job_matcher")
+    def match(
+        self,
+        profile: Optional[Dict[str, Any]],
+        jobs: Optional[List[Dict[str, Any]]],
+        top_n: int = 3,
+        deduplicate: bool = True,
+        retrieve_k: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Match a profile to job postings in process (retrieve_k defaults to MATCH_RETRIEVE_K)"""
         if not profile:
             return {"error": "Profile is required"}
         if not jobs:
             return {"error": "Jobs list is required"}
         
-        top_n = input_data.get("top_n", 3)
-        
         try:
-            matches = match_profile_to_jobs(profile, jobs, top_n=top_n)
+            ranked, timings = rank_profile_against_jobs(
+                profile, jobs, top_n=top_n, corpus=get_job_corpus(),
+                deduplicate=deduplicate,
+                retrieve_k=retrieve_k if retrieve_k is not None else get_retrieve_k()
+            )
+            matches = [dict(job, match_score=round(score, 4)) for job, score in ranked]
             
             return {
                 "status": "success",
                 "total_jobs": len(jobs),
                 "top_matches": len(matches),
-                "matches": matches
+                "matches": matches,
+                "timings": {stage: round(seconds, 4) for stage, seconds in timings.items()}
             }
         except Exception as e:
             return {"error": f"Job matching failed: {str(e)}"}
     
     async def _arun(self, input_str: str) -> Dict[str, Any]:
-        """Async version"""
-        return self._run(input_str)
+        """Async version: decoding and matching run on the shared thread executor"""
+        return await get_thread_executor().run(self._run, input_str)
 
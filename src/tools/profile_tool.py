@@ -5,50 +5,54 @@ import json
 from pathlib import Path
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
-from parse_profile import extract_text_from_pdf, parse_profile
+from instrumentation import traced
+from async_executor import get_thread_executor
+from profile_cache import get_profile_cache, parse_pdf_cached, parse_pdf_cached_async
+from .descriptions import PROFILE_PARSER_DESCRIPTION
 
 
 class ProfileParserTool(BaseTool):
     name: str = "profile_parser"
-    description: str = """
-    Parse a user profile from PDF or JSON.
-    Input should be a JSON string with 'source' (pdf/json/dict) and 'path' or 'data'.
-    
-    Examples:
-    - {"source": "pdf", "path": "data/resume.pdf"}
-    - {"source": "json", "path": "data/profile.json"}
-    - {"source": "dict", "data": {"name": "John", "skills": ["Python"]}}
-    
-    Returns a structured profile dictionary with skills, experience, education, etc.
-    """
+    description: str = PROFILE_PARSER_DESCRIPTION
     
     def _run(self, input_str: str) -> Dict[str, Any]:
-        """Parse profile from various sources"""
+        """Parse profile from various sources (JSON interface for LangChain)"""
         try:
             input_data = json.loads(input_str)
         except json.JSONDecodeError:
             return {"error": "Invalid JSON input"}
-        
-        source = input_data.get("source", "").lower()
+        return self.run_dict(input_data)
+    
+    def run_dict(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse profile from an already-decoded input dictionary"""
+        return self.parse(input_data.get("source", ""), path=input_data.get("path"), data=input_data.get("data"))
+    
+    @traced("tool.profile_parser")
+    def parse(
+        self,
+        source: str,
+        path: Optional[str] = None,
+        data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Parse a profile in process from a 'pdf' or 'json' path, or a 'dict'"""
+        source = (source or "").lower()
         
         if source == "pdf":
-            path = input_data.get("path")
             if not path:
                 return {"error": "PDF path required"}
             
             try:
-                text = extract_text_from_pdf(path)
-                profile = parse_profile(text)
+                profile, cached = parse_pdf_cached(path, cache=get_profile_cache())
                 return {
                     "status": "success",
                     "profile": profile,
-                    "source": "pdf"
+                    "source": "pdf",
+                    "cached": cached
                 }
             except Exception as e:
                 return {"error": f"PDF parsing failed: {str(e)}"}
         
         elif source == "json":
-            path = input_data.get("path")
             if not path:
                 return {"error": "JSON path required"}
             
@@ -64,7 +68,6 @@ class ProfileParserTool(BaseTool):
                 return {"error": f"JSON loading failed: {str(e)}"}
         
         elif source == "dict":
-            data = input_data.get("data")
             if not data:
                 return {"error": "Profile data required"}
             
@@ -79,5 +82,30 @@ class ProfileParserTool(BaseTool):
     
     async def _arun(self, input_str: str) -> Dict[str, Any]:
         """Async version"""
-        return self._run(input_str)
+        try:
+            input_data = json.loads(input_str)
+        except json.JSONDecodeError:
+            return {"error": "Invalid JSON input"}
+        return await self.aparse(input_data.get("source", ""), path=input_data.get("path"), data=input_data.get("data"))
+    
+    async def aparse(
+        self,
+        source: str,
+        path: Optional[str] = None,
+        data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Parse a profile without blocking the event loop; PDFs are parsed on the process executor"""
+        if (source or "").lower() != "pdf" or not path:
+            return await get_thread_executor().run(self.parse, source, path=path, data=data)
+        
+        try:
+            profile, cached = await parse_pdf_cached_async(path, cache=get_profile_cache())
+            return {
+                "status": "success",
+                "profile": profile,
+                "source": "pdf",
+                "cached": cached
+            }
+        except Exception as e:
+            return {"error": f"PDF parsing failed: {str(e)}"}
 
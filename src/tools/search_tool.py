@@ -1,55 +1,124 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple, Union
 from langchain.tools import BaseTool
 import json
 from pathlib import Path
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
-from job_search import query_and_save_jobs
+from instrumentation import traced
+from job_search import query_and_save_jobs, search_many_and_save_jobs, asearch_and_save_jobs, get_response_cache
+from job_corpus import get_job_corpus
+from .descriptions import JOB_SEARCH_DESCRIPTION
 
 
 class JobSearchTool(BaseTool):
     name: str = "job_searcher"
-    description: str = """
-    Search for jobs using the Adzuna API.
-    Input should be a JSON string with 'query' and optional 'location'.
-    
-    Examples:
-    - {"query": "AI engineer", "location": "Berlin"}
-    - {"query": "Machine Learning", "location": "London"}
-    - {"query": "Data Scientist"}
-    
-    Returns job postings from Adzuna API with titles, companies, descriptions, and apply links.
-    """
+    description: str = JOB_SEARCH_DESCRIPTION
     
     def _run(self, input_str: str) -> Dict[str, Any]:
-        """Search for jobs"""
+        """Search for jobs (JSON interface for LangChain)"""
         try:
             input_data = json.loads(input_str)
         except json.JSONDecodeError:
             return {"error": "Invalid JSON input"}
-        
-        query = input_data.get("query")
-        if not query:
+        return self.run_dict(input_data)
+    
+    def run_dict(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Search for jobs from an already-decoded input dictionary"""
+        return self.search(
+            input_data.get("queries") or input_data.get("query"),
+            input_data.get("locations") or input_data.get("location", "Berlin"),
+            max_pages=input_data.get("max_pages", 1),
+            max_results=input_data.get("max_results")
+        )
+    
+    @staticmethod
+    def _normalize(query: Union[str, List[str], None], location: Union[str, List[str], None]) -> Tuple[List[str], List[str]]:
+        queries = [query] if isinstance(query, str) else list(query or [])
+        locations = [location] if isinstance(location, str) else list(location or [])
+        return [q for q in queries if q], locations or ["Berlin"]
+    
+    @staticmethod
+    def _output(result: Dict[str, Any], queries: List[str], locations: List[str], cache: Any) -> Dict[str, Any]:
+        jobs = result.get("data", [])
+        output = {
+            "status": "success",
+            "total_jobs": len(jobs),
+            "query": queries[0] if len(queries) == 1 else queries,
+            "location": locations[0] if len(locations) == 1 else locations,
+            "jobs": jobs
+        }
+        if "combinations" in result:
+            output["combinations"] = result["combinations"]
+        if "corpus" in result:
+            output["corpus"] = result["corpus"]
+        if cache is not None:
+            output["cache"] = dict(cache.stats, hit_rate=round(cache.hit_rate(), 3))
+        return output
+    
+    @traced("tool.job_searcher")
+    def search(
+        self,
+        query: Union[str, List[str], None],
+        location: Union[str, List[str]] = "Berlin",
+        max_pages: int = 1,
+        max_results: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Search for jobs in process; query and location may each be a list to fan out"""
+        queries, locations = self._normalize(query, location)
+        if not queries:
             return {"error": "Query is required"}
         
-        location = input_data.get("location", "Berlin")
+        try:
+            cache = get_response_cache()
+            search_options = dict(
+                corpus=get_job_corpus(),
+                max_pages=max_pages,
+                max_results=max_results,
+                cache=cache
+            )
+            if len(queries) * len(locations) > 1:
+                result = search_many_and_save_jobs(queries, locations, **search_options)
+            else:
+                result = query_and_save_jobs(query=queries[0], job_location=locations[0], **search_options)
+            return self._output(result, queries, locations, cache)
+        except Exception as e:
+            return {"error": f"Job search failed: {str(e)}"}
+    
+    async def asearch(
+        self,
+        query: Union[str, List[str], None],
+        location: Union[str, List[str]] = "Berlin",
+        max_pages: int = 1,
+        max_results: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Search for jobs with the async Adzuna client on the running event loop"""
+        queries, locations = self._normalize(query, location)
+        if not queries:
+            return {"error": "Query is required"}
         
         try:
-            result = query_and_save_jobs(query=query, job_location=location)
-            
-            jobs = result.get("data", [])
-            
-            return {
-                "status": "success",
-                "total_jobs": len(jobs),
-                "query": query,
-                "location": location,
-                "jobs": jobs
-            }
+            cache = get_response_cache()
+            result = await asearch_and_save_jobs(
+                queries, locations,
+                corpus=get_job_corpus(),
+                max_pages=max_pages,
+                max_results=max_results,
+                cache=cache
+            )
+            return self._output(result, queries, locations, cache)
         except Exception as e:
             return {"error": f"Job search failed: {str(e)}"}
     
     async def _arun(self, input_str: str) -> Dict[str, Any]:
-        """Async version"""
-        return self._run(input_str)
+        """Async version: HTTP requests run on the event loop instead of blocking it"""
+        try:
+            input_data = json.loads(input_str)
+        except json.JSONDecodeError:
+            return {"error": "Invalid JSON input"}
+        return await self.asearch(
+            input_data.get("queries") or input_data.get("query"),
+            input_data.get("locations") or input_data.get("location", "Berlin"),
+            max_pages=input_data.get("max_pages", 1),
+            max_results=input_data.get("max_results")
+        )
 
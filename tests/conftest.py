@@ -0,0 +1,5 @@
+"""Shared pytest configuration: make the modules under src/ importable."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
@@ -0,0 +1,57 @@
+"""Tests for the IVF approximate nearest-neighbour index."""
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+
+from ann_index import IVFIndex
+
+if TYPE_CHECKING:
+    from _pytest.capture import CaptureFixture
+    from _pytest.fixtures import FixtureRequest
+    from _pytest.logging import LogCaptureFixture
+    from _pytest.monkeypatch import MonkeyPatch
+    from pytest_mock.plugin import MockerFixture
+
+
+@pytest.fixture
+def index() -> IVFIndex:
+    """An index of 50 random vectors with ids '0'..'49' in 4 lists."""
+    rng = np.random.default_rng(7)
+    return IVFIndex.build(rng.standard_normal((50, 16)).astype(np.float32), [str(i) for i in range(50)], n_lists=4)
+
+
+def test_empty_index_returns_empty_results() -> None:
+    """Searching an index built from no vectors returns no ids and -inf scores."""
+    empty = IVFIndex.build(np.empty((0, 16), dtype=np.float32), [])
+    ids, scores = empty.search(np.ones((2, 16), dtype=np.float32), 3)
+    assert len(empty) == 0
+    assert ids == [[], []]
+    assert scores.shape == (2, 3) and np.isneginf(scores).all()
+
+
+def test_search_after_removing_everything(index: IVFIndex) -> None:
+    """An index whose rows were all removed searches like an empty one."""
+    index.remove(str(i) for i in range(50))
+    ids, scores = index.search(np.ones((1, 16), dtype=np.float32), 5)
+    assert ids == [[]]
+    assert np.isneginf(scores).all()
+
+
+def test_add_keeps_last_vector_of_repeated_id(index: IVFIndex, tmp_path: Path) -> None:
+    """A job_id repeated within one add() is stored once, with its last vector."""
+    first, last = np.eye(16, dtype=np.float32)[:2]
+    index.add(np.stack([first, last, first]), ["dup", "other", "dup"])
+    index.add(np.stack([first, last]), ["again", "again"])
+    assert len(index) == 53
+    assert int(index._alive.sum()) == 53
+
+    ids, _ = index.search(last.reshape(1, -1), 2, n_probe=4)
+    assert set(ids[0]) == {"other", "again"}
+
+    index.remove(["dup"])
+    index.save(str(tmp_path / "index"))
+    loaded = IVFIndex.load(str(tmp_path / "index"))
+    assert len(loaded) == 52
+    assert "dup" not in loaded._row_of
@@ -0,0 +1,42 @@
+"""Tests for the bounded executor that runs blocking calls from async code."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import pytest
+
+from async_executor import BoundedExecutor
+
+if TYPE_CHECKING:
+    from _pytest.capture import CaptureFixture
+    from _pytest.fixtures import FixtureRequest
+    from _pytest.logging import LogCaptureFixture
+    from _pytest.monkeypatch import MonkeyPatch
+    from pytest_mock.plugin import MockerFixture
+
+
+def test_run_returns_result_and_frees_slot() -> None:
+    """A completed call returns its result and gives its slot back."""
+    executor = BoundedExecutor(ThreadPoolExecutor(max_workers=2), max_pending=2)
+
+    async def main() -> list:
+        return await asyncio.gather(*(executor.run(pow, 2, n) for n in range(5)))
+
+    assert asyncio.run(main()) == [1, 2, 4, 8, 16]
+    assert executor.in_flight == 0
+    executor.shutdown()
+
+
+def test_failed_submit_releases_slot() -> None:
+    """Submitting to a shut-down executor raises without leaking its semaphore slot."""
+    executor = BoundedExecutor(ThreadPoolExecutor(max_workers=1), max_pending=2)
+    executor.shutdown()
+
+    async def main() -> None:
+        for _ in range(5):
+            with pytest.raises(RuntimeError):
+                await asyncio.wait_for(executor.run(pow, 2, 3), timeout=1)
+        assert executor._semaphore(asyncio.get_running_loop())._value == 2
+
+    asyncio.run(main())
+    assert executor.in_flight == 0
@@ -0,0 +1,78 @@
+"""Regression tests for the persistent embedding cache."""
+from pathlib import Path
+from typing import Callable, List, TYPE_CHECKING
+
+import numpy as np
+
+from embedding_cache import EmbeddingCache
+
+if TYPE_CHECKING:
+    from _pytest.capture import CaptureFixture
+    from _pytest.fixtures import FixtureRequest
+    from _pytest.logging import LogCaptureFixture
+    from _pytest.monkeypatch import MonkeyPatch
+    from pytest_mock.plugin import MockerFixture
+
+
+def constant(value: List[float]) -> Callable[[List[str]], np.ndarray]:
+    """Return a compute function that embeds every text as value."""
+    def compute(texts: List[str]) -> np.ndarray:
+        return np.asarray([value] * len(texts), dtype=np.float32)
+    return compute
+
+
+def fail(texts: List[str]) -> np.ndarray:
+    """Compute function for lookups that must be served from the cache."""
+    raise AssertionError(f"unexpected compute for {texts}")
+
+
+def test_orphan_rows_are_not_returned_for_new_keys(tmp_path: Path) -> None:
+    """Rows appended without a committed index entry must not be read back."""
+    cache = EmbeddingCache(str(tmp_path), "model")
+    cache.get_or_compute(["aaaa"], constant([1.0, 2.0]))
+    # Simulate a writer that appended a row and crashed before committing the index
+    with open(cache._vectors_path(0), "ab") as f:
+        f.write(np.array([[99.0, 99.0]], dtype=np.float32).tobytes())
+    cache.close()
+
+    reopened = EmbeddingCache(str(tmp_path), "model")
+    np.testing.assert_array_equal(reopened.get_or_compute(["bbbb"], constant([4.0, 1.0])), [[4.0, 1.0]])
+    np.testing.assert_array_equal(reopened.get_or_compute(["aaaa", "bbbb"], fail), [[1.0, 2.0], [4.0, 1.0]])
+
+
+def test_two_instances_sharing_a_directory_agree(tmp_path: Path) -> None:
+    """Caches on one directory (as in two processes) see each other's rows at the right offsets."""
+    first = EmbeddingCache(str(tmp_path), "model")
+    second = EmbeddingCache(str(tmp_path), "model")
+    first.get_or_compute(["a"], constant([1.0, 0.0]))
+    second.get_or_compute(["b"], constant([0.0, 1.0]))
+    first.get_or_compute(["c"], constant([1.0, 1.0]))
+
+    expected = [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]
+    np.testing.assert_array_equal(first.get_or_compute(["a", "b", "c"], fail), expected)
+    np.testing.assert_array_equal(second.get_or_compute(["a", "b", "c"], fail), expected)
+
+
+def test_eviction_keeps_recently_used_rows(tmp_path: Path) -> None:
+    """Compaction keeps the most recently used vectors, each under its own key."""
+    cache = EmbeddingCache(str(tmp_path), "model", max_bytes=4 * 2 * 4)
+    for i in range(4):
+        cache.get_or_compute([f"t{i}"], constant([float(i), float(i)]))
+    cache.get_or_compute(["t0"], fail)
+    cache.flush()
+    cache.get_or_compute(["t4"], constant([4.0, 4.0]))
+
+    stats = cache.stats()
+    assert stats["entries"] == 3
+    assert stats["bytes"] <= 4 * 2 * 4
+    np.testing.assert_array_equal(cache.get_or_compute(["t0", "t4"], fail), [[0.0, 0.0], [4.0, 4.0]])
+
+
+def test_warm_lookup_does_not_write_the_index(tmp_path: Path) -> None:
+    """A fully cached call leaves the index untouched until timestamps are flushed."""
+    cache = EmbeddingCache(str(tmp_path), "model")
+    cache.get_or_compute(["a", "b"], constant([1.0]))
+    changes = cache._conn.total_changes
+    cache.get_or_compute(["a", "b", "a"], fail)
+    assert cache._conn.total_changes == changes
+    assert cache.stats()["hits"] == 3
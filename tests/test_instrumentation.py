@@ -0,0 +1,59 @@
+"""Tests for spans, recordings and profiling across threads."""
+import contextvars
+import pstats
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import instrumentation
+from instrumentation import profile_thread, profiling, recording, span
+
+if TYPE_CHECKING:
+    from _pytest.capture import CaptureFixture
+    from _pytest.fixtures import FixtureRequest
+    from _pytest.logging import LogCaptureFixture
+    from _pytest.monkeypatch import MonkeyPatch
+    from pytest_mock.plugin import MockerFixture
+
+
+def stage_work() -> int:
+    """CPU work run in a worker thread."""
+    return sum(i * i for i in range(20000))
+
+
+def run_stage() -> None:
+    """Run stage_work the way WorkflowScheduler runs a stage."""
+    with profile_thread(), span("stage.work"):
+        stage_work()
+
+
+def test_profiling_includes_worker_threads(tmp_path: Path) -> None:
+    """The dump holds functions run in worker threads, on every supported Python version."""
+    path = tmp_path / "run.prof"
+    with profiling(str(path)):
+        worker = threading.Thread(target=contextvars.copy_context().run, args=(run_stage,))
+        worker.start()
+        worker.join()
+    stats = pstats.Stats(str(path))
+    assert any(function == "stage_work" for _, _, function in stats.stats)
+
+
+def test_spans_from_worker_threads_nest_under_the_caller() -> None:
+    """Spans opened in a copied context record the caller's span as parent."""
+    with recording(path="") as recorder, span("workflow"):
+        worker = threading.Thread(target=contextvars.copy_context().run, args=(run_stage,))
+        worker.start()
+        worker.join()
+    by_name = {record["name"]: record for record in recorder.spans}
+    assert by_name["stage.work"]["parent_id"] == by_name["workflow"]["span_id"]
+    assert recorder.summary()["spans"]["stage.work"]["calls"] == 1
+
+
+def test_peak_rss_without_resource_module(monkeypatch: "MonkeyPatch") -> None:
+    """Without the Unix resource module (Windows), peak memory falls back or is None."""
+    monkeypatch.setattr(instrumentation, "resource", None)
+    peak = instrumentation.peak_rss_mb()
+    assert peak is None or peak > 0
+    with recording(path="") as recorder, span("step"):
+        pass
+    assert "peak_rss_mb" in recorder.summary()
@@ -0,0 +1,63 @@
+"""Tests for the persistent job corpus."""
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, TYPE_CHECKING
+
+import numpy as np
+import pytest
+
+import embedding_utils
+from job_corpus import JobCorpus
+
+if TYPE_CHECKING:
+    from _pytest.capture import CaptureFixture
+    from _pytest.fixtures import FixtureRequest
+    from _pytest.logging import LogCaptureFixture
+    from _pytest.monkeypatch import MonkeyPatch
+    from pytest_mock.plugin import MockerFixture
+
+DAY = 86400.0
+
+
+class LengthEmbedder:
+    """Deterministic two-dimensional embedder for tests."""
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        """Embed each text as its length and word count."""
+        return np.asarray([[len(text), len(text.split())] for text in texts], dtype=np.float32)
+
+
+@pytest.fixture
+def corpus(tmp_path: Path, monkeypatch: "MonkeyPatch") -> Iterator[JobCorpus]:
+    """A corpus in tmp_path, embedding with LengthEmbedder and no embedding cache."""
+    monkeypatch.setenv("EMBEDDING_CACHE_DIR", "")
+    monkeypatch.setattr(embedding_utils, "_model", LengthEmbedder())
+    monkeypatch.setattr(embedding_utils, "_model_name", "length")
+    monkeypatch.setattr(embedding_utils, "_cache", None)
+    with JobCorpus(str(tmp_path / "corpus.sqlite3")) as job_corpus:
+        yield job_corpus
+
+
+def job(job_id: str, description: str) -> Dict[str, Any]:
+    """Build a minimal posting."""
+    return {"job_id": job_id, "job_title": "Engineer", "job_description": description}
+
+
+def test_matching_does_not_refresh_last_seen(corpus: JobCorpus) -> None:
+    """Only search ingestion counts as seeing a posting, so matched postings still expire."""
+    corpus.upsert([job("1", "python"), job("2", "java")], now=0.0)
+    corpus.representations([job("1", "python"), job("2", "java and kotlin")])
+    assert corpus.seen("1") == (0.0, 0.0)
+    assert corpus.seen("2") == (0.0, 0.0)
+
+    corpus.upsert([job("2", "java and kotlin")], now=10 * DAY)
+    assert corpus.expire(5, now=10 * DAY) == 1
+    assert [posting["job_id"] for posting in corpus.get_jobs()] == ["2"]
+
+
+def test_representations_recompute_changed_postings(corpus: JobCorpus) -> None:
+    """Stored embeddings are reused until a posting's text changes."""
+    _, first = corpus.representations([job("1", "python")])
+    _, again = corpus.representations([job("1", "python")])
+    _, changed = corpus.representations([job("1", "python and sql")])
+    np.testing.assert_array_equal(first, again)
+    assert changed[0, 1] == first[0, 1] + 2
@@ -0,0 +1,120 @@
+"""Tests for keyword semantics of the job filter, the matcher and the columnar store."""
+import random
+import re
+from pathlib import Path
+from typing import Any, Dict, List, TYPE_CHECKING
+
+import numpy as np
+import pytest
+
+from columnar_store import ColumnarJobStore
+from job_filter import filter_jobs
+from keyword_matcher import KeywordMatcher
+
+if TYPE_CHECKING:
+    from _pytest.capture import CaptureFixture
+    from _pytest.fixtures import FixtureRequest
+    from _pytest.logging import LogCaptureFixture
+    from _pytest.monkeypatch import MonkeyPatch
+    from pytest_mock.plugin import MockerFixture
+
+
+def posting(job_id: str, title: str, description: str = "") -> Dict[str, Any]:
+    """Build a German full-time posting with the given title and description."""
+    return {
+        "job_id": job_id,
+        "job_title": title,
+        "job_description": description,
+        "job_country": "de",
+        "job_employment_type": "full-time"
+    }
+
+
+@pytest.fixture
+def jobs() -> List[Dict[str, Any]]:
+    """Postings whose keywords only match as substrings, as whole words, or not at all."""
+    return [
+        posting("inflected", "Software Engineering Lead", "Our team needs developers"),
+        posting("html", "Frontend specialist", "HTML and CSS"),
+        posting("whole", "ML Engineer", "Python and machine learning"),
+        posting("none", "Sales Manager", "Quota carrying role")
+    ]
+
+
+def ids(jobs: List[Dict[str, Any]]) -> List[str]:
+    """Return the job ids of postings, in order."""
+    return [job["job_id"] for job in jobs]
+
+
+def test_default_filter_matches_substrings(jobs: List[Dict[str, Any]]) -> None:
+    """Default keywords still match inflected forms such as 'Engineering' and 'developers'."""
+    assert ids(filter_jobs(jobs)) == ["inflected", "html", "whole"]
+
+
+def test_whole_words_is_opt_in(jobs: List[Dict[str, Any]]) -> None:
+    """With whole_words, 'ml' no longer matches 'HTML' nor 'engineer' 'Engineering'."""
+    assert ids(filter_jobs(jobs, whole_words=True)) == ["whole"]
+
+
+def test_matcher_word_boundaries() -> None:
+    """Boundary matching accepts whole words and phrases, including at punctuation."""
+    matcher = KeywordMatcher(["ml", "machine learning", "c++"], word_boundaries=True)
+    assert matcher.matches("Senior ML/AI engineer")
+    assert matcher.matches("Machine Learning platform")
+    assert matcher.matches("Modern C++ developer")
+    assert not matcher.matches("HTML templates")
+    assert not matcher.matches("machine learnings")
+
+    substrings = KeywordMatcher(["ml"], word_boundaries=False)
+    assert substrings.matches("HTML templates")
+    assert not KeywordMatcher([]).matches("anything")
+
+
+@pytest.mark.parametrize("whole_words", [False, True])
+def test_matcher_agrees_with_per_keyword_search(whole_words: bool) -> None:
+    """The single compiled pattern finds a keyword exactly when a per-keyword search does."""
+    keywords = ["ml", "mlops", "data", "data scientist", "c++", "ai", "air", "r", "machine learning"]
+    words = ["ML", "mlops", "html", "data", "dataset", "scientist", "C++", "c", "air", "Rust", "machine", "learning", "/", "-"]
+    rng = random.Random(19)
+    matcher = KeywordMatcher(keywords, word_boundaries=whole_words)
+    for _ in range(2000):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(0, 6))).lower()
+        if whole_words:
+            expected = any(re.search(rf"(?<!\w){re.escape(keyword)}(?!\w)", text) for keyword in keywords)
+        else:
+            expected = any(keyword in text for keyword in keywords)
+        assert matcher.search(text) == expected, text
+
+
+@pytest.mark.parametrize("whole_words", [False, True])
+def test_columnar_filter_matches_dict_filter(tmp_path: Path, jobs: List[Dict[str, Any]], whole_words: bool) -> None:
+    """The columnar store's vectorized filter agrees with filter_jobs in both modes."""
+    store = ColumnarJobStore.write(jobs, str(tmp_path / "columns"))
+    rows = np.flatnonzero(store.filter_mask(whole_words=whole_words))
+    assert [store.column("job_id")[row] for row in rows] == ids(filter_jobs(jobs, whole_words=whole_words))
+
+
+def test_columnar_keywords_ignore_non_ascii_case(tmp_path: Path) -> None:
+    """Non-ASCII titles are lowercased like str.lower, even when that changes their byte length."""
+    jobs = [
+        posting("umlaut", "ÄRZTIN (m/w/d)", "Klinik sucht Verstärkung"),
+        posting("dotted", "İstanbul Office Lead", "Ankara team"),
+        posting("sharp", "STRAẞENBAU Ingenieur", "Bauleitung"),
+        posting("none", "Sales Manager", "Quota carrying role")
+    ]
+    keywords = ["ärztin", "verstärkung", "i̇stanbul", "ankara", "straßenbau", "bauleitung"]
+    store = ColumnarJobStore.write(jobs, str(tmp_path / "columns"))
+    for keyword in keywords:
+        rows = np.flatnonzero(store.keyword_mask([keyword]))
+        assert [store.column("job_id")[row] for row in rows] == ids(filter_jobs(jobs, keywords=[keyword])), keyword
+    rows = np.flatnonzero(store.filter_mask(keywords=keywords))
+    assert [store.column("job_id")[row] for row in rows] == ["umlaut", "dotted", "sharp"]
+
+
+def test_columnar_search_copy_requires_its_offsets(tmp_path: Path) -> None:
+    """A store without search offsets asks to be rebuilt instead of slicing the wrong rows."""
+    store = ColumnarJobStore.write([posting("sharp", "STRAẞENBAU Ingenieur")], str(tmp_path / "columns"))
+    (tmp_path / "columns" / "job_title.search.offsets.npy").unlink()
+    with pytest.raises(FileNotFoundError, match="rebuild"):
+        ColumnarJobStore(str(tmp_path / "columns")).keyword_mask(["straßenbau"])
+    assert store.column("job_title")[0] == "STRAẞENBAU Ingenieur"
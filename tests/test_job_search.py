@@ -0,0 +1,62 @@
+"""Tests for multi-combination job searches when Adzuna requests fail."""
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, TYPE_CHECKING
+
+import pytest
+
+import adzuna_client
+import job_search
+
+if TYPE_CHECKING:
+    from _pytest.capture import CaptureFixture
+    from _pytest.fixtures import FixtureRequest
+    from _pytest.logging import LogCaptureFixture
+    from _pytest.monkeypatch import MonkeyPatch
+    from pytest_mock.plugin import MockerFixture
+
+
+def report(query: str, location: str, error: Any) -> Dict[str, Any]:
+    """Build a fan-out report for one combination without postings."""
+    return {"query": query, "location": location, "count": 0, "unique": 0, "latency_s": 0.0, "error": error}
+
+
+FAILED = [report("python", "Berlin", "HTTP 500"), report("python", "Munich", "HTTP 500")]
+PARTIAL = [report("python", "Berlin", "HTTP 500"), report("python", "Munich", None)]
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch: "MonkeyPatch") -> None:
+    """Provide Adzuna credentials so searches reach the fetcher."""
+    monkeypatch.setenv("ADZUNA_APP_ID", "id")
+    monkeypatch.setenv("ADZUNA_APP_KEY", "key")
+
+
+def patch_fan_out(monkeypatch: "MonkeyPatch", reports: List[Dict[str, Any]]) -> None:
+    """Make the sync and async fan-outs return no postings and the given reports."""
+    outcome: Tuple[List[Dict[str, Any]], List[Dict[str, Any]]] = ([], reports)
+
+    async def fan_out(self: Any, *args: Any, **kwargs: Any) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        return outcome
+
+    monkeypatch.setattr(adzuna_client, "fan_out_jobs", lambda *args, **kwargs: outcome)
+    monkeypatch.setattr(adzuna_client.AdzunaFetcher, "fan_out", fan_out)
+
+
+def test_search_many_returns_empty_when_every_combination_fails(monkeypatch: "MonkeyPatch", tmp_path: Path) -> None:
+    """Nothing is saved and {} is returned, as for a failed single search."""
+    patch_fan_out(monkeypatch, FAILED)
+    output = tmp_path / "jobs.json"
+    assert job_search.search_many_and_save_jobs("python", ["Berlin", "Munich"], output_path=str(output)) == {}
+    assert asyncio.run(job_search.asearch_and_save_jobs("python", ["Berlin", "Munich"], output_path=str(output))) == {}
+    assert not output.exists()
+
+
+def test_search_many_saves_when_some_combinations_succeed(monkeypatch: "MonkeyPatch", tmp_path: Path) -> None:
+    """A partial failure is reported in combinations and the result is still saved."""
+    patch_fan_out(monkeypatch, PARTIAL)
+    output = tmp_path / "jobs.json"
+    result = job_search.search_many_and_save_jobs("python", ["Berlin", "Munich"], output_path=str(output))
+    assert result["status"] == "OK"
+    assert result["combinations"] == PARTIAL
+    assert output.exists()
@@ -0,0 +1,119 @@
+"""Tests for hybrid BM25 + embedding matching."""
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, TYPE_CHECKING
+
+import numpy as np
+import pytest
+
+import embedding_utils
+import match_jobs
+from bm25 import BM25Index, reciprocal_rank_fusion
+from job_corpus import JobCorpus
+from match_jobs import rank_profile_against_jobs, retrieve_candidates
+from tools.match_tool import JobMatcherTool
+
+if TYPE_CHECKING:
+    from _pytest.capture import CaptureFixture
+    from _pytest.fixtures import FixtureRequest
+    from _pytest.logging import LogCaptureFixture
+    from _pytest.monkeypatch import MonkeyPatch
+    from pytest_mock.plugin import MockerFixture
+
+VOCABULARY = ["python", "java", "sql", "cloud", "kubernetes", "react", "sales", "design", "data", "ml"]
+
+
+class BagOfWordsEmbedder:
+    """Deterministic embedder counting VOCABULARY words, for tests."""
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        """Embed each text as counts of VOCABULARY words plus a constant component."""
+        return np.asarray(
+            [[text.lower().split().count(word) for word in VOCABULARY] + [1.0] for text in texts],
+            dtype=np.float32
+        )
+
+
+@pytest.fixture(autouse=True)
+def embedder(monkeypatch: "MonkeyPatch") -> Iterator[None]:
+    """Use BagOfWordsEmbedder without on-disk caches, and start with no cached BM25 indexes."""
+    monkeypatch.setenv("EMBEDDING_CACHE_DIR", "")
+    monkeypatch.setenv("JOB_CORPUS_PATH", "")
+    monkeypatch.setattr(embedding_utils, "_model", BagOfWordsEmbedder())
+    monkeypatch.setattr(embedding_utils, "_model_name", "bag-of-words")
+    monkeypatch.setattr(embedding_utils, "_cache", None)
+    match_jobs._bm25_indexes.clear()
+    yield
+    match_jobs._bm25_indexes.clear()
+
+
+@pytest.fixture
+def jobs() -> List[Dict[str, Any]]:
+    """Forty postings mixing the vocabulary."""
+    rng = np.random.default_rng(7)
+    return [
+        {
+            "job_id": str(i),
+            "job_title": f"Role {i}",
+            "job_description": " ".join(rng.choice(VOCABULARY, size=int(rng.integers(3, 12)))),
+            "job_country": "de"
+        }
+        for i in range(40)
+    ]
+
+
+PROFILE = {"name": "Ada", "skills": ["python", "sql"], "experience": ["data pipelines in the cloud"]}
+
+
+def test_bm25_matches_reference_scores() -> None:
+    """Vectorized BM25 equals a direct evaluation of the Okapi formula."""
+    documents = ["python sql python", "java cloud", "python cloud kubernetes data", ""]
+    index = BM25Index(documents)
+    tokenized = [document.split() for document in documents]
+    average = sum(map(len, tokenized)) / len(tokenized)
+    expected = []
+    for tokens in tokenized:
+        score = 0.0
+        for term in ("python", "cloud"):
+            df = sum(term in other for other in tokenized)
+            idf = np.log1p((len(tokenized) - df + 0.5) / (df + 0.5))
+            tf = tokens.count(term)
+            score += idf * tf * 2.5 / (tf + 1.5 * (0.25 + 0.75 * len(tokens) / average))
+        expected.append(score)
+    np.testing.assert_allclose(index.scores("python cloud"), expected, rtol=1e-5)
+
+
+def test_reciprocal_rank_fusion_rewards_agreement() -> None:
+    """Items ranked high by both rankers come first."""
+    items, scores = reciprocal_rank_fusion([[1, 2, 3], [2, 1, 3], [2, 3, 1]])
+    assert items.tolist() == [2, 1, 3]
+    assert np.all(np.diff(scores) <= 0)
+
+
+def test_retrieved_matches_are_in_score_order(jobs: List[Dict[str, Any]]) -> None:
+    """With retrieve_k, reported cosine scores never increase down the list."""
+    matches, _ = rank_profile_against_jobs(PROFILE, jobs, top_n=8, retrieve_k=15)
+    scores = [score for _, score in matches]
+    assert len(matches) == 8
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_retrieval_uses_corpus_lemmas(tmp_path: Path, jobs: List[Dict[str, Any]], monkeypatch: "MonkeyPatch") -> None:
+    """With a corpus, stored lemmas feed BM25 and give the same candidates as lemmatizing."""
+    expected = retrieve_candidates(PROFILE, jobs, 10)
+    match_jobs._bm25_indexes.clear()
+    with JobCorpus(str(tmp_path / "corpus.sqlite3")) as corpus:
+        corpus.lemmas(jobs)
+
+        def no_lemmatizing(texts: List[str]) -> List[str]:
+            raise AssertionError("job texts were lemmatized again")
+        monkeypatch.setattr(match_jobs, "lemmatize_texts", no_lemmatizing)
+        np.testing.assert_array_equal(retrieve_candidates(PROFILE, jobs, 10, corpus=corpus), expected)
+
+
+def test_tool_validates_retrieve_k(jobs: List[Dict[str, Any]]) -> None:
+    """retrieve_k from JSON is coerced to a non-negative integer or rejected."""
+    tool = JobMatcherTool()
+    for retrieve_k in (-5, "-5", 0):
+        result = tool.run_dict({"profile": PROFILE, "jobs": jobs, "top_n": 3, "retrieve_k": retrieve_k})
+        assert result["top_matches"] == 3
+    assert "error" in tool.run_dict({"profile": PROFILE, "jobs": jobs, "retrieve_k": "many"})
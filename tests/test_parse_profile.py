@@ -0,0 +1,98 @@
+"""Regression tests comparing the incremental profile parser with the original whole-text parser."""
+import random
+from typing import Any, Dict, Iterator, List, TYPE_CHECKING
+
+import pytest
+
+import parse_profile as pp
+
+if TYPE_CHECKING:
+    from _pytest.capture import CaptureFixture
+    from _pytest.fixtures import FixtureRequest
+    from _pytest.logging import LogCaptureFixture
+    from _pytest.monkeypatch import MonkeyPatch
+    from pytest_mock.plugin import MockerFixture
+
+
+def reference_parse(text: str) -> Dict[str, Any]:
+    """The whole-text parse_profile the incremental parser replaced, kept verbatim as the oracle."""
+    lines = text.splitlines()
+    headings = []
+    for idx, raw in enumerate(lines):
+        canonical = pp.HEADING_ALIASES.get(pp.normalize_heading(raw))
+        if canonical:
+            headings.append((idx, canonical))
+    sections: Dict[str, List[str]] = {label: [] for label in ('summary',) + pp.PROFILE_SECTIONS}
+    for position, label in headings:
+        next_index = next((idx for idx, _ in headings if idx > position), len(lines))
+        if label not in sections:
+            continue
+        for line_index in range(position + 1, next_index):
+            entry = pp.clean_entry(lines[line_index])
+            if pp.should_skip_line(entry):
+                continue
+            if entry:
+                sections[label].append(entry)
+    name, headline = pp.extract_name_headline(lines, headings)
+    return {
+        'name': name,
+        'headline': headline,
+        'skills': pp.unique_preserve(sections['skills']),
+        'languages': pp.unique_preserve(sections['languages']),
+        'certifications': pp.unique_preserve(sections['certifications']),
+        'experience': sections['experience'],
+        'education': sections['education']
+    }
+
+
+HEADINGS = ['Summary', 'Experience', 'Education', 'Top Skills', 'Languages',
+            'Certifications', 'Contact', 'Honors-Awards', 'Publications']
+BODY_LINES = ['Python', 'German (Native)', 'Senior Engineer at Acme', '2019 - 2023',
+              'TU Munich', '• Machine Learning', 'Page 1 of 3', '', 'AWS Certified']
+
+
+def random_profile(rng: random.Random) -> str:
+    """Build a profile text whose section headings may repeat in any order."""
+    lines = ['Contact', 'jane@example.com', 'Jane Doe', 'Data Scientist | ML Engineer']
+    for _ in range(rng.randint(1, 12)):
+        lines.append(rng.choice(HEADINGS))
+        lines.extend(rng.choice(BODY_LINES) for _ in range(rng.randint(0, 4)))
+    return '\n'.join(lines)
+
+
+def test_parse_profile_matches_reference_on_random_profiles() -> None:
+    """Every line is parsed, so repeated headings keep their content."""
+    rng = random.Random(18)
+    for _ in range(1000):
+        text = random_profile(rng)
+        assert pp.parse_profile(text) == reference_parse(text), text
+
+
+def test_parse_profile_keeps_repeated_section() -> None:
+    """Experience lines after a closed Experience section are still returned."""
+    text = '\n'.join([
+        'Jane Doe', 'Data Scientist at Acme', 'Summary', 'Builds models',
+        'Top Skills', 'Python', 'Languages', 'German', 'Certifications', 'AWS',
+        'Experience', 'Acme', 'Education', 'TU Munich', 'Experience', 'Globex'
+    ])
+    assert pp.parse_profile(text)['experience'] == ['Acme', 'Globex']
+    assert pp.parse_profile(text) == reference_parse(text)
+
+
+def test_parse_profile_lines_stops_early_and_closes_source() -> None:
+    """With stop_early the source is closed once the wanted sections are complete."""
+    consumed: List[str] = []
+
+    def source() -> Iterator[str]:
+        for line in ['Jane Doe', 'Data Scientist at Acme', 'Summary', 'Builds models',
+                     'Experience', 'Acme', 'Education', 'TU Munich', 'Contact', 'never read']:
+            consumed.append(line)
+            yield line
+
+    lines = source()
+    profile = pp.parse_profile_lines(lines, wanted=('experience', 'education'))
+    assert profile['experience'] == ['Acme']
+    assert profile['education'] == ['TU Munich']
+    assert 'never read' not in consumed
+    with pytest.raises(StopIteration):
+        next(lines)
@@ -0,0 +1,56 @@
+"""Tests for the request validation of the matching server."""
+from pathlib import Path
+from typing import Iterator, TYPE_CHECKING
+
+import pytest
+
+from agents import JobMatchAgent
+from server import MatchServer
+
+if TYPE_CHECKING:
+    from _pytest.capture import CaptureFixture
+    from _pytest.fixtures import FixtureRequest
+    from _pytest.logging import LogCaptureFixture
+    from _pytest.monkeypatch import MonkeyPatch
+    from pytest_mock.plugin import MockerFixture
+
+
+@pytest.fixture
+def server(tmp_path: Path) -> Iterator[MatchServer]:
+    """A server on a free port whose profile directory is tmp_path/profiles."""
+    (tmp_path / "profiles").mkdir()
+    (tmp_path / "profiles" / "profile.json").write_text('{"name": "Ada", "skills": ["python"]}', encoding="utf-8")
+    (tmp_path / "secret.json").write_text('{"token": "x"}', encoding="utf-8")
+    match_server = MatchServer(("127.0.0.1", 0), JobMatchAgent(), profile_dir=str(tmp_path / "profiles"))
+    yield match_server
+    match_server.server_close()
+
+
+def test_profile_paths_stay_inside_profile_dir(server: MatchServer) -> None:
+    """Relative paths resolve in the profile directory; escapes and absolute paths are rejected."""
+    status, result = server.call_tool("profile_parser", {"source": "json", "path": "profile.json"})
+    assert status == 200
+    assert result["profile"]["name"] == "Ada"
+
+    for path in ("../secret.json", str(server.profile_dir.parent / "secret.json"), "/etc/passwd"):
+        status, result = server.call_tool("profile_parser", {"source": "json", "path": path})
+        assert status == 400
+        assert "token" not in str(result)
+
+    status, _ = server.run_workflow({"profile_source": "json", "profile_path": "../secret.json"})
+    assert status == 400
+
+
+def test_profile_paths_can_be_disabled(server: MatchServer) -> None:
+    """Without a profile directory, only profiles sent as data are accepted."""
+    server.profile_dir = None
+    status, result = server.call_tool("profile_parser", {"source": "json", "path": "profile.json"})
+    assert status == 400
+    assert "disabled" in result["error"]
+
+
+def test_trace_path_is_not_accepted_from_requests(server: MatchServer) -> None:
+    """Requests cannot choose files the server writes to."""
+    status, result = server.run_workflow({"profile_source": "dict", "profile_data": {}, "trace_path": "/tmp/trace"})
+    assert status == 400
+    assert "trace_path" in result["error"]